@@ -0,0 +1,403 @@
+# asnindex.py
+
+"""
+Module: asnindex.py
+
+Description:
+This module annotates resolved IPs with their origin AS number, AS organisation, country and
+netblock, entirely offline. A standard IP-to-ASN dump is compiled once into a compact binary
+index (data/asn.idx) of sorted, non-overlapping address ranges; lookups memory-map that file
+and binary-search it, so an index of a full routing table opens instantly and annotates
+millions of IPs in seconds without a single network call. The annotated subdomains are then
+grouped by hosting provider (AS) for triage.
+
+Features:
+- Reads the common free dumps, plain or gzip-compressed:
+  - iptoasn.com ip2asn-v4.tsv: "range_start  range_end  AS_number  country  AS_description"
+  - pyasn ipasn files: "prefix/length  AS_number"
+  - CAIDA RouteViews prefix2as: "prefix  length  AS_number"
+- Nested prefixes are flattened at compile time, so the most specific prefix wins
+- The index is rebuilt automatically when the configured dump is newer than it
+- Netblocks are reported as the CIDR block of the dump entry that contains the IP; ranges
+  that are not one CIDR block are split at compile time, so lookups never compute them
+- Results are cached per range and per IP, since many subdomains share a few addresses
+
+Usage:
+    asnindex.configure(index="data/asn.idx", dump="ip2asn-v4.tsv.gz")
+    asnindex.annotate(subdomains)           # adds asn, org, country and netblock to each entry
+    providers = asnindex.group_by_provider(subdomains)
+
+    python3 asnindex.py ip2asn-v4.tsv.gz [data/asn.idx]
+
+Dependencies:
+- mmap
+- bisect
+- array
+- gzip
+
+Limitations:
+- IPv4 only; IPv6 lines in a dump are skipped
+- Organisation and country are only known for dumps that carry them (ip2asn); prefix-only
+  dumps give the AS number and netblock
+- Multi-origin prefixes (AS sets) are attributed to their first AS
+"""
+
+import array
+import bisect
+import collections
+import gzip
+import mmap
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+DEFAULT_INDEX = "data/asn.idx"
+MAGIC = b"RSASNIX1"
+HEADER = struct.Struct("<8sII")  # magic, range count, string table size
+ARRAYS = 6  # starts, ends, block starts, block ends, AS numbers, string offsets
+STRING_LENGTH = struct.Struct("<H")
+FIELDS = ("asn", "org", "country", "netblock")
+
+_settings = {"index": DEFAULT_INDEX, "dump": None}
+_index = None
+_lock = threading.Lock()
+
+
+def configure(index=None, dump=None):
+    """Change the index path and the dump it is compiled from; the index is (re)opened lazily."""
+    global _index
+    with _lock:
+        if _index is not None:
+            _index.close()
+            _index = None
+        if index is not None:
+            _settings["index"] = index
+        if dump is not None:
+            _settings["dump"] = dump
+
+
+def _ip_int(ip):
+    return int.from_bytes(socket.inet_aton(ip), "big")
+
+
+def _ip_str(value):
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def _parse_asn(value):
+    # AS sets ("64496,64497") and multi-origin prefixes ("64496_64497") keep their first AS
+    for separator in ("_", ","):
+        value = value.split(separator)[0]
+    return int(value.upper().removeprefix("AS"))
+
+
+def _parse_line(line):
+    """Return (start, end, asn, country, org) for one dump line, or None to skip it."""
+    line = line.strip()
+    if not line or line[0] in "#;" or ":" in line.split(None, 1)[0]:
+        return None
+    fields = line.split("\t") if "\t" in line else line.split()
+    if len(fields) >= 3 and "/" not in fields[0] and "." in fields[1]:
+        # ip2asn: start, end, AS, country, description
+        start, end, asn = _ip_int(fields[0]), _ip_int(fields[1]), _parse_asn(fields[2])
+        country = fields[3].strip() if len(fields) > 3 else ""
+        org = fields[4].strip() if len(fields) > 4 else ""
+        if not asn or org == "Not routed":
+            return None
+        return start, end, asn, country if country not in ("", "None") else "", org
+    if "/" in fields[0]:
+        network, length = fields[0].split("/")  # pyasn: prefix/length, AS
+        asn = fields[1]
+    else:
+        network, length, asn = fields[:3]  # prefix2as: prefix, length, AS
+    start, length = _ip_int(network), int(length)
+    size = 1 << (32 - length)
+    start &= ~(size - 1) & 0xffffffff
+    asn = _parse_asn(asn)
+    if not asn:
+        return None
+    return start, start + size - 1, asn, "", ""
+
+
+def _flatten(entries):
+    """Turn possibly nested ranges into sorted non-overlapping (start, end, block start, block end, asn, ref).
+
+    Where ranges nest, the innermost (most specific) one wins; the block of a piece is the
+    full range it was cut from, reported as its netblock.
+    """
+    entries.sort(key=lambda entry: (entry[0], -entry[1]))
+    pieces = []
+    stack = []  # enclosing ranges, innermost last
+    position = 0
+
+    def emit(start, end, entry):
+        if start > end:
+            return
+        block_start, block_end, asn, ref = entry
+        last = pieces[-1] if pieces else None
+        if last and last[1] + 1 == start and last[2:] == (block_start, block_end, asn, ref):
+            pieces[-1] = (last[0], end) + last[2:]  # the same range resumes after a nested one
+        else:
+            pieces.append((start, end, block_start, block_end, asn, ref))
+
+    for start, end, asn, ref in entries:
+        while stack and stack[-1][1] < start:
+            enclosing = stack.pop()
+            emit(position, enclosing[1], enclosing)
+            position = enclosing[1] + 1
+        if stack:
+            emit(position, start - 1, stack[-1])
+            end = min(end, stack[-1][1])  # a range overlapping its neighbour's end is clipped
+        if stack and stack[-1][0] == start and stack[-1][1] == end:
+            stack.pop()  # duplicate range: the later line wins
+        stack.append((start, end, asn, ref))
+        position = start
+    while stack:
+        enclosing = stack.pop()
+        emit(position, enclosing[1], enclosing)
+        position = enclosing[1] + 1
+    return pieces
+
+
+def _cidr_blocks(start, end):
+    """Split an address range into its minimal list of CIDR blocks: [(start, end), ...]."""
+    blocks = []
+    while start <= end:
+        size = start & -start or 1 << 32  # widest block aligned at start
+        while start + size - 1 > end:
+            size >>= 1
+        blocks.append((start, start + size - 1))
+        start += size
+    return blocks
+
+
+def _split_blocks(pieces):
+    """Cut pieces whose block is not one CIDR block (ip2asn ranges often are not) at block borders.
+
+    Afterwards every piece has exactly one netblock, so lookups never compute one per address.
+    """
+    for piece in pieces:
+        start, end, block_start, block_end = piece[:4]
+        size = block_end - block_start + 1
+        if not size & (size - 1) and not block_start % size:
+            yield piece
+            continue
+        for cidr_start, cidr_end in _cidr_blocks(block_start, block_end):
+            if cidr_end >= start and cidr_start <= end:
+                yield (max(start, cidr_start), min(end, cidr_end), cidr_start, cidr_end) + piece[4:]
+
+
+def compile_dump(dump_path, index_path=DEFAULT_INDEX):
+    """Compile an IP-to-ASN dump into a binary index; returns the number of ranges."""
+    opener = gzip.open if dump_path.endswith(".gz") else open
+    strings = bytearray()
+    offsets = {}  # (country, org) -> offset in the string table
+    entries = []
+    with opener(dump_path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                parsed = _parse_line(line)
+            except (OSError, ValueError, IndexError):
+                continue  # malformed line
+            if parsed is None:
+                continue
+            start, end, asn, country, org = parsed
+            ref = offsets.get((country, org))
+            if ref is None:
+                ref = offsets[(country, org)] = len(strings)
+                encoded = f"{country}\t{org}".encode("utf-8")[:0xffff]
+                strings += STRING_LENGTH.pack(len(encoded)) + encoded
+            entries.append((start, end, asn, ref))
+
+    pieces = list(_split_blocks(_flatten(entries)))
+    del entries
+    directory = os.path.dirname(index_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(index_path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(pieces), len(strings)))
+        for column in range(ARRAYS):
+            values = array.array("I", (piece[column] for piece in pieces))
+            if sys.byteorder == "big":
+                values.byteswap()  # the index is little-endian on every platform
+            values.tofile(f)
+        f.write(strings)
+    os.replace(index_path + ".tmp", index_path)
+    return len(pieces)
+
+
+class ASNIndex:
+    """Read-only, memory-mapped view of a compiled index."""
+
+    def __init__(self, path):
+        if sys.byteorder == "big":
+            raise ValueError("the ASN index is little-endian and cannot be mapped on this platform")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, strings_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != HEADER.size + ARRAYS * 4 * self.count + strings_size:
+            self._map.close()
+            raise ValueError(f"{path} is not a ReconStudio ASN index")
+        self._view = memoryview(self._map)
+        offset = HEADER.size
+        columns = []
+        for _ in range(ARRAYS):
+            columns.append(self._view[offset:offset + 4 * self.count].cast("I"))
+            offset += 4 * self.count
+        self._starts, self._ends, self._block_starts, self._block_ends, self._asns, self._refs = columns
+        self._strings = offset
+        self._ranges = {}  # range number -> (asn, org, country, netblock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map.closed:
+            return
+        for column in (self._starts, self._ends, self._block_starts, self._block_ends, self._asns, self._refs):
+            column.release()
+        self._view.release()
+        self._map.close()
+
+    def _range(self, number):
+        cached = self._ranges.get(number)
+        if cached is None:
+            position = self._strings + self._refs[number]
+            (length,) = STRING_LENGTH.unpack_from(self._map, position)
+            text = self._map[position + 2:position + 2 + length].decode("utf-8", "replace")
+            country, _, org = text.partition("\t")
+            start, end = self._block_starts[number], self._block_ends[number]
+            netblock = f"{_ip_str(start)}/{33 - (end - start + 1).bit_length()}"
+            cached = self._ranges[number] = (self._asns[number], org or None, country or None, netblock)
+        return cached
+
+    def lookup(self, ip):
+        """Return {"asn", "org", "country", "netblock"} for an IPv4 address, or None if it is not routed."""
+        try:
+            value = _ip_int(ip)
+        except (OSError, TypeError):
+            return None
+        number = bisect.bisect_right(self._starts, value) - 1
+        if number < 0 or value > self._ends[number]:
+            return None
+        asn, org, country, netblock = self._range(number)
+        return {"asn": asn, "org": org, "country": country, "netblock": netblock}
+
+
+def _is_stale(index_path, dump_path):
+    if not dump_path or not os.path.exists(dump_path):
+        return False
+    return not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(dump_path)
+
+
+def get_index():
+    """The shared index, compiled from the configured dump if needed; None if there is none."""
+    global _index
+    with _lock:
+        if _index is None:
+            index_path, dump_path = _settings["index"], _settings["dump"]
+            if _is_stale(index_path, dump_path):
+                print(f"[*] Compiling ASN index {index_path} from {dump_path}...")
+                start_time = time.time()
+                count = compile_dump(dump_path, index_path)
+                print(f"[✓] Compiled {count} ranges in {round(time.time() - start_time, 2)} seconds")
+            if os.path.exists(index_path):
+                _index = ASNIndex(index_path)
+        return _index
+
+
+def annotate(entries, ip_key="ip", prefix=""):
+    """Add asn, org, country and netblock (prefixed with prefix) to each entry in place.
+
+    Fields are None for addresses the index does not cover. Returns the number of entries
+    that were found in the index.
+    """
+    index = get_index()
+    if index is None:
+        return 0
+    missing = dict.fromkeys(prefix + field for field in FIELDS)
+    seen = {}  # ip -> fields to add; many subdomains share an address
+    found = 0
+    for entry in entries:
+        ip = entry.get(ip_key)
+        fields = seen.get(ip)
+        if fields is None:
+            annotation = index.lookup(ip)
+            fields = seen[ip] = {prefix + field: annotation[field] for field in FIELDS} if annotation else missing
+        if fields is not missing:
+            found += 1
+        entry.update(fields)
+    return found
+
+
+def group_by_provider(entries):
+    """Group annotated entries by AS; returns one row per provider, most subdomains first."""
+    counts = collections.Counter(entry["ip"] for entry in entries)
+    by_ip = {entry["ip"]: entry for entry in entries}  # the annotation is the same for every entry of an IP
+    providers = {}
+    for ip, entry in by_ip.items():
+        asn = entry.get("asn")
+        provider = providers.get(asn)
+        if provider is None:
+            provider = providers[asn] = {"asn": asn, "org": entry.get("org") if asn else "unknown",
+                                         "country": entry.get("country"), "subdomains": 0,
+                                         "ips": 0, "netblocks": set()}
+        provider["subdomains"] += counts[ip]
+        provider["ips"] += 1
+        if entry.get("netblock"):
+            provider["netblocks"].add(entry["netblock"])
+    rows = sorted(providers.values(), key=lambda provider: (-provider["subdomains"], provider["asn"] or 0))
+    for provider in rows:
+        provider["netblocks"] = sorted(provider["netblocks"], key=lambda block: _ip_int(block.split("/")[0]))
+    return rows
+
+
+def get_providers(domain, subdomains):
+    """Annotate resolved subdomains with ASN data and return the grouping by hosting provider.
+
+    Returns [] when no index or dump is configured.
+    """
+    if get_index() is None:
+        print(f"[!] No ASN index at {_settings['index']}; pass --asn-dump or compile one with "
+              f"python3 asnindex.py ip2asn-v4.tsv.gz {_settings['index']}")
+        return []
+    start_time = time.time()
+    found = annotate(subdomains)
+    providers = group_by_provider(subdomains)
+
+    os.makedirs("data", exist_ok=True)
+    txt_path = f"data/providers_{domain}.txt"
+    with open(txt_path, "w") as f:
+        for provider in providers:
+            f.write(f"AS{provider['asn'] or '-'} {provider['org'] or ''} ({provider['country'] or '-'}): "
+                    f"{provider['subdomains']} subdomains, {provider['ips']} IPs, "
+                    f"{' '.join(provider['netblocks'])}\n")
+    print(f"[✓] Hosting providers saved to: {txt_path}")
+
+    print("\n--- Hosting Providers ---")
+    for provider in providers[:10]:
+        print(f"  AS{provider['asn'] or '-':<8} {(provider['org'] or '')[:40]:<40} "
+              f"{provider['subdomains']:>7} subdomains  {provider['ips']:>6} IPs")
+    if len(providers) > 10:
+        print(f"  ... and {len(providers) - 10} more")
+    print(f"  Annotated {found} of {len(subdomains)} subdomains in {round(time.time() - start_time, 2)} seconds")
+    return providers
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 asnindex.py <ip2asn/ipasn/prefix2as dump> [index path] [IP ...]")
+        exit(1)
+    index_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_INDEX
+    start_time = time.time()
+    count = compile_dump(sys.argv[1], index_path)
+    print(f"[✓] Compiled {count} ranges into {index_path} in {round(time.time() - start_time, 2)} seconds")
+    with ASNIndex(index_path) as index:
+        for ip in sys.argv[3:]:
+            print(f"{ip}: {index.lookup(ip)}")
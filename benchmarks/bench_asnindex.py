@@ -0,0 +1,102 @@
+# bench_asnindex.py
+
+"""
+Benchmark: offline ASN enrichment
+
+Description:
+Generates a synthetic ip2asn-style dump the size of a full IPv4 routing table, compiles it
+with asnindex.compile_dump() and reports the compile time and index size, the time to open
+(memory-map) the index, the raw lookup rate over random addresses, and the rate of
+annotate() + group_by_provider() over subdomain entries that share addresses, as main.py
+--enrich runs them.
+
+Usage:
+    python3 benchmarks/bench_asnindex.py [--ranges 500000] [--orgs 70000] [--lookups 1000000]
+                                         [--subdomains 1000000] [--ips 200000]
+
+Limitations:
+- Synthetic ranges are packed into the low part of the address space; a real dump spreads
+  them out, which does not change the binary search depth
+- The index file is in a temporary directory, so its pages are in the page cache
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import asnindex
+
+
+def write_dump(path, ranges, orgs, rng):
+    """ip2asn TSV shaped like the real one: runs of 1-16 /24s (often not one CIDR block), some gaps."""
+    start = 1 << 24
+    with open(path, "w") as f:
+        for _ in range(ranges):
+            size = rng.choice((1, 1, 1, 2, 3, 4, 4, 6, 8, 16)) << 8
+            if rng.random() < 0.1:
+                start += size  # unrouted gap
+            asn = 1 + rng.randrange(orgs)
+            f.write(f"{asnindex._ip_str(start)}\t{asnindex._ip_str(start + size - 1)}\t{asn}\t"
+                    f"{'US' if asn % 3 else 'DE'}\tPROVIDER-{asn} Hosting Networks\n")
+            start += size
+    return start
+
+
+def random_ip(rng, end):
+    return asnindex._ip_str(rng.randrange(1 << 24, end))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the offline ASN index")
+    parser.add_argument("--ranges", type=int, default=500000, help="Ranges in the synthetic dump")
+    parser.add_argument("--orgs", type=int, default=70000, help="Distinct AS organisations")
+    parser.add_argument("--lookups", type=int, default=1000000, help="Random single-address lookups")
+    parser.add_argument("--subdomains", type=int, default=1000000, help="Subdomain entries annotated")
+    parser.add_argument("--ips", type=int, default=200000, help="Distinct addresses the subdomains share")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        dump = os.path.join(directory, "ip2asn-v4.tsv")
+        index_path = os.path.join(directory, "asn.idx")
+        end = write_dump(dump, args.ranges, args.orgs, rng)
+
+        start = time.perf_counter()
+        count = asnindex.compile_dump(dump, index_path)
+        print(f"  compile   {count:>9} ranges  {time.perf_counter() - start:>7.2f}s"
+              f"  {os.path.getsize(index_path) / 1024 / 1024:>6.1f} MB index"
+              f" (dump {os.path.getsize(dump) / 1024 / 1024:.1f} MB)")
+
+        start = time.perf_counter()
+        index = asnindex.ASNIndex(index_path)
+        print(f"  open      {(time.perf_counter() - start) * 1000:>9.2f} ms")
+
+        ips = [random_ip(rng, end) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        found = sum(1 for ip in ips if index.lookup(ip))
+        elapsed = time.perf_counter() - start
+        print(f"  lookup    {args.lookups:>9} IPs  {elapsed:>7.2f}s  {args.lookups / elapsed:>9.0f}/s"
+              f"  ({found} routed)")
+        index.close()
+
+        asnindex.configure(index=index_path)
+        shared = [random_ip(rng, end) for _ in range(args.ips)]
+        entries = [{"subdomain": f"host{i}.example.com", "ip": shared[i % len(shared)]}
+                   for i in range(args.subdomains)]
+        start = time.perf_counter()
+        asnindex.annotate(entries)
+        providers = asnindex.group_by_provider(entries)
+        elapsed = time.perf_counter() - start
+        print(f"  annotate  {args.subdomains:>9} subdomains  {elapsed:>7.2f}s"
+              f"  {args.subdomains / elapsed:>9.0f}/s  ({len(providers)} providers)")
+        asnindex.configure()  # unmap before the directory is removed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bench_crtsh.py
+
+"""
+Benchmark: crt.sh response parsing
+
+Description:
+Compares the original buffered crt.sh parsing (`response.json()` followed by a substring scope
+check) with the streaming parser used by the crt.sh provider. Each variant runs in its own subprocess
+so the reported peak RSS belongs to that variant alone.
+
+A large fixture shaped like a real crt.sh response is generated on first use (or pass
+--fixture to reuse a recorded response saved to disk).
+
+Usage:
+    python3 benchmarks/bench_crtsh.py [--entries 300000] [--fixture path/to/crtsh.json]
+
+Limitations:
+- Peak RSS is read from getrusage, which is unavailable on Windows
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DOMAIN = "example.com"
+
+
+def generate_fixture(path, entries, unique_names=20000):
+    """Write a crt.sh-style JSON array with many duplicate certificate names."""
+    rng = random.Random(1)
+    labels = ["www", "api", "mail", "dev", "staging", "vpn", "cdn", "shop", "admin", "portal"]
+    with open(path, "w") as f:
+        f.write("[")
+        for i in range(entries):
+            host = f"{rng.choice(labels)}{rng.randrange(unique_names)}.{DOMAIN}"
+            names = [host, f"*.{host}"] if i % 3 == 0 else [host]
+            entry = {
+                "issuer_ca_id": 183267,
+                "issuer_name": "C=US, O=Let's Encrypt, CN=R3",
+                "common_name": host,
+                "name_value": "\n".join(names),
+                "id": 5000000000 + i,
+                "entry_timestamp": "2024-01-01T00:00:00.000",
+                "not_before": "2024-01-01T00:00:00",
+                "not_after": "2024-04-01T00:00:00",
+                "serial_number": f"{rng.getrandbits(128):032x}",
+            }
+            f.write(("," if i else "") + json.dumps(entry))
+        f.write("]")
+
+
+def run_buffered(path):
+    # Original implementation: whole body in memory, then substring scope check
+    with open(path, "rb") as f:
+        entries = json.loads(f.read())
+    found = set()
+    for entry in entries:
+        name_value = entry.get("name_value")
+        if name_value:
+            for item in name_value.split("\n"):
+                if DOMAIN in item:
+                    found.add(item.strip())
+    return len(found)
+
+
+def run_streaming(path):
+    import jsonstream
+    import providers
+    with open(path, "rb") as f:
+        return sum(1 for _ in providers.iter_crtsh_names(jsonstream.iter_file_chunks(f), DOMAIN))
+
+
+def measure(variant, path):
+    start = time.perf_counter()
+    names = run_buffered(path) if variant == "buffered" else run_streaming(path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"variant": variant, "names": names, "seconds": round(elapsed, 3), "peak_rss_mb": round(peak_kb / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crt.sh response parsing")
+    parser.add_argument("--entries", type=int, default=300000, help="Entries in the generated fixture")
+    parser.add_argument("--fixture", help="Use an existing crt.sh JSON response instead of generating one")
+    parser.add_argument("--variant", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.variant, args.fixture)))
+        return
+
+    fixture = args.fixture or os.path.join(ROOT, "data", f"bench_crtsh_{args.entries}.json")
+    if not os.path.exists(fixture):
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        print(f"[*] Generating fixture with {args.entries} entries: {fixture}")
+        generate_fixture(fixture, args.entries)
+    print(f"[*] Fixture size: {round(os.path.getsize(fixture) / 1024 / 1024, 1)} MB")
+
+    for variant in ("buffered", "streaming"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--variant", variant, "--fixture", fixture],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output)
+        print(f"  {variant:<10} {result['seconds']:>8}s  peak RSS {result['peak_rss_mb']:>8} MB  names {result['names']}")
+
+
+if __name__ == "__main__":
+    main()
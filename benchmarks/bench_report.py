@@ -0,0 +1,75 @@
+# bench_report.py
+
+"""
+Benchmark: report rendering
+
+Description:
+Generates synthetic scan data at several sizes and measures render time and output size for
+every report format produced by report_generator.generate_report.
+
+Usage:
+    python3 benchmarks/bench_report.py [--sizes 1000,10000,100000] [--formats json,ndjson,txt,html,pdf]
+
+Limitations:
+- Uses synthetic data; real reports contain more theHarvester and WHOIS fields
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import report_generator
+
+
+def make_data(rows):
+    """Scan data with `rows` subdomains and a tenth as many harvested hosts and emails."""
+    return {
+        "target": "example.com",
+        "subdomains": [
+            {"subdomain": f"host{i}.example.com", "ip": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"}
+            for i in range(rows)
+        ],
+        "theharvester": {
+            "emails": [f"user{i}@example.com" for i in range(rows // 10)],
+            "hosts": [f"h{i}.example.com" for i in range(rows // 10)],
+        },
+        "whois": {
+            "domain_name": "EXAMPLE.COM",
+            "registrar": "Example Registrar, Inc.",
+            "name_servers": ["a.iana-servers.net", "b.iana-servers.net"],
+        },
+    }
+
+
+def measure(data, report_format, directory):
+    output_path = os.path.join(directory, f"report_{len(data['subdomains'])}")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        report_generator.generate_report(data, output_path, report_format)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(f"{output_path}.{report_format}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report rendering")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated subdomain counts")
+    parser.add_argument("--formats", default="json,ndjson,txt,html,pdf", help="Comma-separated report formats")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in (int(size) for size in args.sizes.split(",")):
+            data = make_data(rows)
+            for report_format in args.formats.split(","):
+                elapsed, size = measure(data, report_format, directory)
+                print(f"  {rows:>8} rows  {report_format:<7} {elapsed:>8.2f}s  {size / 1024 / 1024:>8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
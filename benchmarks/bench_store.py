@@ -0,0 +1,96 @@
+# bench_store.py
+
+"""
+Benchmark: results store bulk load and queries
+
+Description:
+Loads synthetic scan results for many targets into resultstore.py (one record_scan() per
+target, as main.py does after each scan) and reports the bulk-load throughput, then measures
+the latency of the lookups behind `main.py query`: by IP, by subdomain, by target and by WHOIS
+name server.
+
+Usage:
+    python3 benchmarks/bench_store.py [--rows 1000000] [--targets 5000] [--queries 200]
+
+Limitations:
+- Synthetic data; hosts are spread evenly over the targets
+- The database is created in a temporary directory, so the page cache is warm for queries
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import resultstore
+
+NAMESERVERS = [f"ns{i}.dns-host{i // 2}.net" for i in range(200)]
+
+
+def target_results(index, hosts):
+    target = f"target{index}.com"
+    subdomains = [{"subdomain": f"host{i}.{target}", "ip": f"10.{index >> 8 & 255}.{index & 255}.{i % 250}"}
+                  for i in range(hosts)]
+    whois = {"registrar": f"Registrar {index % 50}",
+             "name_servers": [NAMESERVERS[index % 200], NAMESERVERS[(index + 1) % 200]]}
+    return target, subdomains, whois
+
+
+def timed(function, count):
+    """Median and p99 latency in milliseconds of count calls."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the results store")
+    parser.add_argument("--rows", type=int, default=1000000, help="Host rows to load")
+    parser.add_argument("--targets", type=int, default=5000, help="Targets the rows are spread over")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per lookup kind")
+    args = parser.parse_args()
+
+    hosts = max(1, args.rows // args.targets)
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.sqlite")
+        resultstore.configure(path=path)
+
+        start = time.perf_counter()
+        for index in range(args.targets):
+            resultstore.record_scan(*target_results(index, hosts))
+        loaded = time.perf_counter() - start
+        rows = hosts * args.targets
+        print(f"  load      {rows:>9} rows  {loaded:>7.2f}s  {rows / loaded:>9.0f} rows/s"
+              f"  {os.path.getsize(path) / 1024 / 1024:>7.1f} MB")
+
+        start = time.perf_counter()
+        resultstore.record_scan(*target_results(0, hosts))
+        print(f"  re-scan   {hosts:>9} rows  {time.perf_counter() - start:>7.3f}s  (one target, upsert)")
+
+        lookups = {
+            "ip": lambda: resultstore.query(ip=f"10.0.{rng.randrange(min(256, args.targets))}.{rng.randrange(250)}"),
+            "subdomain": lambda: resultstore.query(
+                subdomain=f"host{rng.randrange(hosts)}.target{rng.randrange(args.targets)}.com"),
+            "target": lambda: resultstore.query(target=f"target{rng.randrange(args.targets)}.com"),
+            "nameserver": lambda: resultstore.query(nameserver=rng.choice(NAMESERVERS)),
+        }
+        for kind, lookup in lookups.items():
+            median, p99 = timed(lookup, args.queries)
+            rows_returned = len(lookup()[1])
+            print(f"  query {kind:<10} median {median:>7.2f} ms  p99 {p99:>7.2f} ms  ({rows_returned} rows)")
+        resultstore.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# run_benchmarks.py
+
+"""
+Benchmark: end-to-end suite with regression check
+
+Description:
+Runs the scan modules end to end against the local stand-ins from stubs.py (DNS server with
+latency and loss, crt.sh/hackertarget fixtures over HTTP, WHOIS server, fake theHarvester) at
+several scales, and compares wall time and peak RSS with the stored baselines in
+benchmarks/baselines.json. Exits with status 1 when a result regressed, so it can gate a CI job.
+
+Each (benchmark, scale) pair runs in its own subprocess and scratch directory, so peak RSS and
+caches belong to that run alone. What a scale of N means per benchmark:
+
+- subdomains: get_subdomains() with an N-word wordlist, N/10 crt.sh entries and N/100
+  hackertarget hosts
+- whois: get_whois_bulk() of N/100 domains (at least 10) through the native WHOIS client
+- harvest: run_harvest() over 4 fake theHarvester sources returning N hosts between them
+- report-<format>: generate_report() with N subdomain rows
+
+Usage:
+    python3 benchmarks/run_benchmarks.py [--scales 1k,100k,1m] [--benchmarks subdomains,whois]
+    python3 benchmarks/run_benchmarks.py --scales 1k,100k --update-baselines
+
+Limitations:
+- Baselines are only comparable on the machine (and stub settings) they were recorded with;
+  re-record them with --update-baselines after changing either
+- Peak RSS is read from getrusage, which is unavailable on Windows
+- WHOIS is measured through the native client; the python-whois path needs the real servers
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import stubs
+
+DOMAIN = "example.com"
+WHOIS_TLD = "test"
+HARVEST_SOURCES = ["bing", "crtsh", "duckduckgo", "otx"]
+REPORT_FORMATS = ["json", "ndjson", "txt", "html", "pdf"]
+BENCHMARKS = ["subdomains", "whois", "harvest"] + [f"report-{fmt}" for fmt in REPORT_FORMATS]
+SCALES = {"1k": 1000, "10k": 10000, "100k": 100000, "1m": 1000000}
+BASELINES = os.path.join(BENCH_DIR, "baselines.json")
+TOLERANCE = 0.25  # allowed relative slowdown / memory growth before a result counts as a regression
+MIN_SECONDS = 0.5  # absolute slack, so sub-second runs do not fail on scheduler noise
+MIN_RSS_MB = 10.0
+
+
+def scale_value(scale):
+    return SCALES[scale] if scale in SCALES else int(scale)
+
+
+def prepare(fixtures, scale, n):
+    """Generate the fixture files for one scale (reused if they already exist)."""
+    from bench_crtsh import generate_fixture
+
+    files = {
+        "wordlist": os.path.join(fixtures, f"words_{scale}.txt"),
+        "crtsh": os.path.join(fixtures, f"crtsh_{scale}.json"),
+        "hackertarget": os.path.join(fixtures, f"hackertarget_{scale}.txt"),
+    }
+    if not os.path.exists(files["wordlist"]):
+        stubs.write_wordlist(files["wordlist"], n)
+    if not os.path.exists(files["crtsh"]):
+        generate_fixture(files["crtsh"], max(100, n // 10), unique_names=max(100, n // 20))
+    if not os.path.exists(files["hackertarget"]):
+        stubs.write_hackertarget_fixture(files["hackertarget"], max(10, n // 100), DOMAIN)
+    return files
+
+
+def bench_subdomains(n, env):
+    import providers
+    import subdomains
+
+    providers.PROVIDERS["crtsh"].url = f"http://127.0.0.1:{env['http_port']}/crtsh/{env['scale']}?q={{domain}}"
+    providers.PROVIDERS["hackertarget"].url = (f"http://127.0.0.1:{env['http_port']}/hackertarget/"
+                                               f"{env['scale']}?q={{domain}}")
+    results = subdomains.get_subdomains(DOMAIN, nameservers=[f"127.0.0.1:{env['dns_port']}"],
+                                        provider_names=["crtsh", "hackertarget"], wordlist=env["wordlist"])
+    return n, len(results)
+
+
+def bench_whois(n, env):
+    import whois as whois_info
+    import whois_client
+
+    whois_client.configure(servers={WHOIS_TLD: f"127.0.0.1:{env['whois_port']}"})
+    domains = [f"domain{i}.{WHOIS_TLD}" for i in range(max(10, n // 100))]
+    results = whois_info.get_whois_bulk(domains)
+    return len(domains), sum(1 for result in results.values() if result)
+
+
+def bench_harvest(n, env):
+    import theHarvester
+
+    theHarvester.HARVESTER_BIN = stubs.write_harvester(os.getcwd(), n, HARVEST_SOURCES)
+    results = theHarvester.run_harvest(DOMAIN, interactive=False, sources=HARVEST_SOURCES)
+    return n, len(results.get("hosts", []))
+
+
+def bench_report(n, env, report_format):
+    from bench_report import make_data
+    import report_generator
+
+    data = make_data(n)
+    output_path = os.path.join(os.getcwd(), "report")
+    report_generator.generate_report(data, output_path, report_format)
+    return n, os.path.getsize(f"{output_path}.{report_format}")
+
+
+def run_child(name, n, env):
+    """Run one benchmark in this process (called in a subprocess) and return its result."""
+    import cache
+    import ratelimit
+
+    cache.configure(path=os.path.join(os.getcwd(), "cache.sqlite"))
+    ratelimit.configure({"crtsh": 0, "hackertarget": 0, "whois": 0}, default_rate=0)
+
+    if name.startswith("report-"):
+        run = lambda: bench_report(n, env, name.split("-", 1)[1])
+    else:
+        run = lambda: globals()[f"bench_{name}"](n, env)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        items, produced = run()
+        elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "seconds": round(elapsed, 3),
+        "rate": round(items / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "items": items,
+        "produced": produced,
+    }
+
+
+def run_one(name, scale, env):
+    with tempfile.TemporaryDirectory(prefix="reconstudio-bench-") as directory:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name, "--scales", scale, "--env", json.dumps(env)],
+            cwd=directory, capture_output=True, text=True
+        )
+    if output.returncode != 0:
+        raise RuntimeError(f"{name} at {scale} failed:\n{output.stderr.strip()}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def compare(key, result, baseline, tolerance):
+    """Return a list of regression messages for one result."""
+    problems = []
+    if baseline is None:
+        return problems
+    for field, slack, unit in (("seconds", MIN_SECONDS, "s"), ("peak_rss_mb", MIN_RSS_MB, " MB")):
+        limit = max(baseline[field] * (1 + tolerance), baseline[field] + slack)
+        if result[field] > limit:
+            problems.append(f"{key}: {field} {result[field]}{unit} > {round(limit, 2)}{unit} "
+                            f"(baseline {baseline[field]}{unit})")
+    return problems
+
+
+def stub_settings(args):
+    return {"dns_latency": args.dns_latency, "dns_loss": args.dns_loss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the end-to-end benchmark suite")
+    parser.add_argument("--scales", default="1k,100k,1m", help="Comma-separated scales (1k, 100k, 1m or a number)")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help="Comma-separated benchmarks")
+    parser.add_argument("--dns-latency", type=float, default=0.002, help="Stub DNS response delay in seconds")
+    parser.add_argument("--dns-loss", type=float, default=0.0, help="Fraction of stub DNS queries dropped")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed relative regression")
+    parser.add_argument("--fixtures", help="Directory to keep generated fixtures in between runs")
+    parser.add_argument("--baselines", default=BASELINES, help="Baselines JSON file")
+    parser.add_argument("--update-baselines", action="store_true", help="Store these results as the new baselines")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--env", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, scale_value(args.scales), json.loads(args.env))))
+        return
+
+    names = args.benchmarks.split(",")
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+        if baselines.get("stubs") != stub_settings(args):
+            print(f"[!] Baselines were recorded with stub settings {baselines.get('stubs')}; results may differ")
+
+    fixtures_dir = args.fixtures or tempfile.mkdtemp(prefix="reconstudio-fixtures-")
+    os.makedirs(fixtures_dir, exist_ok=True)
+    scales = {scale: scale_value(scale) for scale in args.scales.split(",")}
+    files = {scale: prepare(fixtures_dir, scale, n) for scale, n in scales.items()}
+    routes = {}
+    for scale in scales:
+        routes[f"/crtsh/{scale}"] = files[scale]["crtsh"]
+        routes[f"/hackertarget/{scale}"] = files[scale]["hackertarget"]
+
+    dns = stubs.start_dns(args.dns_latency, args.dns_loss)
+    http = stubs.start_http(routes)
+    whois = stubs.start_whois()
+    print(f"[*] Stubs: DNS 127.0.0.1:{dns.port} (latency {args.dns_latency}s, loss {args.dns_loss}), "
+          f"HTTP 127.0.0.1:{http.port}, WHOIS 127.0.0.1:{whois.port}")
+
+    results = {}
+    problems = []
+    try:
+        for scale in scales:
+            env = {"scale": scale, "wordlist": files[scale]["wordlist"],
+                   "dns_port": dns.port, "http_port": http.port, "whois_port": whois.port}
+            for name in names:
+                key = f"{name}@{scale}"
+                result = results[key] = run_one(name, scale, env)
+                baseline = baselines.get("results", {}).get(key)
+                regressions = compare(key, result, baseline, args.tolerance)
+                problems += regressions
+                status = "REGRESSED" if regressions else ("ok" if baseline else "no baseline")
+                print(f"  {key:<22} {result['seconds']:>9.2f}s  {result['rate'] or 0:>11.1f}/s"
+                      f"  peak RSS {result['peak_rss_mb']:>8.1f} MB  produced {result['produced']:>9}  {status}")
+    finally:
+        stubs.stop(dns, http, whois)
+        if not args.fixtures:
+            for path in (path for scale_files in files.values() for path in scale_files.values()):
+                os.remove(path)
+            os.rmdir(fixtures_dir)
+
+    if args.update_baselines:
+        stored = baselines.get("results", {})
+        stored.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "stubs": stub_settings(args), "results": dict(sorted(stored.items()))}, f, indent=2)
+            f.write("\n")
+        print(f"[✓] Baselines written to {args.baselines}")
+        return
+
+    if problems:
+        print(f"[!] {len(problems)} regression(s) against {args.baselines}:")
+        for problem in problems:
+            print(f"    {problem}")
+        sys.exit(1)
+    print("[✓] No regressions")
+
+
+if __name__ == "__main__":
+    main()
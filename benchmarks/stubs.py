@@ -0,0 +1,268 @@
+# stubs.py
+
+"""
+Benchmark helpers: local stand-ins for the services ReconStudio talks to
+
+Description:
+Local replacements for every external dependency of a scan, so benchmarks measure ReconStudio
+itself and never touch the network or a third-party API quota:
+
+- A UDP DNS server with configurable latency and packet loss
+- An HTTP server answering crt.sh and hackertarget requests from recorded (or generated) fixtures
+- A WHOIS server answering every query with a registry-style record
+- A fake theHarvester executable writing a JSON result of configurable size, with sources that
+  can be made to hang, fail or write invalid JSON (for tests)
+
+Servers run in forked processes, so their work does not count towards the measured process.
+
+Usage:
+    dns = stubs.start_dns(latency=0.002, loss=0.001)
+    http = stubs.start_http({"/crtsh": "crtsh.json", "/hackertarget": "hosts.txt"})
+    whois = stubs.start_whois()
+    harvester = stubs.write_harvester(directory, hosts=10000)
+    ...
+    stubs.stop(dns, http, whois)
+
+Limitations:
+- Forked server processes require a POSIX system
+- The DNS server answers A queries only (NOERROR or NXDOMAIN with an SOA record)
+"""
+
+import http.server
+import multiprocessing
+import os
+import random
+import select
+import shutil
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DNS_EVERY = 100  # one numbered label in this many exists
+DNS_TTL = 300
+SOA_RDATA = (b"\x03ns1\xc0\x0c\x0ahostmaster\xc0\x0c"
+             + struct.pack(">IIIII", 2024010101, 7200, 3600, 1209600, DNS_TTL))
+
+
+def dns_exists(label, every=DNS_EVERY):
+    """Whether the stub resolves a name with this first label.
+
+    "www" always exists; other labels exist when they end in a number divisible by `every`.
+    Wildcard probe labels are 16 characters long and never exist.
+    """
+    if label == b"www":
+        return True
+    if len(label) >= 16:
+        return False
+    digits = len(label) - len(label.rstrip(b"0123456789"))
+    return digits > 0 and int(label[-digits:]) % every == 0
+
+
+def dns_answer(data, every=DNS_EVERY):
+    """Build the response to one query packet, or None if it is not a query."""
+    if len(data) < 12:
+        return None
+    offset = 12
+    while offset < len(data) and data[offset]:
+        offset += data[offset] + 1
+    question = data[12:offset + 5]
+    label = data[13:13 + data[12]].lower() if len(data) > 12 else b""
+    if dns_exists(label, every):
+        address = zlib.crc32(data[12:offset].lower()) & 0xffffff | 0x0a000000
+        return (data[:2] + struct.pack(">HHHHH", 0x8180, 1, 1, 0, 0) + question
+                + b"\xc0\x0c" + struct.pack(">HHIHI", 1, 1, DNS_TTL, 4, address))
+    # NXDOMAIN with an SOA in the authority section, as real servers send for negative caching
+    return (data[:2] + struct.pack(">HHHHH", 0x8183, 1, 0, 1, 0) + question
+            + b"\xc0\x0c" + struct.pack(">HHIH", 6, 1, DNS_TTL, len(SOA_RDATA)) + SOA_RDATA)
+
+
+def _serve_dns(sock, latency, loss, every, seed):
+    rng = random.Random(seed)
+    due = deque()  # (send time, packet, address); latency is constant, so it stays ordered
+    sock.setblocking(False)
+    while True:
+        wait = max(0.0, due[0][0] - time.monotonic()) if due else None
+        readable, _, _ = select.select([sock], [], [], wait)
+        if readable:
+            while True:
+                try:
+                    data, address = sock.recvfrom(512)
+                except BlockingIOError:
+                    break
+                if loss and rng.random() < loss:
+                    continue
+                response = dns_answer(data, every)
+                if response is not None:
+                    due.append((time.monotonic() + latency, response, address))
+        now = time.monotonic()
+        while due and due[0][0] <= now:
+            _, response, address = due.popleft()
+            try:
+                sock.sendto(response, address)
+            except (BlockingIOError, OSError):
+                pass
+
+
+def _start(target, sock, *args):
+    process = multiprocessing.get_context("fork").Process(target=target, args=(sock, *args), daemon=True)
+    process.start()
+    process.port = sock.getsockname()[1]
+    sock.close()
+    return process
+
+
+def start_dns(latency=0.0, loss=0.0, every=DNS_EVERY, seed=1):
+    """Start the DNS stub; returns the server process, with its UDP port as `.port`."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 << 20)
+    sock.bind(("127.0.0.1", 0))
+    return _start(_serve_dns, sock, latency, loss, every, seed)
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+def _serve_http(sock, routes):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            path = routes.get(self.path.split("?", 1)[0])
+            if path is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json" if path.endswith(".json") else "text/plain")
+            self.send_header("Content-Length", str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+
+        def log_message(self, *args):
+            pass
+
+    server = _ThreadingHTTPServer(sock.getsockname(), Handler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.serve_forever()
+
+
+def start_http(routes):
+    """Start an HTTP server answering GET <path>?... with the fixture file routes[path]."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(64)
+    return _start(_serve_http, sock, routes)
+
+
+def whois_record(domain, registrar="Benchmark Registrar, Inc.", referral=None):
+    return (f"Domain Name: {domain.upper()}\r\n"
+            f"Registrar: {registrar}\r\n"
+            + (f"Registrar WHOIS Server: {referral}\r\n" if referral else "") +
+            "Creation Date: 2001-02-03T04:05:06Z\r\n"
+            "Registry Expiry Date: 2031-02-03T04:05:06Z\r\n"
+            f"Name Server: NS1.{domain.upper()}\r\n"
+            f"Name Server: NS2.{domain.upper()}\r\n"
+            "Domain Status: clientTransferProhibited https://icann.org/epp#clientTransferProhibited\r\n"
+            f"Registrant Email: hostmaster@{domain}\r\n")
+
+
+def _serve_whois(sock, registrar, referral):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            domain = self.rfile.readline().strip().decode("utf-8", "replace")
+            self.wfile.write(whois_record(domain, registrar, referral).encode("utf-8"))
+
+    server = socketserver.ThreadingTCPServer(sock.getsockname(), Handler, bind_and_activate=False)
+    server.daemon_threads = True
+    server.socket.close()
+    server.socket = sock
+    server.serve_forever()
+
+
+def start_whois(host="127.0.0.1", registrar="Benchmark Registrar, Inc.", referral=None):
+    """Start a WHOIS server (plain TCP) answering any domain; pin a TLD to it with whois_client.configure().
+
+    With referral ("host:port") the answers point to a registrar WHOIS server, like a thin registry.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, 0))
+    sock.listen(128)
+    return _start(_serve_whois, sock, registrar, referral)
+
+
+HARVESTER_SCRIPT = """#!{python}
+# Fake theHarvester for benchmarks: writes {hosts} hosts (split over the sources) to -f <file>.json
+import json, sys, time
+SOURCES = {sources!r}
+args = dict(zip(*[iter(arg for arg in sys.argv[1:] if arg != "-v")] * 2))
+domain, sources, output = args["-d"], args["-b"], args["-f"]
+if sources in {hang!r}:
+    time.sleep(3600)
+if sources in {fail!r}:
+    print(f"[!] {{sources}}: failed")
+    sys.exit(2)
+if sources in {invalid!r}:
+    with open(output + ".json", "w") as f:
+        f.write("{{not json")
+    sys.exit(0)
+index = SOURCES.index(sources) if sources in SOURCES else 0
+hosts, share = {hosts}, max(1, {hosts} // len(SOURCES))
+# Each source returns its own share plus the next one, so the merged result overlaps by half
+numbers = [(index * share + i) % hosts for i in range(min(hosts, 2 * share))]
+result = {{
+    "hosts": [f"h{{n}}.{{domain}}" for n in numbers],
+    "emails": [f"user{{n}}@{{domain}}" for n in numbers[::10]],
+    "ips": [f"10.{{n >> 16 & 255}}.{{n >> 8 & 255}}.{{n & 255}}" for n in numbers[::10]],
+}}
+print(f"[*] {{sources}}: {{len(numbers)}} hosts")
+with open(output + ".json", "w") as f:
+    json.dump(result, f)
+"""
+
+
+def write_harvester(directory, hosts, sources=("all",), hang=(), fail=(), invalid=()):
+    """Write an executable fake theHarvester into directory and return its path.
+
+    The `hosts` names are shared out over `sources` (the -b values it will be run with). Runs
+    for a -b value in hang sleep for an hour, in fail exit with status 2, and in invalid write
+    a JSON file that does not parse.
+    """
+    path = os.path.join(directory, "theHarvester")
+    with open(path, "w") as f:
+        f.write(HARVESTER_SCRIPT.format(python=sys.executable, hosts=hosts, sources=list(sources),
+                                        hang=list(hang), fail=list(fail), invalid=list(invalid)))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def write_hackertarget_fixture(path, lines, domain="example.com"):
+    """Write a hackertarget hostsearch response: "host,ip" per line."""
+    with open(path, "w") as f:
+        for i in range(lines):
+            f.write(f"ht{i}.{domain},10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}\n")
+
+
+def write_wordlist(path, words):
+    with open(path, "w") as f:
+        for i in range(words):
+            f.write(f"w{i}\n")
+
+
+def stop(*processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5)
+
@@ -0,0 +1,207 @@
+# cache.py
+
+"""
+Module: cache.py
+
+Description:
+This module provides a persistent on-disk cache for slow provider responses (crt.sh,
+hackertarget, WHOIS). Entries are keyed by provider and query, stored zlib-compressed in a
+local SQLite database, and expire after a per-provider TTL. Re-scanning the same domain a few
+hours later, or regenerating a report, then costs almost no network time.
+
+Features:
+- SQLite storage with zlib-compressed values
+- Per-provider TTLs with a default for unknown providers
+- Size cap with least-recently-used eviction
+- Three modes: "normal" (read-through), "refresh" (always refetch and overwrite)
+  and "cache-only" (never touch the network; misses raise CacheMiss)
+- Safe to use from several threads at once
+
+Usage:
+Wrap the network call of a provider in `fetch()`:
+
+    body = cache.fetch("crtsh", domain, lambda: download(domain))
+
+Streaming producers use `lookup()` first and `put()` once their stream completed.
+
+main.py sets the database path, mode, TTLs and size cap via `configure()`.
+
+Dependencies:
+- sqlite3
+- zlib
+- json
+- threading
+
+Limitations:
+- The loader must return bytes or str (or None for "do not cache")
+- Eviction runs after writes only, so the file may briefly exceed the cap
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import metrics
+
+DEFAULT_PATH = "data/cache.sqlite"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_TTLS = {
+    "crtsh": 24 * 3600,
+    "hackertarget": 24 * 3600,
+    "whois": 7 * 24 * 3600,
+    "whois-server": 30 * 24 * 3600,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+MODE_NORMAL = "normal"
+MODE_REFRESH = "refresh"
+MODE_CACHE_ONLY = "cache-only"
+
+_settings = {
+    "path": DEFAULT_PATH,
+    "mode": MODE_NORMAL,
+    "ttls": dict(DEFAULT_TTLS),
+    "max_bytes": DEFAULT_MAX_BYTES,
+}
+_conn = None
+_lock = threading.Lock()
+
+
+class CacheMiss(Exception):
+    """Raised in cache-only mode when a provider response is not cached."""
+
+
+def configure(path=None, mode=None, ttls=None, max_bytes=None):
+    """Change cache settings; the database is (re)opened lazily on next use."""
+    global _conn
+    with _lock:
+        if path is not None and path != _settings["path"]:
+            if _conn is not None:
+                _conn.close()
+                _conn = None
+            _settings["path"] = path
+        if mode is not None:
+            _settings["mode"] = mode
+        if ttls:
+            _settings["ttls"].update(ttls)
+        if max_bytes is not None:
+            _settings["max_bytes"] = max_bytes
+
+
+def mode():
+    return _settings["mode"]
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(_settings["path"])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(_settings["path"], check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " provider TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, stored REAL NOT NULL, accessed REAL NOT NULL,"
+            " PRIMARY KEY (provider, key))"
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        _conn.commit()
+    return _conn
+
+
+def _ttl(provider):
+    return _settings["ttls"].get(provider, DEFAULT_TTL)
+
+
+def get(provider, key):
+    """Return the cached bytes for (provider, key), or None if missing or expired."""
+    with _lock:
+        conn = _connect()
+        row = conn.execute(
+            "SELECT value, stored FROM entries WHERE provider = ? AND key = ?", (provider, key)
+        ).fetchone()
+        if row is None:
+            metrics.count("cache_misses", provider=provider)
+            return None
+        value, stored = row
+        now = time.time()
+        if now - stored > _ttl(provider):
+            conn.execute("DELETE FROM entries WHERE provider = ? AND key = ?", (provider, key))
+            conn.commit()
+            metrics.count("cache_misses", provider=provider)
+            return None
+        conn.execute("UPDATE entries SET accessed = ? WHERE provider = ? AND key = ?", (now, provider, key))
+        conn.commit()
+    metrics.count("cache_hits", provider=provider)
+    return zlib.decompress(value)
+
+
+def put(provider, key, value):
+    """Store bytes (or str) for (provider, key) and evict old entries if over the size cap."""
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    blob = zlib.compress(value, 6)
+    now = time.time()
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (provider, key, value, size, stored, accessed)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (provider, key, blob, len(blob), now, now)
+        )
+        _evict(conn)
+        conn.commit()
+
+
+def _evict(conn):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= _settings["max_bytes"]:
+        return
+    rows = conn.execute("SELECT provider, key, size FROM entries ORDER BY accessed").fetchall()
+    for provider, key, size in rows:
+        if total <= _settings["max_bytes"]:
+            break
+        conn.execute("DELETE FROM entries WHERE provider = ? AND key = ?", (provider, key))
+        total -= size
+
+
+def lookup(provider, key):
+    """Return cached bytes honouring the cache mode: None means "go to the network".
+
+    In refresh mode this always returns None; in cache-only mode a miss raises CacheMiss.
+    """
+    if _settings["mode"] != MODE_REFRESH:
+        value = get(provider, key)
+        if value is not None:
+            return value
+    if _settings["mode"] == MODE_CACHE_ONLY:
+        raise CacheMiss(f"{provider}:{key} is not cached")
+    return None
+
+
+def fetch(provider, key, loader):
+    """Return cached bytes or call loader() and cache its result, honouring the cache mode."""
+    value = lookup(provider, key)
+    if value is not None:
+        return value
+    value = loader()
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    put(provider, key, value)
+    return value
+
+
+def fetch_json(provider, key, loader):
+    """Like fetch(), for loaders returning JSON-serialisable objects."""
+    def load_bytes():
+        value = loader()
+        return None if value is None else json.dumps(value)
+
+    value = fetch(provider, key, load_bytes)
+    return None if value is None else json.loads(value)
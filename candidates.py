@@ -0,0 +1,122 @@
+# candidates.py
+
+"""
+Module: candidates.py
+
+Description:
+This module produces brute-force candidate labels for subdomains.py without building candidate
+lists in memory. Wordlists are read straight from a memory-mapped file, one line at a time, so
+a wordlist with millions of entries costs no more memory than a short one. Permutations of the
+names already discovered (dev-api, api2, staging-www, ...) are generated lazily from those names.
+
+Features:
+- `iter_wordlist(path)`: streams a wordlist through mmap, skipping blanks and '#' comments
+- `Wordlist(path, offset, end)`: the same, exposing the byte offset reached for checkpoints
+- `shard_offsets(path, shards)`: line-aligned byte ranges for splitting a wordlist across processes
+- `permutations(names, domain)`: lazy permutations of discovered names:
+  word-label and label-word joins, numeric suffixes, incremented and decremented numbers,
+  and sibling names in deeper zones
+- Both are plain generators and can be passed to subdomains.brute_force_source()
+
+Usage:
+    source = subdomains.brute_force_source(domain, candidates.iter_wordlist("words.txt"))
+    for name in candidates.permutations(["api.example.com"], "example.com"):
+        ...
+
+Dependencies:
+- mmap
+- os
+- re
+
+Limitations:
+- Permutations may repeat names; the subdomain pipeline deduplicates them
+- Wordlists are expected to be UTF-8 or ASCII, one label (or dotted labels) per line
+"""
+
+import mmap
+import os
+import re
+
+PERMUTATION_WORDS = ["dev", "test", "staging", "stage", "prod", "qa", "uat", "beta", "api", "www",
+                     "internal", "admin", "old", "new", "v2", "backup"]
+NUMBER_SUFFIXES = range(1, 4)
+NUMBER_PATTERN = re.compile(r"^(.*?)(\d+)$")
+
+
+class Wordlist:
+    """Iterable over a wordlist file through a memory map, from byte offset up to byte end.
+
+    `offset` is the position just past the last word yielded, so it can be saved and passed
+    back in to resume an interrupted brute-force. `end` limits the iteration to one shard.
+    """
+
+    def __init__(self, path, offset=0, end=None):
+        self.path = path
+        self.offset = offset
+        self.end = end
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(self.offset)
+                while self.end is None or mm.tell() < self.end:
+                    line = mm.readline()
+                    if not line:
+                        break
+                    self.offset = mm.tell()
+                    word = line.strip().lower()
+                    if word and not word.startswith(b"#"):
+                        yield word.decode("utf-8", "replace")
+
+
+def iter_wordlist(path, offset=0):
+    """Yield the words of a wordlist file, lower-cased, reading it through a memory map."""
+    yield from Wordlist(path, offset)
+
+
+def shard_offsets(path, shards):
+    """Split a wordlist into `shards` (start, end) byte ranges that begin on line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return [(0, 0)] * shards
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for index in range(1, shards):
+            newline = mm.find(b"\n", max(0, size * index // shards - 1))
+            bounds.append(max(bounds[-1], size if newline == -1 else newline + 1))
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _label_variants(label, words):
+    for word in words:
+        if word != label:
+            yield f"{word}-{label}"
+            yield f"{label}-{word}"
+    match = NUMBER_PATTERN.match(label)
+    if match:
+        prefix, number = match.group(1), int(match.group(2))
+        width = len(match.group(2))
+        for other in (number - 1, number + 1):
+            if other >= 0:
+                yield f"{prefix}{other:0{width}d}"
+    else:
+        for number in NUMBER_SUFFIXES:
+            yield f"{label}{number}"
+
+
+def permutations(names, domain, words=PERMUTATION_WORDS):
+    """Lazily yield permutations of discovered names that are inside the domain."""
+    domain = domain.lower()
+    for name in names:
+        if name == domain or not name.endswith("." + domain):
+            continue
+        label, parent = name.split(".", 1)
+        for variant in _label_variants(label, words):
+            yield f"{variant}.{parent}"
+        if parent != domain:
+            # Siblings in deeper zones; the target's own zone is covered by the wordlist
+            for word in words:
+                yield f"{word}.{parent}"
@@ -0,0 +1,147 @@
+# checkpoint.py
+
+"""
+Module: checkpoint.py
+
+Description:
+This module keeps the scan journal that lets ReconStudio resume an interrupted scan. While a
+target is scanned, progress is appended to data/journal_<target>.jsonl: every resolved
+subdomain, the position reached in the brute-force wordlist (with the few names before it that
+were still being resolved), and the result of every module
+that has finished. `main.py --resume` reads the journal back and continues from there instead
+of starting over.
+
+Features:
+- Append-only JSON-lines journal, one file per target
+- Writes are buffered and flushed in batches (by record count or age), so checkpointing costs
+  almost nothing in the resolution loop
+- A torn last line from a killed process is ignored on load
+- The wordlist position is only reused when the same wordlist is given again
+
+Usage:
+    journal = checkpoint.Journal(checkpoint.journal_path(target))
+    journal.write({"type": "start", "target": target, "wordlist": path})
+    journal.subdomain({"subdomain": "www.example.com", "ip": "10.0.0.1"})
+    journal.checkpoint("brute-force", 123456, ["w812.example.com"])
+    journal.module_done("whois", whois_data)
+    journal.close()
+
+    state = checkpoint.load(checkpoint.journal_path(target))
+
+Dependencies:
+- json
+- threading
+- time
+
+Limitations:
+- Records still in the buffer when the process is killed with SIGKILL are lost; at most one
+  flush interval of work is redone on resume
+- Passive providers are queried again on resume (their responses normally come from the cache)
+"""
+
+import json
+import os
+import threading
+import time
+
+FLUSH_INTERVAL = 1.0  # seconds a record may wait in the buffer
+FLUSH_RECORDS = 1000  # records buffered before a flush
+
+
+def journal_path(target, directory="data"):
+    return os.path.join(directory, f"journal_{target}.jsonl")
+
+
+class Journal:
+    """Buffered append-only journal of scan progress. Thread-safe."""
+
+    def __init__(self, path, append=False, flush_interval=FLUSH_INTERVAL, flush_records=FLUSH_RECORDS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._buffer = []
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(json.dumps(record, default=str))
+            if len(self._buffer) >= self.flush_records or time.monotonic() - self._flushed >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer = []
+        self._flushed = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def subdomain(self, entry):
+        self.write({"type": "subdomain", "subdomain": entry["subdomain"], "ip": entry["ip"]})
+
+    def checkpoint(self, source, position, pending=()):
+        """Everything the source produced before this position has been resolved, except pending."""
+        record = {"type": "checkpoint", "source": source, "position": position}
+        if pending:
+            record["pending"] = list(pending)
+        self.write(record)
+
+    def module_done(self, name, result):
+        self.write({"type": "module", "name": name, "data": result})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Close and delete the journal once the scan has completed."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def load(path):
+    """Read a journal into {"start", "subdomains", "positions", "pending", "modules"}, or None if there is none.
+
+    pending maps a source to the names its last checkpoint still had in flight.
+    """
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+    state = {"start": {}, "subdomains": {}, "positions": {}, "pending": {}, "modules": {}}
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write from a killed process
+            kind = record.get("type")
+            if kind == "start":
+                state["start"] = record
+            elif kind == "subdomain":
+                state["subdomains"][record["subdomain"]] = record["ip"]
+            elif kind == "checkpoint":
+                state["positions"][record["source"]] = record["position"]
+                state["pending"][record["source"]] = record.get("pending", [])
+            elif kind == "module":
+                state["modules"][record["name"]] = record["data"]
+    state["subdomains"] = [{"subdomain": name, "ip": ip} for name, ip in state["subdomains"].items()]
+    return state
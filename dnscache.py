@@ -0,0 +1,160 @@
+# dnscache.py
+
+"""
+Module: dnscache.py
+
+Description:
+This module provides the in-process DNS cache shared by everything in ReconStudio that resolves
+names through resolver.py. The same names come up several times in one scan (brute-force hits,
+crt.sh names, theHarvester hosts, later probing stages) and again across targets in batch mode;
+the cache answers repeats without sending a query.
+
+Features:
+- Bounded size with least-recently-used eviction
+- Positive answers expire after their record TTL (clamped to a configurable range)
+- Negative answers (NXDOMAIN and NODATA) are cached for the SOA negative TTL, as described in
+  RFC 2308, or a default when the response carried no SOA
+- Timeouts and server failures are never cached
+- Hit, miss and eviction counters
+- Optional persistence to a JSON file between runs, so re-scans skip most lookups
+
+Usage:
+    dnscache.configure(max_entries=100000)
+    answer = dnscache.shared.get(name)
+    if answer is None:
+        answer = await resolver.resolve(name)   # AsyncResolver stores it in the cache itself
+
+main.py loads and saves the shared cache when persistence is enabled.
+
+Dependencies:
+- collections.OrderedDict
+- json
+- threading
+- time
+
+Limitations:
+- Only the A-record answers produced by resolver.py are cached
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 500000
+DEFAULT_MIN_TTL = 0
+DEFAULT_MAX_TTL = 24 * 3600
+DEFAULT_NEGATIVE_TTL = 300
+
+# Response codes worth caching: NOERROR (positive or NODATA) and NXDOMAIN
+CACHEABLE_RCODES = (0, 3)
+
+
+class DNSCache:
+    """Thread-safe LRU cache of resolver Answers keyed by lower-case name."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, min_ttl=DEFAULT_MIN_TTL, max_ttl=DEFAULT_MAX_TTL,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0}
+        self._entries = collections.OrderedDict()  # name -> (expires, rcode, addresses)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, name):
+        """Return a cached (name, rcode, addresses, ttl) tuple or None on a miss or expiry."""
+        key = name.lower().rstrip(".")
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            expires, rcode, addresses = entry
+            self.stats["hits"] += 1
+            if not addresses:
+                self.stats["negative_hits"] += 1
+        return name, rcode, list(addresses), int(expires - now)
+
+    def expires(self, name):
+        """Expiry timestamp of a cached answer, or None; does not count as a hit or touch LRU order."""
+        with self._lock:
+            entry = self._entries.get(name.lower().rstrip("."))
+        return entry[0] if entry is not None and entry[0] > time.time() else None
+
+    def put(self, name, rcode, addresses, ttl):
+        """Cache an answer; returns False if it is not cacheable (timeouts, SERVFAIL, ...)."""
+        if rcode not in CACHEABLE_RCODES:
+            return False
+        if addresses:
+            ttl = self.min_ttl if ttl is None else ttl
+        else:
+            ttl = self.negative_ttl if ttl is None else ttl
+        ttl = max(self.min_ttl, min(self.max_ttl, ttl))
+        if ttl <= 0:
+            return False
+
+        key = name.lower().rstrip(".")
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, rcode, tuple(addresses))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path):
+        """Write unexpired entries to a JSON file."""
+        now = time.time()
+        with self._lock:
+            entries = [[name, expires, rcode, list(addresses)]
+                       for name, (expires, rcode, addresses) in self._entries.items() if expires > now]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(entries, f)
+        os.replace(path + ".tmp", path)
+        return len(entries)
+
+    def load(self, path):
+        """Load unexpired entries saved by save(); a missing or corrupt file is ignored."""
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for name, expires, rcode, addresses in entries:
+                if expires > now:
+                    self._entries[name] = (expires, rcode, tuple(addresses))
+                    loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+
+shared = DNSCache()
+
+
+def configure(max_entries=None, min_ttl=None, max_ttl=None, negative_ttl=None):
+    """Change the limits of the shared cache; existing entries are kept."""
+    settings = {"max_entries": max_entries, "min_ttl": min_ttl, "max_ttl": max_ttl, "negative_ttl": negative_ttl}
+    for name, value in settings.items():
+        if value is not None:
+            setattr(shared, name, value)
@@ -0,0 +1,448 @@
+# httpprobe.py
+
+"""
+Module: httpprobe.py
+
+Description:
+This module checks which resolved subdomains actually serve HTTP, replacing the manual
+`curl -i` probes from the commands cheat-sheet. Every host is requested on port 80 (http) and
+443 (https) by an asyncio client that keeps thousands of requests in flight, and the answer is
+summarised: status code, page title, Server header, redirect target and, for HTTPS, the
+certificate's subject CN and subject alternative names.
+
+Features:
+- asyncio client on raw streams, no third-party HTTP library
+- Global concurrency limit plus a per-IP limit, so a shared CDN or load balancer address is not
+  flooded when thousands of subdomains point at it
+- Keep-alive connection pool keyed by (IP, port, TLS server name), up to the per-IP limit per
+  key: names served by the same address reuse connections for plain HTTP
+- Connections go straight to the resolved IP with the subdomain as Host header and TLS SNI,
+  so no second DNS lookup is needed
+- Certificates are read without validation (self-signed and expired certificates are reported
+  too) and parsed with a minimal DER reader for CN and DNS/IP SANs
+- Chunked and Content-Length bodies; only the first MAX_BODY bytes are read for the title
+
+Usage:
+    results = get_http_probes("example.com", [{"subdomain": "www.example.com", "ip": "93.184.216.34"}])
+
+    async with HTTPProber(concurrency=2000, per_host=10) as prober:
+        result = await prober.probe("www.example.com", "93.184.216.34", 443, "https")
+
+Dependencies:
+- asyncio
+- ssl
+- resource (optional, raises the open-file limit on POSIX)
+- metrics (probe counters and latency histogram)
+
+Limitations:
+- GET / only; redirects are reported, not followed
+- HTTP/1.1 only (no HTTP/2 negotiation), IPv4 addresses as returned by resolver.py
+- Only the first address of each subdomain is probed
+"""
+
+import asyncio
+import collections
+import html
+import os
+import re
+import ssl
+import time
+from urllib.parse import urljoin
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import metrics
+
+DEFAULT_CONCURRENCY = 1000  # requests in flight
+DEFAULT_PER_HOST = 10  # requests in flight per IP address
+DEFAULT_TIMEOUT = 10  # seconds for connect + response, per request
+DEFAULT_PORTS = ((80, "http"), (443, "https"))
+USER_AGENT = "ReconStudio/1.0"
+MAX_HEADER = 64 * 1024  # bytes of status line and headers accepted
+MAX_BODY = 64 * 1024  # bytes of body read to find the title
+MAX_IDLE_TOTAL = 512  # idle keep-alive connections kept overall
+TITLE_PATTERN = re.compile(rb"<title[^>]*>(.*?)</title", re.IGNORECASE | re.DOTALL)
+CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w-]+)", re.IGNORECASE)
+
+OID_COMMON_NAME = bytes.fromhex("550403")  # 2.5.4.3
+OID_SUBJECT_ALT_NAME = bytes.fromhex("551d11")  # 2.5.29.17
+
+
+def _der(data, offset):
+    """Read one DER TLV at offset; returns (tag, content start, content end)."""
+    tag = data[offset]
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7f
+        length = int.from_bytes(data[offset:offset + size], "big")
+        offset += size
+    return tag, offset, offset + length
+
+
+def _der_children(data, start, end):
+    while start < end:
+        tag, content, start = _der(data, start)
+        yield tag, content, start
+
+
+def certificate_names(der):
+    """Return (subject CN, [SANs]) from a DER certificate, or (None, []) if it cannot be parsed."""
+    try:
+        _, start, end = _der(der, 0)  # Certificate
+        _, start, end = _der(der, start)  # TBSCertificate
+        fields = list(_der_children(der, start, end))
+        if fields and fields[0][0] == 0xa0:
+            fields = fields[1:]  # explicit version
+        # serial, signature, issuer, validity, subject, subjectPublicKeyInfo, then optional fields
+        _, subject_start, subject_end = fields[4]
+        common_name = None
+        for _, rdn_start, rdn_end in _der_children(der, subject_start, subject_end):
+            for _, attr_start, attr_end in _der_children(der, rdn_start, rdn_end):
+                attribute = list(_der_children(der, attr_start, attr_end))
+                (_, oid_start, oid_end), (_, value_start, value_end) = attribute[:2]
+                if der[oid_start:oid_end] == OID_COMMON_NAME:
+                    common_name = der[value_start:value_end].decode("utf-8", "replace")
+
+        sans = []
+        for tag, ext_start, ext_end in fields[6:]:
+            if tag != 0xa3:
+                continue
+            _, seq_start, seq_end = _der(der, ext_start)
+            for _, item_start, item_end in _der_children(der, seq_start, seq_end):
+                parts = list(_der_children(der, item_start, item_end))
+                if der[parts[0][1]:parts[0][2]] != OID_SUBJECT_ALT_NAME:
+                    continue
+                _, value_start, _ = parts[-1]  # OCTET STRING wrapping GeneralNames
+                _, names_start, names_end = _der(der, value_start)
+                for name_tag, name_start, name_end in _der_children(der, names_start, names_end):
+                    value = der[name_start:name_end]
+                    if name_tag == 0x82:  # dNSName
+                        sans.append(value.decode("ascii", "replace"))
+                    elif name_tag == 0x87 and len(value) == 4:  # iPAddress
+                        sans.append(".".join(str(byte) for byte in value))
+        return common_name, sans
+    except (IndexError, ValueError):
+        return None, []
+
+
+def _title(body, content_type):
+    match = TITLE_PATTERN.search(body)
+    if not match:
+        return None
+    charset = CHARSET_PATTERN.search(content_type or "")
+    try:
+        text = match.group(1).decode(charset.group(1) if charset else "utf-8", "replace")
+    except LookupError:
+        text = match.group(1).decode("utf-8", "replace")
+    return " ".join(html.unescape(text).split())[:200] or None
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "certificate")
+
+    def __init__(self, reader, writer, certificate):
+        self.reader = reader
+        self.writer = writer
+        self.certificate = certificate
+
+
+class HTTPProber:
+    """Async HTTP/1.1 prober with global and per-IP concurrency limits and a keep-alive pool."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                 user_agent=USER_AGENT):
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.stats = {"requests": 0, "responses": 0, "errors": 0, "reused": 0}
+        self._semaphore = None
+        self._host_limits = {}  # ip -> [semaphore, users]
+        self._idle = {}  # (ip, port, server name) -> [_Connection, ...]
+        self._idle_count = 0
+        self._ssl = ssl.create_default_context()
+        self._ssl.check_hostname = False
+        self._ssl.verify_mode = ssl.CERT_NONE
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.writer.close()
+        self._idle.clear()
+        self._idle_count = 0
+        metrics.count("http_probe_requests", self.stats["requests"])
+        metrics.count("http_probe_connections_reused", self.stats["reused"])
+
+    async def _open(self, ip, port, server_name):
+        reader, writer = await asyncio.open_connection(
+            ip, port, ssl=self._ssl if server_name else None, server_hostname=server_name, limit=MAX_HEADER
+        )
+        certificate = None
+        if server_name:
+            ssl_object = writer.get_extra_info("ssl_object")
+            der = ssl_object.getpeercert(binary_form=True) if ssl_object else None
+            certificate = certificate_names(der) if der else (None, [])
+        return _Connection(reader, writer, certificate)
+
+    async def _request(self, connection, host, port, scheme):
+        default_port = 443 if scheme == "https" else 80
+        host_header = host if port == default_port else f"{host}:{port}"
+        connection.writer.write(
+            f"GET / HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {self.user_agent}\r\n"
+            f"Accept: text/html,*/*\r\nConnection: keep-alive\r\n\r\n".encode("ascii", "replace")
+        )
+        await connection.writer.drain()
+
+        head = await connection.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ValueError(f"not an HTTP response: {lines[0][:40]!r}")
+        status = int(parts[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        # Read enough of the body for the title; the connection is reusable only if it is all read
+        body = b""
+        reusable = parts[0] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if status in (204, 304) or 100 <= status < 200:
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await connection.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    while await connection.reader.readline() not in (b"\r\n", b"\n", b""):
+                        pass  # trailer fields
+                    break
+                if len(body) + size > MAX_BODY:
+                    body += await connection.reader.read(MAX_BODY - len(body))
+                    reusable = False
+                    break
+                body += await connection.reader.readexactly(size + 2)
+                body = body[:-2]
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length <= MAX_BODY:
+                body = await connection.reader.readexactly(length)
+            else:
+                body = await connection.reader.readexactly(MAX_BODY)
+                reusable = False
+        else:
+            body = await connection.reader.read(MAX_BODY)
+            reusable = False
+
+        url = f"{scheme}://{host_header}/"
+        location = headers.get("location")
+        return {
+            "status": status,
+            "title": _title(body, headers.get("content-type")),
+            "server": headers.get("server"),
+            "redirect": urljoin(url, location) if location and 300 <= status < 400 else None,
+        }, reusable
+
+    def _take_idle(self, key):
+        idle = self._idle.get(key)
+        if not idle:
+            return None
+        connection = idle.pop()
+        if not idle:
+            del self._idle[key]
+        self._idle_count -= 1
+        return connection
+
+    def _put_idle(self, key, connection):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.per_host or self._idle_count >= MAX_IDLE_TOTAL:
+            if not idle:
+                del self._idle[key]
+            return False
+        idle.append(connection)
+        self._idle_count += 1
+        return True
+
+    def _host_limit(self, ip):
+        limit = self._host_limits.get(ip)
+        if limit is None:
+            limit = self._host_limits[ip] = [asyncio.Semaphore(self.per_host), 0]
+        limit[1] += 1
+        return limit
+
+    def _release_host_limit(self, ip, limit):
+        limit[1] -= 1
+        if not limit[1]:
+            del self._host_limits[ip]  # keep the table small across millions of hosts
+
+    async def probe(self, host, ip, port, scheme):
+        """Request http(s)://host:port/ from ip; returns a result dict (error set on failure)."""
+        key = (ip, port, host if scheme == "https" else None)
+        result = {"url": f"{scheme}://{host}" + ("" if port in (80, 443) else f":{port}") + "/",
+                  "host": host, "ip": ip, "port": port, "status": None, "title": None, "server": None,
+                  "redirect": None, "tls_cn": None, "tls_sans": None, "error": None}
+        limit = self._host_limit(ip)
+        started = time.perf_counter()
+        try:
+            # The per-IP limit comes first, so a probe queued behind a busy IP holds no global slot
+            async with limit[0], self._semaphore:
+                self.stats["requests"] += 1
+                for attempt in range(2):
+                    connection = self._take_idle(key) if not attempt else None
+                    reused = connection is not None
+                    try:
+                        if connection is None:
+                            connection = await asyncio.wait_for(self._open(ip, port, key[2]), self.timeout)
+                        else:
+                            self.stats["reused"] += 1
+                        response, reusable = await asyncio.wait_for(
+                            self._request(connection, host, port, scheme), self.timeout
+                        )
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        if connection is not None:
+                            connection.writer.close()
+                        if reused:
+                            continue  # the server closed an idle connection; retry on a new one
+                        raise
+                    except BaseException:
+                        if connection is not None:
+                            connection.writer.close()
+                        raise
+                    break
+
+                result.update(response)
+                if connection.certificate:
+                    result["tls_cn"], result["tls_sans"] = connection.certificate
+                if not (reusable and self._put_idle(key, connection)):
+                    connection.writer.close()
+                self.stats["responses"] += 1
+        except asyncio.TimeoutError:
+            result["error"] = "timeout"
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ssl.SSLError) as e:
+            result["error"] = type(e).__name__ if not str(e) else str(e)[:120]
+        finally:
+            self._release_host_limit(ip, limit)
+        if result["error"]:
+            self.stats["errors"] += 1
+            metrics.count("http_probes", status="error")
+        else:
+            metrics.count("http_probes", status=result["status"])
+            metrics.observe("http_probe_seconds", time.perf_counter() - started)
+        return result
+
+
+async def probe_hosts(entries, on_result, ports=DEFAULT_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                      per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, user_agent=USER_AGENT):
+    """Probe every {"subdomain", "ip"} entry on every (port, scheme), calling on_result(result) per probe.
+
+    Returns the prober's stats.
+    """
+    async with HTTPProber(concurrency, per_host, timeout, user_agent) as prober:
+        slots = asyncio.Semaphore(prober.concurrency)
+        active = {}  # ip -> probe chains running
+        backlog = {}  # ip -> probes waiting while that IP is at its per-host limit
+        tasks = set()
+
+        async def run(item):
+            # Each chain holds one global slot and drains its IP's backlog, so a host with
+            # thousands of names behind it never ties up slots that other IPs could use
+            ip = item[1]
+            try:
+                while item is not None:
+                    on_result(await prober.probe(*item))
+                    queued = backlog.get(ip)
+                    item = queued.popleft() if queued else None
+                    if queued is not None and not queued:
+                        del backlog[ip]
+            finally:
+                active[ip] -= 1
+                if not active[ip]:
+                    del active[ip]
+                slots.release()
+
+        try:
+            for entry in entries:
+                ip = entry["ip"]
+                for port, scheme in ports:
+                    item = (entry["subdomain"], ip, port, scheme)
+                    if active.get(ip, 0) >= prober.per_host:
+                        backlog.setdefault(ip, collections.deque()).append(item)
+                        continue
+                    await slots.acquire()
+                    active[ip] = active.get(ip, 0) + 1
+                    task = asyncio.create_task(run(item))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            while tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return dict(prober.stats)
+
+
+def raise_file_limit(needed):
+    """Raise the soft open-file limit towards needed (up to the hard limit) for many sockets."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def get_http_probes(domain, subdomains, ports=DEFAULT_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                    per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, user_agent=USER_AGENT, on_result=None):
+    """Probe resolved subdomains over HTTP(S); returns the results that got an HTTP response.
+
+    Each result is {"url", "host", "ip", "port", "status", "title", "server", "redirect",
+    "tls_cn", "tls_sans"}; hosts that refused, timed out or did not speak HTTP are left out.
+    """
+    os.makedirs("data", exist_ok=True)
+    print(f"[*] Probing {len(subdomains)} hosts on ports {', '.join(str(port) for port, _ in ports)}")
+    start_time = time.time()
+    live = []
+    raise_file_limit(concurrency + MAX_IDLE_TOTAL + 256)
+
+    def collect(result):
+        if result.pop("error"):
+            return
+        live.append(result)
+        details = " ".join(part for part in (
+            f"-> {result['redirect']}" if result["redirect"] else None,
+            f"[{result['title']}]" if result["title"] else None,
+            f"({result['server']})" if result["server"] else None,
+        ) if part)
+        print(f"[✓] {result['url']} {result['status']} {details}".rstrip())
+        if on_result:
+            on_result(result)
+
+    stats = asyncio.run(probe_hosts(subdomains, collect, ports, concurrency, per_host, timeout, user_agent))
+    live.sort(key=lambda result: (result["host"], result["port"]))
+
+    txt_path = f"data/http_{domain}.txt"
+    with open(txt_path, "w") as f:
+        for result in live:
+            f.write(f"{result['url']} {result['status']} {result['title'] or ''} {result['redirect'] or ''}\n")
+    print(f"[✓] HTTP probe results saved to: {txt_path}")
+
+    duration = max(time.time() - start_time, 0.001)
+    print("\n--- HTTP Probe Summary ---")
+    print(f"  Requests: {stats['requests']} ({round(stats['requests'] / duration)}/s), "
+          f"responses: {stats['responses']}, failed: {stats['errors']}, connections reused: {stats['reused']}")
+    print(f"  Runtime: {round(duration, 2)} seconds")
+    return live
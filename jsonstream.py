@@ -0,0 +1,90 @@
+# jsonstream.py
+
+"""
+Module: jsonstream.py
+
+Description:
+This module parses a large top-level JSON array incrementally, yielding one element at a time
+while the bytes are still arriving. It lets ReconStudio process multi-hundred-megabyte provider
+responses (such as crt.sh certificate transparency results) with a memory footprint bounded by
+the size of a single element instead of the whole document.
+
+Features:
+- Works on any iterable of byte chunks (e.g. `response.iter_content()` or a file)
+- Uses the C-accelerated `json` decoder for each element
+- Incremental UTF-8 decoding, safe across chunk boundaries
+- Guards against runaway buffering on malformed input
+
+Usage:
+    for entry in iter_json_array(response.iter_content(65536)):
+        print(entry["name_value"])
+
+Dependencies:
+- json
+- codecs
+
+Limitations:
+- Only a top-level array is supported
+- Elements are decoded fully, so a single huge element is still held in memory
+"""
+
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024
+MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+_WHITESPACE = " \t\r\n,"
+
+
+def iter_json_array(chunks, max_element_size=MAX_ELEMENT_SIZE):
+    """Yield the elements of a JSON array read from an iterable of byte chunks."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")("replace")
+    buffer = ""
+    started = False
+
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        pos = 0
+        length = len(buffer)
+
+        if not started:
+            while pos < length and buffer[pos] in " \t\r\n\ufeff":
+                pos += 1
+            if pos == length:
+                buffer = ""
+                continue
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+
+        while True:
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == length:
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                element, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element not complete yet: wait for more bytes
+                break
+            yield element
+
+        buffer = buffer[pos:]
+        if len(buffer) > max_element_size:
+            raise ValueError("JSON array element exceeds the maximum element size")
+
+    if started and buffer.strip(_WHITESPACE):
+        raise ValueError("Truncated JSON array")
+
+
+def iter_file_chunks(f, chunk_size=CHUNK_SIZE):
+    """Yield byte chunks from an open binary file."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
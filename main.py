@@ -9,7 +9,10 @@ Modules Included:
 - Subdomain Enumeration: Passive and brute-force discovery of subdomains.
 - WHOIS Analysis: Collects registrant and creation data from global WHOIS records.
 - Email & Host Harvesting: Integration with theHarvester to collect emails, hosts, and more.
-- Report Generator: Output results in various formats (JSON, TXT, HTML, PDF).
+- HTTP Probing: Status, title, server, redirect and TLS certificate names of live web services.
+- Port Scanning: Async TCP connect scan of every resolved IP, with open ports mapped to subdomains.
+- IP Enrichment: Offline ASN, organisation, country and netblock per IP, grouped by hosting provider.
+- Report Generator: Output results in various formats (JSON, NDJSON, TXT, HTML, PDF).
 
 Key Features:
 - Run specific modules or all by default
@@ -17,10 +20,31 @@ Key Features:
 - Output customization and path selection
 - CLI arguments for automation and scripting
 - Progress bar, error logging, and runtime measurement
+- Metrics (module/provider spans, counters, DNS and HTTP latency histograms) saved next to the
+  report as <output>.metrics.json, optionally as a Prometheus textfile
+- Optional parallel module execution with per-module deadlines
+- Batch mode over a targets file with shared per-provider rate limits
+- Scan journal with checkpoints, so interrupted scans continue with --resume
+- Incremental re-scans (--incremental) that only re-resolve stale names and report the delta
+  against the previous scan of the target
+- Indexed results store across all scans (data/results.sqlite), searched with `main.py query`
+- Persistent compressed cache of crt.sh, hackertarget and WHOIS responses
+- Asynchronous DNS resolution with configurable concurrency and nameservers
+- In-memory DNS answer cache (TTL aware, negative caching), optionally persisted between runs
 
 Usage:
-    python3 main.py <target_domain> [--subdomains] [--whois] [--harvest] \
-                     [-o output_base] [--format pdf|json|txt|html] [--config apis.conf]
+    python3 main.py <target_domain | --targets-file targets.txt [--batch-workers N]> \
+                     [--subdomains] [--whois] [--harvest] \
+                     [-o output_base] [--format pdf|json|ndjson|txt|html] [--config apis.conf] \
+                     [--dns-concurrency N] [--nameservers 1.1.1.1,8.8.8.8] [--parallel] \
+                     [--cache-only | --refresh] [--providers crtsh,hackertarget] \
+                     [--harvest-sources crtsh,otx,rapiddns] [--harvest-workers N] [--native-whois] \
+                     [--persist-dns-cache] [--wordlist words.txt [--workers N]] [--permutations] [--resume] [--incremental] \
+                     [--probe [--probe-concurrency N] [--probe-per-host N]] \
+                     [--portscan [--ports top100|all|22,80,8000-8100] [--scan-concurrency N]] \
+                     [--enrich [--asn-dump ip2asn-v4.tsv.gz]] [--metrics-prom file.prom]
+    python3 main.py query [--ip IP] [--subdomain NAME] [--target DOMAIN] [--nameserver NS] \
+                          [--registrar NAME] [--since-days N] [--limit N] [--json] [--import report.json ...]
 
 If no modules are selected, all will run by default.
 """
@@ -31,20 +55,69 @@ import time
 import json
 import logging
 import re
+import queue
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from colorama import init, Fore, Style
 
-from modules import subdomains, whois_info, theharvester, report_generator
+from modules import subdomains, whois_info, theharvester, report_generator, ratelimit, cache, transport, dnscache, resolver, checkpoint, metrics, scanstate, resultstore, httpprobe, portscan, asnindex
 
 init()  # Initialize colorama
 
 CONFIG = {
-    'timeout': 30,
+    'timeout': 30,  # HTTP request timeout
+    'module_timeout': 3600,  # seconds a module may run in --parallel mode before it is stopped
+    'module_timeouts': {},  # optional per-module overrides of module_timeout, e.g. {'whois': 60}
     'max_retries': 3,
     'user_agent': 'ReconStudio/1.0',
-    'rate_limit': 1.0  # requests per second
+    'rate_limit': 1.0,  # requests per second for providers without their own limit
+    'provider_rates': {  # (requests per second, burst) shared across all targets
+        'crtsh': (0.5, 2),
+        'hackertarget': (1.0, 1),
+        'whois': (1.0, 2)
+    },
+    'batch_workers': 4,  # targets scanned at once with --targets-file
+    'cache_path': 'data/cache.sqlite',
+    'cache_ttls': {  # seconds before a cached provider response is refetched
+        'crtsh': 24 * 3600,
+        'hackertarget': 24 * 3600,
+        'whois': 7 * 24 * 3600,
+        'whois-server': 30 * 24 * 3600
+    },
+    'cache_max_bytes': 256 * 1024 * 1024,
+    'dns_concurrency': 1000,  # DNS queries kept in flight
+    'dns_receive_buffer': 8 * 1024 * 1024,  # bytes per resolver UDP socket, capped by net.core.rmem_max
+    'nameservers': [],  # empty = use /etc/resolv.conf
+    'dns_cache_size': 500000,  # DNS answers kept in memory, shared by all targets
+    'dns_negative_ttl': 300,  # seconds to cache NXDOMAIN/NODATA when the response has no SOA
+    'dns_cache_path': 'data/dns_cache.json',  # used with --persist-dns-cache
+    'providers': [],  # passive subdomain providers to query, empty = all registered
+    'wordlist': None,  # brute-force wordlist file, None = built-in list
+    'permutations': False,  # resolve permutations of found subdomains as a second pass
+    'workers': 1,  # processes sharing the --wordlist brute-force, each with dns_concurrency queries in flight
+    'harvest_workers': 4,  # theHarvester processes run at once with --harvest-sources
+    'harvest_source_timeout': 180,  # seconds before one theHarvester source process is killed
+    'harvest_group_size': 1,  # sources per theHarvester process
+    'native_whois': False,  # use the built-in port-43 client instead of python-whois
+    'metrics_prometheus': None,  # Prometheus textfile path, e.g. for node_exporter's textfile collector
+    'results_db': 'data/results.sqlite',  # indexed store of all scan results, None = do not record
+    'probe_ports': [(80, 'http'), (443, 'https')],  # (port, scheme) pairs requested on every resolved host
+    'probe_concurrency': 1000,  # HTTP probe requests kept in flight
+    'probe_per_host': 10,  # HTTP probe requests in flight per IP address
+    'probe_timeout': 10,  # seconds per HTTP probe request
+    'scan_ports': 'top100',  # TCP ports scanned with --portscan: top100, all, or a list/ranges like 22,80,8000-8100
+    'scan_concurrency': 5000,  # TCP connection attempts kept in flight
+    'scan_per_host': 200,  # TCP connection attempts in flight per IP address
+    'scan_timeout': 1.0,  # seconds per connect until a host's RTT is known (then adaptive, never longer)
+    'asn_index': 'data/asn.idx',  # compiled offline ASN index used by --enrich
+    'asn_dump': None,  # ip2asn-v4.tsv(.gz), pyasn ipasn or prefix2as dump; compiled into asn_index when newer
 }
 
+REPORT_FORMATS = ['json', 'ndjson', 'txt', 'html', 'pdf']
+
 def setup_logging(output_dir):
     """Configure logging with rotation."""
     log_file = os.path.join(output_dir, 'recon.log')
@@ -64,8 +137,7 @@ def validate_domain(domain):
 
 def validate_report_format(format_str):
     """Validate the report format."""
-    valid_formats = ['json', 'txt', 'html', 'pdf']
-    return format_str.lower() in valid_formats
+    return format_str.lower() in REPORT_FORMATS
 
 def validate_output_path(path):
     """Validate and create output directory if needed."""
@@ -97,139 +169,664 @@ def print_summary(data, output_path, report_format, start_time):
     print(f"  Subdomains found: {len(data['subdomains'])}")
     print(f"  Emails harvested: {len(data['theharvester'].get('emails', []))}")
     print(f"  Hosts discovered: {len(data['theharvester'].get('hosts', []))}")
+    if "http" in data:
+        print(f"  Live HTTP services: {len(data['http'])}")
+    if data.get("providers"):
+        largest = data['providers'][0]
+        print(f"  Hosting providers: {len(data['providers'])} "
+              f"(largest: AS{largest['asn'] or '-'} {largest['org'] or ''}, {largest['subdomains']} subdomains)")
+    if "ports" in data:
+        open_ips = {row['ip']: len(row['open_ports']) for row in data['ports']}
+        print(f"  Open TCP ports: {sum(open_ips.values())} on {len(open_ips)} IPs")
     print(f"  Report saved as: {output_path}.{report_format}")
     print(f"  Total time: {round(time.time() - start_time, 2)} seconds")
 
-def rate_limit(delay=1.0):
-    """Simple rate limiting decorator."""
+def rate_limit(delay=1.0, provider=None):
+    """Rate limiting decorator backed by a thread-safe token bucket.
+
+    With a provider name the shared per-provider bucket is used, so the limit holds
+    across every decorated function and every target scanned in this process.
+    """
     def decorator(func):
-        last_call = [0.0]
+        bucket = ratelimit.get_bucket(provider) if provider else ratelimit.TokenBucket(1.0 / delay)
         def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_call[0]
-            if elapsed < delay:
-                time.sleep(delay - elapsed)
-            result = func(*args, **kwargs)
-            last_call[0] = time.time()
-            return result
+            bucket.acquire()
+            return func(*args, **kwargs)
         return wrapper
     return decorator
 
-def run_recon(target, output_path, do_subdomains, do_harvest, do_whois, report_format=None, config_path=None):
+def collect_subdomains(target, dns_concurrency=None, nameservers=None, provider_names=None, on_result=None,
+                       wordlist=None, permutations=False, resume=None, on_checkpoint=None, workers=None,
+                       previous=None, stop=None):
+    """Run subdomain enumeration, returning None on failure or when stopped."""
+    try:
+        subdomains_list = subdomains.get_subdomains(
+            target,
+            on_result=on_result,
+            dns_concurrency=dns_concurrency or CONFIG['dns_concurrency'],
+            nameservers=nameservers or CONFIG['nameservers'],
+            provider_names=provider_names or CONFIG['providers'],
+            wordlist=wordlist or CONFIG['wordlist'],
+            permute=permutations or CONFIG['permutations'],
+            resume=resume,
+            on_checkpoint=on_checkpoint,
+            workers=workers or CONFIG['workers'],
+            previous=previous,
+            stop=stop
+        )
+        logging.info(f"Collected {len(subdomains_list)} subdomains")
+        return subdomains_list
+    except subdomains.EnumerationStopped:
+        logging.warning("Subdomain enumeration stopped before it finished")
+        return None
+    except Exception as e:
+        logging.error(f"Subdomain enumeration failed: {e}")
+        return None
+
+def collect_harvest(target, config_path=None, interactive=True, harvest_sources=None, harvest_workers=None,
+                    stop=None):
+    """Run theHarvester, returning {} on failure."""
+    try:
+        harvest_data = theharvester.run_harvest(
+            target, config_path, interactive,
+            sources=harvest_sources,
+            workers=harvest_workers or CONFIG['harvest_workers'],
+            source_timeout=CONFIG['harvest_source_timeout'],
+            group_size=CONFIG['harvest_group_size'],
+            stop=stop
+        )
+        logging.info("theHarvester module completed")
+        return harvest_data
+    except Exception as e:
+        logging.error(f"theHarvester failed: {e}")
+        return {}
+
+def collect_http(target, subdomains_list, probe_concurrency=None, probe_per_host=None):
+    """Probe the resolved subdomains over HTTP(S), returning [] on failure."""
+    try:
+        results = httpprobe.get_http_probes(
+            target, subdomains_list,
+            ports=CONFIG['probe_ports'],
+            concurrency=probe_concurrency or CONFIG['probe_concurrency'],
+            per_host=probe_per_host or CONFIG['probe_per_host'],
+            timeout=CONFIG['probe_timeout'],
+            user_agent=CONFIG['user_agent']
+        )
+        logging.info(f"HTTP probing found {len(results)} live services")
+        return results
+    except Exception as e:
+        logging.error(f"HTTP probing failed: {e}")
+        return []
+
+def collect_ports(target, subdomains_list, scan_ports=None, scan_concurrency=None):
+    """Port-scan the IPs of the resolved subdomains, returning [] on failure."""
+    try:
+        results = portscan.get_open_ports(
+            target, subdomains_list,
+            ports=scan_ports or CONFIG['scan_ports'],
+            concurrency=scan_concurrency or CONFIG['scan_concurrency'],
+            per_host=CONFIG['scan_per_host'],
+            timeout=CONFIG['scan_timeout']
+        )
+        logging.info(f"Port scan found open ports for {len(results)} subdomains")
+        return results
+    except Exception as e:
+        logging.error(f"Port scan failed: {e}")
+        return []
+
+def collect_providers(target, subdomains_list):
+    """Annotate the resolved subdomains with ASN data and group them by provider, returning [] on failure."""
+    try:
+        providers = asnindex.get_providers(target, subdomains_list)
+        logging.info(f"ASN enrichment grouped the subdomains into {len(providers)} providers")
+        return providers
+    except Exception as e:
+        logging.error(f"ASN enrichment failed: {e}")
+        return []
+
+def collect_whois(target, native_whois=False):
+    """Run the WHOIS lookup, returning {} on failure."""
+    try:
+        whois_data = whois_info.get_whois(target, native=native_whois or CONFIG['native_whois'])
+        logging.info("WHOIS lookup completed")
+        return whois_data
+    except ConnectionError:
+        logging.error("Network connection error during WHOIS lookup")
+    except TimeoutError:
+        logging.error("WHOIS lookup timed out")
+    except Exception as e:
+        logging.error(f"WHOIS lookup failed: {e}")
+    return {}
+
+def module_deadline(name):
+    """Seconds a module may run in parallel mode before it is stopped."""
+    return CONFIG['module_timeouts'].get(name, CONFIG['module_timeout'])
+
+def run_modules_parallel(jobs, data, pbar):
+    """Run module jobs in threads of their own, merging results into data as they finish.
+
+    Each job is called with a threading.Event that is set when the module misses its
+    deadline; subdomain enumeration and theHarvester stop on it, and the module keeps its
+    empty default in data. The threads are daemons, so a module that cannot be stopped
+    (a blocking WHOIS query) never keeps the process alive. Returns the names of the
+    modules that finished in time with a result (not None).
+    """
+    finished = queue.Queue()
+    running = {}  # name -> (stop event, deadline)
+
+    def run(name, collect, stop):
+        result = None
+        try:
+            result = collect(stop)
+        except Exception as e:
+            logging.error(f"Module {name} failed: {e}")
+        finally:
+            finished.put((name, result))
+
+    started = time.time()
+    for name, message, collect in jobs:
+        print(message)
+        stop = threading.Event()
+        running[name] = (stop, started + module_deadline(name))
+        threading.Thread(target=run, args=(name, collect, stop), name=f"recon-{name}", daemon=True).start()
+
+    completed = set()
+    while running:
+        next_deadline = min(deadline for _, deadline in running.values())
+        try:
+            name, result = finished.get(timeout=max(0, next_deadline - time.time()))
+        except queue.Empty:
+            pass
+        else:
+            if running.pop(name, None) is not None:
+                if result is not None:
+                    data[name] = result
+                    completed.add(name)
+                pbar.update(1)
+
+        now = time.time()
+        for name in [name for name, (_, deadline) in running.items() if deadline <= now]:
+            stop, _ = running.pop(name)
+            stop.set()
+            print(f"[!] Module {name} exceeded its {module_deadline(name)}s deadline, stopping it")
+            logging.error(f"Module {name} timed out after {module_deadline(name)} seconds")
+            pbar.update(1)
+
+    return completed
+
+def run_recon(target, output_path, do_subdomains, do_harvest, do_whois, report_format=None, config_path=None,
+              dns_concurrency=None, nameservers=None, parallel=False, interactive=True, provider_names=None,
+              harvest_sources=None, harvest_workers=None, native_whois=False, wordlist=None, permutations=False,
+              resume=False, workers=None, write_metrics=True, incremental=False, probe=False,
+              probe_concurrency=None, probe_per_host=None, port_scan=False, scan_ports=None, scan_concurrency=None,
+              enrich=False):
+    stream = None
+    journal = None
     try:
         logging.info(f"Starting Recon on: {target}")
         print(f"{Fore.GREEN}[+]{Style.RESET_ALL} Starting Recon on: {target}\n")
-        data = {"target": target}
+        data = {"target": target, "subdomains": [], "theharvester": {}, "whois": {}}
         start = time.time()
-
-        modules_to_run = sum([do_subdomains, do_harvest, do_whois])
-        with tqdm(total=modules_to_run, desc="Modules completed") as pbar:
-
-            if do_subdomains:
-                print("[*] Collecting subdomains...")
-                try:
-                    subdomains_list = subdomains.get_subdomains(target)
-                    data["subdomains"] = subdomains_list
-                    logging.info(f"Collected {len(subdomains_list)} subdomains")
-                except Exception as e:
-                    logging.error(f"Subdomain enumeration failed: {e}")
-                    data["subdomains"] = []
-                pbar.update(1)
+        wordlist = wordlist or CONFIG['wordlist']
+
+        # Progress is journaled as the scan runs so an interrupted scan can be resumed
+        journal_file = checkpoint.journal_path(target)
+        state = checkpoint.load(journal_file) if resume else None
+        if resume and state is None:
+            print(f"[i] No journal found for {target}, starting a new scan")
+        journal = checkpoint.Journal(journal_file, append=state is not None)
+        finished = state["modules"] if state else {}
+        subdomain_resume = None
+        if state:
+            print(f"[i] Resuming {target}: {len(state['subdomains'])} subdomains resolved, "
+                  f"finished modules: {', '.join(finished) or 'none'}")
+            data.update(finished)
+            subdomain_resume = {"subdomains": state["subdomains"]}
+            if state["start"].get("wordlist") == wordlist:
+                subdomain_resume["positions"] = state["positions"]
+                subdomain_resume["pending"] = state["pending"]
+        else:
+            journal.write({"type": "start", "target": target, "wordlist": wordlist})
+
+        # Incremental re-scans start from the previous scan's state and report only what changed
+        state_file = scanstate.state_path(target)
+        previous = scanstate.load_state(state_file) if incremental else None
+        if incremental and previous is None:
+            print(f"[i] No previous scan of {target} found, running a full scan")
+        elif previous:
+            fresh = scanstate.seed_dns_cache(previous)
+            print(f"[i] Incremental scan of {target}: {len(previous['subdomains'])} known subdomains, "
+                  f"{fresh} with DNS answers still fresh")
+
+        def on_subdomain(entry):
+            journal.subdomain(entry)
+            if stream:
+                if enrich:
+                    asnindex.annotate([entry])
+                stream.write_subdomain(entry)
+
+        def journaled(name, collect):
+            def run(stop=None):
+                with metrics.span("module", module=name):
+                    result = collect(stop)
+                # A failed or stopped module is not journaled, so --resume runs it again
+                if result is not None and not (stop and stop.is_set()):
+                    journal.module_done(name, result)
+                return result
+            return run
+
+        # NDJSON reports are written as results arrive instead of after the scan (delta reports
+        # can only be built once the scan is complete)
+        if report_format and report_format.lower() == "ndjson" and not previous:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            stream = report_generator.NDJSONWriter(f"{output_path}.ndjson")
+            stream.write({"type": "target", "target": target})
+            if subdomain_resume and "subdomains" not in finished:
+                for entry in subdomain_resume["subdomains"]:
+                    stream.write_subdomain(entry)
+
+        jobs = []
+        if do_subdomains:
+            jobs.append(("subdomains", "[*] Collecting subdomains...",
+                         lambda stop: collect_subdomains(target, dns_concurrency, nameservers, provider_names,
+                                                         on_result=on_subdomain, wordlist=wordlist,
+                                                         permutations=permutations, resume=subdomain_resume,
+                                                         on_checkpoint=journal.checkpoint, workers=workers,
+                                                         previous=list(previous["subdomains"]) if previous else None,
+                                                         stop=stop)))
+        if do_harvest:
+            # Module threads must not prompt: in parallel mode the API-key question is skipped
+            if parallel and interactive and not config_path:
+                print("[i] theHarvester's API prompt is skipped with --parallel; pass --config to use API keys")
+            harvest_interactive = interactive and not parallel
+            jobs.append(("theharvester", "[*] Running theHarvester module...",
+                         lambda stop: collect_harvest(target, config_path, harvest_interactive, harvest_sources,
+                                                      harvest_workers, stop=stop)))
+        if do_whois:
+            jobs.append(("whois", "[*] Performing WHOIS lookup...",
+                         lambda stop: collect_whois(target, native_whois)))
+        selected = {name for name, _, _ in jobs}
+        jobs = [(name, message, journaled(name, collect)) for name, message, collect in jobs if name not in finished]
+
+        # Modules that failed (None) or missed their deadline keep their empty default in data
+        completed = set(finished)
+        with tqdm(total=len(jobs), desc="Modules completed") as pbar:
+            if parallel:
+                completed |= run_modules_parallel(jobs, data, pbar)
             else:
-                data["subdomains"] = []
-
-            if do_harvest:
-                print("[*] Running theHarvester module...")
-                try:
-                    harvest_data = theharvester.run_harvest(target, config_path)
-                    data["theharvester"] = harvest_data
-                    logging.info("theHarvester module completed")
-                except Exception as e:
-                    logging.error(f"theHarvester failed: {e}")
-                    data["theharvester"] = {}
-                pbar.update(1)
+                for name, message, collect in jobs:
+                    print(message)
+                    result = collect(None)
+                    if result is not None:
+                        data[name] = result
+                        completed.add(name)
+                    pbar.update(1)
+
+        # ASN data is added to the subdomain entries themselves, so it shows up in every report format
+        if enrich:
+            if data["subdomains"]:
+                print("[*] Annotating IPs with ASN data...")
+                data["providers"] = collect_providers(target, data["subdomains"])
             else:
-                data["theharvester"] = {}
-
-            if do_whois:
-                print("[*] Performing WHOIS lookup...")
-                try:
-                    whois_data = whois_info.get_whois(target)
-                    data["whois"] = whois_data
-                    logging.info("WHOIS lookup completed")
-                except ConnectionError:
-                    logging.error("Network connection error during WHOIS lookup")
-                    data["whois"] = {}
-                except TimeoutError:
-                    logging.error("WHOIS lookup timed out")
-                    data["whois"] = {}
-                except Exception as e:
-                    logging.error(f"WHOIS lookup failed: {e}")
-                    data["whois"] = {}
-                pbar.update(1)
+                print("[i] No resolved subdomains to annotate")
+
+        # Probing needs the resolved subdomains, so it runs once the modules have finished
+        if probe and "http" not in finished:
+            if data["subdomains"]:
+                print("[*] Probing HTTP services...")
+                data["http"] = journaled("http", lambda _: collect_http(target, data["subdomains"],
+                                                                        probe_concurrency, probe_per_host))()
             else:
-                data["whois"] = {}
-
-        try:
-            json.dumps(data)
-        except Exception as e:
-            print(f"[!] Failed to serialize data: {e}")
-            logging.error(f"Failed to serialize data: {e}")
-            exit(1)
+                print("[i] No resolved subdomains to probe over HTTP")
+        if port_scan and "ports" not in finished:
+            if data["subdomains"]:
+                print("[*] Scanning TCP ports...")
+                data["ports"] = journaled("ports", lambda _: collect_ports(target, data["subdomains"], scan_ports,
+                                                                          scan_concurrency))()
+            else:
+                print("[i] No resolved subdomains to port-scan")
 
-        if not report_format:
-            print("[?] Choose report format: (json / txt / html / pdf)")
+        if not report_format and interactive:
+            print(f"[?] Choose report format: ({' / '.join(REPORT_FORMATS)})")
             report_format = input("Format: ").strip().lower()
 
-        if not validate_report_format(report_format):
-            print(f"[!] Invalid report format. Choose from: json, txt, html, pdf")
+        if not validate_report_format(report_format or ""):
+            print(f"[!] Invalid report format. Choose from: {', '.join(REPORT_FORMATS)}")
             exit(1)
 
+        # None marks a module that did not run or did not complete, so its previous state is kept
+        # and not diffed (an empty WHOIS record is treated the same way by scanstate)
+        if "subdomains" in selected and "subdomains" not in completed and previous:
+            print("[!] Subdomain enumeration did not complete; keeping the previous scan's subdomains")
+        scanned = {"target": target,
+                   "subdomains": data["subdomains"] if "subdomains" in completed else None,
+                   "whois": data["whois"] if "whois" in selected else None}
+        report_data = data
+        if previous:
+            delta = scanstate.diff(previous, scanned)
+            report_data = {"target": target, **delta}
+            if enrich:
+                asnindex.annotate(report_data["added"])
+                asnindex.annotate(report_data["removed"])
+                asnindex.annotate(report_data["changed"], ip_key="new_ip", prefix="new_")
+            for section in ("providers", "http", "ports"):
+                if data.get(section):
+                    report_data[section] = data[section]
+
         print("[*] Generating report...")
-        report_generator.generate_report(data, output_path, report_format)
+        if stream:
+            # Subdomains found in this run are already on disk; a module finished before --resume
+            # never streamed them, so they are written with the remaining sections
+            skip = ("target",) if "subdomains" in finished else ("target", "subdomains")
+            stream.write_records(report_generator.iter_records(data, skip=skip))
+            stream.close()
+            print(f"[✓] Report saved to: {output_path}.ndjson")
+        else:
+            report_generator.generate_report(report_data, output_path, report_format)
         logging.info(f"Report saved to {output_path}.{report_format}")
 
+        scanstate.save_state(state_file, scanned, previous)
+        if CONFIG['results_db']:
+            stored = resultstore.record_scan(target, scanned["subdomains"], scanned["whois"])
+            logging.info(f"Recorded {stored} hosts in {CONFIG['results_db']}")
+        journal.remove()
+        if write_metrics:
+            metrics.write_json(f"{output_path}.metrics.json")
+            print(f"[i] Metrics saved to: {output_path}.metrics.json")
         print_summary(data, output_path, report_format, start)
+        if previous:
+            print(f"  Changes since {delta['since']}: {len(delta['added'])} added, {len(delta['removed'])} removed, "
+                  f"{len(delta['changed'])} changed IPs, {len(delta['whois_changes'])} WHOIS fields changed")
         logging.info("Recon completed.")
+        return data
 
     except KeyboardInterrupt:
         print("\n[!] Scan interrupted by user")
+        if journal:
+            print(f"[i] Progress saved to {journal.path}, rerun with --resume to continue")
         logging.warning("Scan interrupted by user")
         return
     except Exception as e:
         print(f"\n[!] Unexpected error: {e}")
         logging.error(f"Unexpected error: {e}")
         return
+    finally:
+        if stream:
+            stream.close()
+        if journal:
+            journal.close()
+
+def load_targets(path):
+    """Read one domain per line, skipping blanks, comments, duplicates and invalid names."""
+    targets = []
+    seen = set()
+    with open(path) as f:
+        for line in f:
+            domain = line.split("#", 1)[0].strip().lower()
+            if not domain or domain in seen:
+                continue
+            if not validate_domain(domain):
+                print(f"[!] Skipping invalid domain: {domain}")
+                continue
+            seen.add(domain)
+            targets.append(domain)
+    return targets
+
+def run_batch(targets, output_base, workers, report_format, **recon_kwargs):
+    """Scan many targets at once, appending one summary line per target as it finishes."""
+    summary_path = f"{output_base}_batch.jsonl"
+    start = time.time()
+    print(f"{Fore.GREEN}[+]{Style.RESET_ALL} Batch scan of {len(targets)} targets with {workers} workers")
+
+    def scan(target):
+        target_start = time.time()
+        output_path = f"{output_base}_{target}"
+        data = run_recon(target, output_path, report_format=report_format, interactive=False, write_metrics=False,
+                         **recon_kwargs)
+        return {
+            "target": target,
+            "status": "ok" if data else "failed",
+            "subdomains": len(data["subdomains"]) if data else 0,
+            "report": f"{output_path}.{report_format}" if data else None,
+            "duration": round(time.time() - target_start, 2)
+        }
+
+    completed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as executor, \
+            open(summary_path, "a") as summary:
+        futures = {executor.submit(scan, target): target for target in targets}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                logging.error(f"Batch scan of {futures[future]} failed: {e}")
+                record = {"target": futures[future], "status": "failed", "error": str(e)}
+            summary.write(json.dumps(record) + "\n")
+            summary.flush()
+            completed += 1
+            print(f"[✓] [{completed}/{len(targets)}] {record['target']}: {record['status']}")
+
+    print(f"[✓] Batch summary saved to: {summary_path}")
+    metrics.write_json(f"{output_base}_batch.metrics.json")
+    print(f"[i] Metrics saved to: {output_base}_batch.metrics.json")
+    print(f"  Total time: {round(time.time() - start, 2)} seconds")
+
+def run_query(argv):
+    """`main.py query ...`: search the results store of all earlier scans."""
+    parser = argparse.ArgumentParser(prog="main.py query", description="Search the results of all earlier scans")
+    parser.add_argument("--ip", help="Hosts resolving to this IP address")
+    parser.add_argument("--subdomain", help="Hosts with this exact name")
+    parser.add_argument("--target", help="Results of one target domain")
+    parser.add_argument("--nameserver", help="Targets using this WHOIS name server")
+    parser.add_argument("--registrar", help="Targets registered with this registrar (exact name)")
+    parser.add_argument("--since-days", type=float, help="Only hosts seen in the last N days")
+    parser.add_argument("--limit", type=int, default=resultstore.DEFAULT_LIMIT, help="Maximum rows returned")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON lines")
+    parser.add_argument("--db", default=CONFIG['results_db'] or resultstore.DEFAULT_PATH, help="Results database")
+    parser.add_argument("--import", dest="imports", nargs="+", metavar="FILE",
+                        help="Load JSON reports or data/state_<target>.json files into the store first")
+    args = parser.parse_args(argv)
+    resultstore.configure(path=args.db)
+
+    if args.imports:
+        start = time.time()
+        total = 0
+        for path in args.imports:
+            try:
+                target, rows = resultstore.import_file(path)
+            except (OSError, ValueError) as e:
+                print(f"[!] Skipping {path}: {e}")
+                continue
+            total += rows
+            print(f"[+] {path}: {rows} hosts for {target}")
+        duration = max(time.time() - start, 0.001)
+        print(f"[✓] Imported {total} hosts in {round(duration, 2)} seconds ({round(total / duration)} rows/s)")
+
+    filters = (args.ip, args.subdomain, args.target, args.nameserver, args.registrar, args.since_days)
+    if all(value is None for value in filters):
+        if not args.imports:
+            print("[i] Store contents: " + ", ".join(f"{count} {table}" for table, count in resultstore.counts().items()))
+        return
+
+    start = time.perf_counter()
+    columns, rows = resultstore.query(
+        ip=args.ip, subdomain=args.subdomain, target=args.target, nameserver=args.nameserver,
+        registrar=args.registrar, since=time.time() - args.since_days * 86400 if args.since_days is not None else None,
+        limit=args.limit
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    for row in rows:
+        values = [time.strftime("%Y-%m-%d %H:%M", time.localtime(value))
+                  if column in ("first_seen", "last_seen", "updated") and value is not None else value
+                  for column, value in zip(columns, row)]
+        if args.json:
+            print(json.dumps(dict(zip(columns, values))))
+        else:
+            print("\t".join("" if value is None else str(value) for value in values))
+    print(f"[i] {len(rows)} rows in {round(elapsed, 1)} ms" + (" (limit reached)" if len(rows) == args.limit else ""),
+          file=sys.stderr)
+
+def handle_sigterm(signum, frame):
+    """Treat SIGTERM like Ctrl+C so the scan journal is flushed before exiting."""
+    signal.raise_signal(signal.SIGINT)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["query"]:
+        run_query(sys.argv[2:])
+        exit(0)
     if not check_dependencies():
         exit(1)
+    signal.signal(signal.SIGTERM, handle_sigterm)
 
     parser = argparse.ArgumentParser(description="ReconStudio - Website Intelligence Toolkit")
-    parser.add_argument("target", help="Target domain to scan (e.g. example.com)")
+    parser.add_argument("target", nargs="?", help="Target domain to scan (e.g. example.com)")
+    parser.add_argument("--targets-file", help="File with one target domain per line (batch mode)")
+    parser.add_argument("--batch-workers", type=int, default=CONFIG['batch_workers'],
+                        help="Number of targets scanned at once in batch mode")
     parser.add_argument("-o", "--output", default="data/output", help="Base path to save the report")
     parser.add_argument("--subdomains", action="store_true", help="Collect subdomains")
     parser.add_argument("--harvest", action="store_true", help="Run theHarvester module")
     parser.add_argument("--whois", action="store_true", help="Perform WHOIS lookup")
-    parser.add_argument("--format", help="Report output format: json, txt, html, pdf")
+    parser.add_argument("--format", help=f"Report output format: {', '.join(REPORT_FORMATS)}")
     parser.add_argument("--config", help="Path to API configuration file for theHarvester")
+    parser.add_argument("--dns-concurrency", type=int, default=CONFIG['dns_concurrency'],
+                        help="Number of DNS queries kept in flight")
+    parser.add_argument("--nameservers", help="Comma-separated nameservers (host or host:port)")
+    parser.add_argument("--wordlist", help="Brute-force wordlist file, streamed from disk (default: built-in list)")
+    parser.add_argument("--workers", type=int, default=CONFIG['workers'],
+                        help="Processes brute-forcing the --wordlist in parallel shards")
+    parser.add_argument("--permutations", action="store_true",
+                        help="Also resolve permutations of the subdomains found (dev-api, api2, ...)")
+    parser.add_argument("--providers", help="Comma-separated passive subdomain providers (default: all)")
+    parser.add_argument("--harvest-sources",
+                        help="Comma-separated theHarvester sources to run as parallel processes (default: one -b all run)")
+    parser.add_argument("--harvest-workers", type=int, default=CONFIG['harvest_workers'],
+                        help="theHarvester processes run at once with --harvest-sources")
+    parser.add_argument("--native-whois", action="store_true",
+                        help="Use the built-in port-43 WHOIS client with cached server referrals")
+    parser.add_argument("--persist-dns-cache", action="store_true",
+                        help="Load DNS answers saved by earlier runs and save them again afterwards")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted scan from its journal in data/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-scan against the previous scan's state: re-resolve only stale names, report the delta")
+    parser.add_argument("--probe", action="store_true",
+                        help="Probe resolved subdomains over HTTP/HTTPS (status, title, server, redirect, TLS names)")
+    parser.add_argument("--probe-concurrency", type=int, default=CONFIG['probe_concurrency'],
+                        help="HTTP probe requests kept in flight")
+    parser.add_argument("--probe-per-host", type=int, default=CONFIG['probe_per_host'],
+                        help="HTTP probe requests in flight per IP address")
+    parser.add_argument("--portscan", action="store_true",
+                        help="TCP connect scan of the resolved IPs (each IP once), open ports mapped to subdomains")
+    parser.add_argument("--ports", default=CONFIG['scan_ports'],
+                        help="Ports for --portscan: top100, all, or a list/ranges like 22,80,8000-8100")
+    parser.add_argument("--scan-concurrency", type=int, default=CONFIG['scan_concurrency'],
+                        help="TCP connection attempts kept in flight by --portscan")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Annotate IPs with ASN, organisation and netblock from the offline index")
+    parser.add_argument("--asn-dump", help="IP-to-ASN dump (ip2asn, pyasn or prefix2as) to compile the index from")
+    parser.add_argument("--metrics-prom", help="Also write metrics as a Prometheus textfile to this path")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the selected modules concurrently with per-module deadlines")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument("--cache-only", action="store_true",
+                            help="Use cached provider responses only, never query the network")
+    cache_mode.add_argument("--refresh", action="store_true",
+                            help="Ignore cached provider responses and refetch them")
     args = parser.parse_args()
 
-    if not validate_domain(args.target):
+    if not args.target and not args.targets_file:
+        parser.error("a target domain or --targets-file is required")
+
+    if args.target and not validate_domain(args.target):
         print("[!] Invalid domain format")
         exit(1)
 
+    if args.wordlist and not os.path.isfile(args.wordlist):
+        print(f"[!] Wordlist not found: {args.wordlist}")
+        exit(1)
+
+    try:
+        scan_ports = portscan.parse_ports(args.ports)
+    except ValueError:
+        print(f"[!] Invalid port list: {args.ports}")
+        exit(1)
+
     if not validate_output_path(args.output):
         print("[!] Invalid output path")
         exit(1)
 
     setup_logging("data")
+    ratelimit.configure(CONFIG['provider_rates'], default_rate=CONFIG['rate_limit'])
+    transport.configure(
+        timeout=CONFIG['timeout'],
+        max_retries=CONFIG['max_retries'],
+        user_agent=CONFIG['user_agent']
+    )
+    cache.configure(
+        path=CONFIG['cache_path'],
+        mode=cache.MODE_CACHE_ONLY if args.cache_only else cache.MODE_REFRESH if args.refresh else cache.MODE_NORMAL,
+        ttls=CONFIG['cache_ttls'],
+        max_bytes=CONFIG['cache_max_bytes']
+    )
+    dnscache.configure(max_entries=CONFIG['dns_cache_size'], negative_ttl=CONFIG['dns_negative_ttl'])
+    resolver.configure(receive_buffer=CONFIG['dns_receive_buffer'])
+    if CONFIG['results_db']:
+        resultstore.configure(path=CONFIG['results_db'])
+    asnindex.configure(index=CONFIG['asn_index'], dump=args.asn_dump or CONFIG['asn_dump'])
+    if args.persist_dns_cache:
+        loaded = dnscache.shared.load(CONFIG['dns_cache_path'])
+        print(f"[i] Loaded {loaded} cached DNS answers from {CONFIG['dns_cache_path']}")
+
+    run_all = not (args.subdomains or args.harvest or args.whois)
+    recon_options = dict(
+        do_subdomains=args.subdomains or run_all,
+        do_harvest=args.harvest or run_all,
+        do_whois=args.whois or run_all,
+        config_path=args.config,
+        dns_concurrency=args.dns_concurrency,
+        nameservers=args.nameservers.split(",") if args.nameservers else None,
+        parallel=args.parallel,
+        provider_names=args.providers.split(",") if args.providers else None,
+        wordlist=args.wordlist,
+        permutations=args.permutations,
+        resume=args.resume,
+        incremental=args.incremental,
+        probe=args.probe,
+        probe_concurrency=args.probe_concurrency,
+        probe_per_host=args.probe_per_host,
+        port_scan=args.portscan,
+        scan_ports=scan_ports,
+        scan_concurrency=args.scan_concurrency,
+        enrich=args.enrich,
+        workers=args.workers,
+        harvest_sources=args.harvest_sources.split(",") if args.harvest_sources else None,
+        harvest_workers=args.harvest_workers,
+        native_whois=args.native_whois
+    )
 
-    run_recon(
-        target=args.target,
-        output_path=args.output,
-        do_subdomains=args.subdomains or not (args.subdomains or args.harvest or args.whois),
-        do_harvest=args.harvest or not (args.subdomains or args.harvest or args.whois),
-        do_whois=args.whois or not (args.subdomains or args.harvest or args.whois),
-        report_format=args.format,
-        config_path=args.config
-    )
\ No newline at end of file
+    if args.targets_file:
+        report_format = (args.format or "json").lower()
+        if not validate_report_format(report_format):
+            print(f"[!] Invalid report format. Choose from: {', '.join(REPORT_FORMATS)}")
+            exit(1)
+        targets = load_targets(args.targets_file)
+        if args.target and args.target not in targets:
+            targets.insert(0, args.target.lower())
+        run_batch(targets, args.output, args.batch_workers, report_format, **recon_options)
+    else:
+        run_recon(
+            target=args.target,
+            output_path=args.output,
+            report_format=args.format,
+            **recon_options
+        )
+
+    prometheus_path = args.metrics_prom or CONFIG['metrics_prometheus']
+    if prometheus_path:
+        metrics.write_prometheus(prometheus_path)
+        print(f"[i] Prometheus metrics written to: {prometheus_path}")
+
+    if args.persist_dns_cache:
+        saved = dnscache.shared.save(CONFIG['dns_cache_path'])
+        print(f"[i] Saved {saved} DNS answers to {CONFIG['dns_cache_path']}")
@@ -0,0 +1,200 @@
+# metrics.py
+
+"""
+Module: metrics.py
+
+Description:
+This module collects the performance metrics of a ReconStudio run in one place, instead of the
+runtimes each module prints to the console. Modules record timing spans, counters and latency
+histograms here; main.py writes them as JSON next to the report and, optionally, as a
+Prometheus textfile (for node_exporter's textfile collector).
+
+Features:
+- Timing spans for modules, subdomain sources and theHarvester source processes
+- Labelled counters: DNS queries, retries, timeouts, cache hits, HTTP requests, bytes downloaded, ...
+- Latency histograms with fixed buckets and estimated p50/p95/p99 (DNS queries, HTTP requests)
+- Thread-safe, process-wide registry; snapshots from worker processes can be merged back in
+- JSON and Prometheus text exposition output
+
+Usage:
+    with metrics.span("module", module="whois"):
+        ...
+    metrics.count("http_requests", provider="crtsh", status=200)
+    metrics.observe("dns_query_seconds", 0.012)
+
+    metrics.write_json("data/output.metrics.json")
+    metrics.write_prometheus("/var/lib/node_exporter/reconstudio.prom")
+
+Dependencies:
+- bisect
+- json
+- threading
+- time
+
+Limitations:
+- Quantiles are estimated from histogram buckets, so they are only as precise as the buckets
+- Metrics are per process; sharded brute-force workers send theirs back to the parent
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+
+PREFIX = "reconstudio"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_counters = {}  # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., overflow count], sum
+_spans = []
+_lock = threading.Lock()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def count(name, value=1, **labels):
+    """Add value to a labelled counter."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Record one value (usually seconds) in a labelled histogram."""
+    key = _key(name, labels)
+    index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0]
+        histogram[0][index] += 1
+        histogram[1] += value
+
+
+@contextlib.contextmanager
+def span(name, **labels):
+    """Time a block of work; recorded as a span and in the '<name>_seconds' histogram."""
+    started = time.time()
+    clock = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, started, time.perf_counter() - clock, **labels)
+
+
+def record_span(name, started, seconds, **labels):
+    """Record a span measured by the caller (started is a time.time() timestamp)."""
+    observe(f"{name}_seconds", seconds, **labels)
+    with _lock:
+        _spans.append({"name": name, "labels": dict(labels), "start": round(started, 3), "seconds": round(seconds, 4)})
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _spans.clear()
+
+
+def _quantile(buckets, total, q):
+    """Estimate a quantile by linear interpolation inside the bucket that contains it."""
+    rank = q * total
+    seen = 0
+    for index, bucket_count in enumerate(buckets):
+        if bucket_count and seen + bucket_count >= rank:
+            if index == len(DEFAULT_BUCKETS):
+                return DEFAULT_BUCKETS[-1]
+            lower = DEFAULT_BUCKETS[index - 1] if index else 0.0
+            return lower + (DEFAULT_BUCKETS[index] - lower) * (rank - seen) / bucket_count
+        seen += bucket_count
+    return None
+
+
+def snapshot():
+    """Plain-data copy of every metric, suitable for JSON or for merge() in another process."""
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in _counters.items()]
+        histograms = []
+        for (name, labels), (buckets, total_sum) in _histograms.items():
+            total = sum(buckets)
+            histograms.append({
+                "name": name,
+                "labels": dict(labels),
+                "count": total,
+                "sum": round(total_sum, 6),
+                "buckets": list(buckets),
+                **{f"p{int(q * 100)}": _quantile(buckets, total, q) for q in QUANTILES},
+            })
+        spans = list(_spans)
+    return {"bucket_bounds": list(DEFAULT_BUCKETS), "counters": counters, "histograms": histograms, "spans": spans}
+
+
+def merge(data):
+    """Add a snapshot taken in another process (e.g. a brute-force worker) to this registry."""
+    for counter in data["counters"]:
+        count(counter["name"], counter["value"], **counter["labels"])
+    with _lock:
+        for item in data["histograms"]:
+            key = _key(item["name"], item["labels"])
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0]
+            histogram[0] = [a + b for a, b in zip(histogram[0], item["buckets"])]
+            histogram[1] += item["sum"]
+        _spans.extend(data["spans"])
+
+
+def _write(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write then rename, so a textfile collector never reads a half-written file
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def write_json(path):
+    _write(path, json.dumps(snapshot(), indent=2))
+
+
+def _labels(labels, extra=None):
+    items = dict(labels, **(extra or {}))
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in items.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(items, escaped)) + "}"
+
+
+def prometheus_text():
+    """Render every metric in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    declared = set()
+    for counter in sorted(data["counters"], key=lambda item: item["name"]):
+        name = f"{PREFIX}_{counter['name']}_total"
+        if name not in declared:
+            lines.append(f"# TYPE {name} counter")
+            declared.add(name)
+        lines.append(f"{name}{_labels(counter['labels'])} {counter['value']}")
+    for histogram in sorted(data["histograms"], key=lambda item: item["name"]):
+        name = f"{PREFIX}_{histogram['name']}"
+        if name not in declared:
+            lines.append(f"# TYPE {name} histogram")
+            declared.add(name)
+        cumulative = 0
+        for bound, bucket_count in zip(DEFAULT_BUCKETS + ("+Inf",), histogram["buckets"]):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_labels(histogram['labels'], {'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(histogram['labels'])} {histogram['sum']}")
+        lines.append(f"{name}_count{_labels(histogram['labels'])} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    _write(path, prometheus_text())
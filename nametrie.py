@@ -0,0 +1,173 @@
+# nametrie.py
+
+"""
+Module: nametrie.py
+
+Description:
+This module provides the compact store for discovered hostnames used by subdomains.py. Names
+are kept in a trie of reversed DNS labels (com -> example -> dev -> www), so the shared suffix
+of millions of names under one target is stored once, repeated labels such as "www" or "api"
+are interned, and a name is only ever stored once.
+
+Features:
+- Exact suffix scope check on insert: names outside the trie's zone are rejected
+- Deduplication on insert (`add()` returns False for names already present)
+- Ordered iteration by zone (DNS canonical order) without sorting the whole set
+- Name counts per zone, maintained on insert
+- Optional value per name (e.g. the resolved IP address)
+
+Usage:
+    names = NameTrie("example.com")
+    names.add("www.dev.example.com", "10.0.0.1")   # True
+    names.add("www.dev.example.com", "10.0.0.2")   # False, already present
+    names.add("example.com.evil.net")              # False, out of scope
+    names.count("dev.example.com")                 # 1
+    for name, ip in names.items():
+        ...
+
+Dependencies:
+- sys (string interning)
+
+Limitations:
+- Not thread-safe; subdomains.py only touches it from the event loop
+- Names are compared lower-cased; IDN names should be given in one form (Unicode or punycode)
+"""
+
+import sys
+
+_MISSING = object()
+
+
+class _Node:
+    """Inner trie node. Leaves are stored as plain values in their parent's children dict."""
+
+    __slots__ = ("children", "value", "count")
+
+    def __init__(self, value=_MISSING):
+        self.children = {}
+        self.value = value
+        self.count = 0 if value is _MISSING else 1  # names at or below this node
+
+
+class NameTrie:
+    """Set of hostnames under one zone, stored as a reversed-label trie."""
+
+    def __init__(self, zone=""):
+        self.zone = zone.lower().rstrip(".")
+        self._root = _Node()
+
+    def _labels(self, name):
+        """Labels of name below the zone, outermost first, or None if the name is out of scope."""
+        name = name.lower().rstrip(".")
+        if name == self.zone:
+            return []
+        if self.zone:
+            if not name.endswith("." + self.zone):
+                return None
+            name = name[:-len(self.zone) - 1]
+        labels = name.split(".")
+        if "" in labels:
+            return None
+        labels.reverse()
+        return labels
+
+    def _find(self, name):
+        labels = self._labels(name)
+        if labels is None:
+            return _MISSING
+        node = self._root
+        for label in labels:
+            if not isinstance(node, _Node):
+                return _MISSING
+            node = node.children.get(label, _MISSING)
+            if node is _MISSING:
+                return _MISSING
+        return node
+
+    def add(self, name, value=True):
+        """Insert a name; returns False if it is already present or outside the zone."""
+        labels = self._labels(name)
+        if labels is None:
+            return False
+
+        path = [self._root]
+        node = self._root
+        for label in labels[:-1]:
+            child = node.children.get(label, _MISSING)
+            if child is _MISSING:
+                child = node.children[sys.intern(label)] = _Node()
+            elif not isinstance(child, _Node):
+                # A stored name gains a subdomain: promote its leaf value to an inner node
+                child = node.children[label] = _Node(child)
+            node = child
+            path.append(node)
+
+        if not labels:
+            if node.value is not _MISSING:
+                return False
+            node.value = value
+        else:
+            existing = node.children.get(labels[-1], _MISSING)
+            if existing is _MISSING:
+                node.children[sys.intern(labels[-1])] = value
+            elif isinstance(existing, _Node) and existing.value is _MISSING:
+                existing.value = value
+                existing.count += 1
+            else:
+                return False
+
+        for parent in path:
+            parent.count += 1
+        return True
+
+    def __contains__(self, name):
+        node = self._find(name)
+        return node is not _MISSING and (not isinstance(node, _Node) or node.value is not _MISSING)
+
+    def get(self, name, default=None):
+        node = self._find(name)
+        if isinstance(node, _Node):
+            node = node.value
+        return default if node is _MISSING else node
+
+    def __len__(self):
+        return self._root.count
+
+    def count(self, zone=None):
+        """Number of names at or below a zone (the whole trie by default)."""
+        node = self._root if zone is None else self._find(zone)
+        if node is _MISSING:
+            return 0
+        return node.count if isinstance(node, _Node) else 1
+
+    def zone_counts(self, zone=None):
+        """{child zone: name count} for the zones directly below a zone, in canonical order."""
+        node = self._root if zone is None else self._find(zone)
+        if not isinstance(node, _Node):
+            return {}
+        suffix = zone.lower().rstrip(".") if zone is not None else self.zone
+        return {
+            f"{label}.{suffix}" if suffix else label: child.count if isinstance(child, _Node) else 1
+            for label, child in sorted(node.children.items())
+        }
+
+    def _walk(self, node, suffix):
+        for label in sorted(node.children):
+            child = node.children[label]
+            name = f"{label}.{suffix}" if suffix else label
+            if isinstance(child, _Node):
+                if child.value is not _MISSING:
+                    yield name, child.value
+                yield from self._walk(child, name)
+            else:
+                yield name, child
+
+    def items(self):
+        """Yield (name, value) pairs zone by zone, in DNS canonical order."""
+        if self._root.value is not _MISSING:
+            yield self.zone, self._root.value
+        yield from self._walk(self._root, self.zone)
+
+    def __iter__(self):
+        for name, _ in self.items():
+            yield name
@@ -0,0 +1,361 @@
+# portscan.py
+
+"""
+Module: portscan.py
+
+Description:
+This module replaces the hand-run `nmap -Pn -p- ...` / `xargs -P 3 nmap` invocations from the
+commands cheat-sheet with an integrated TCP connect scan of the hosts found by the subdomain
+module. Subdomains are grouped by IP first, so an address shared by hundreds of names (a CDN
+edge, a load balancer, a shared host) is scanned once; its open ports are then reported for
+every subdomain that resolves to it.
+
+Features:
+- asyncio connect scan on non-blocking sockets, thousands of connection attempts in flight
+- Global concurrency limit plus a per-IP limit, so one host is never hit with the whole budget
+- Adaptive timeouts per IP: connect round-trip times (open and refused ports both answer) feed
+  a smoothed RTT estimate as in RFC 6298, and unanswered ports are given up after
+  SRTT + 4 * RTTVAR instead of the full configured timeout
+- Unanswered ports of a host that does answer are retried once, so a dropped SYN is not
+  reported as filtered
+- Hosts that report network/host unreachable are skipped after the first error
+- Port sets: "top100" (most common TCP ports), "all" (1-65535, like nmap -p-), lists and ranges
+  such as "22,80,8000-8100", or a mix ("top100,9200")
+
+Usage:
+    rows = get_open_ports("example.com", [{"subdomain": "www.example.com", "ip": "93.184.216.34"}],
+                          ports=parse_ports("top100"))
+
+    async with PortScanner(concurrency=5000, per_host=200) as scanner:
+        state = await scanner.scan_port("93.184.216.34", 443)
+
+Dependencies:
+- asyncio
+- socket
+- httpprobe (open-file limit helper)
+- metrics (probe counters and connect latency histogram)
+
+Limitations:
+- TCP connect scan only: no SYN/stealth scan (needs raw sockets and root), no UDP and no
+  service/version detection (-sV); open ports are named from the local services database
+- IPv4 addresses as returned by resolver.py; every address is scanned, not only the first
+- Firewalls that rate-limit RST or ICMP replies slow the scan down like they slow nmap down
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import time
+
+import httpprobe
+import metrics
+
+DEFAULT_CONCURRENCY = 5000  # connection attempts in flight
+DEFAULT_PER_HOST = 200  # connection attempts in flight per IP address
+DEFAULT_TIMEOUT = 1.0  # seconds for a connect before the host's RTT is known, and the upper bound after
+MIN_TIMEOUT = 0.25  # lower bound of the adaptive timeout, leaves room for event-loop and SYN-ACK jitter
+DEFAULT_RETRIES = 1  # extra attempts for unanswered ports of hosts that answer on other ports
+
+# Most common TCP ports (nmap's top 100)
+TOP_PORTS = (
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135, 139, 143, 144,
+    179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548, 554, 587, 631, 646, 873, 990,
+    993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433, 1720, 1723, 1755, 1900, 2000, 2001, 2049, 2121,
+    2717, 3000, 3128, 3306, 3389, 3986, 4899, 5000, 5009, 5051, 5060, 5101, 5190, 5357, 5432, 5631,
+    5666, 5800, 5900, 6000, 6001, 6646, 7070, 8000, 8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999,
+    10000, 32768, 49152, 49153, 49154, 49155, 49156, 49157,
+)
+
+OPEN, CLOSED, FILTERED, UNREACHABLE = "open", "closed", "filtered", "unreachable"
+UNREACHABLE_ERRNOS = {errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EHOSTDOWN, errno.ENETDOWN}
+# A non-blocking connect() reports a pending attempt with EINPROGRESS (EWOULDBLOCK on Windows).
+# Linux's EWOULDBLOCK is EAGAIN, which connect() returns when no local port is free, so it only
+# counts as pending where the two differ
+PENDING_ERRNOS = {errno.EINPROGRESS} | ({errno.EWOULDBLOCK} if errno.EWOULDBLOCK != errno.EAGAIN else set())
+# Out of local ports, file descriptors or buffers: says nothing about the target
+LOCAL_ERRNOS = {errno.EAGAIN, errno.EADDRNOTAVAIL, errno.EMFILE, errno.ENFILE, errno.ENOBUFS}
+LOCAL_BACKOFF = (0.05, 0.1, 0.2, 0.4, 0.8)  # seconds between attempts after a local resource error
+_service_names = {}
+
+
+def parse_ports(spec):
+    """Turn a port specification into a sorted list of ports.
+
+    Accepts an iterable of ints or a comma-separated string of ports, ranges ("8000-8100"),
+    "top100" and "all" (or "-", as in nmap -p-).
+    """
+    if not isinstance(spec, str):
+        ports = {int(port) for port in spec}
+    else:
+        ports = set()
+        for part in spec.replace(" ", "").split(","):
+            if not part:
+                continue
+            if part.lower() == "top100":
+                ports.update(TOP_PORTS)
+            elif part.lower() in ("all", "-"):
+                ports.update(range(1, 65536))
+            elif "-" in part:
+                low, _, high = part.partition("-")
+                ports.update(range(int(low or 1), int(high or 65535) + 1))
+            else:
+                ports.add(int(part))
+    invalid = [port for port in ports if not 0 < port < 65536]
+    if invalid:
+        raise ValueError(f"invalid port: {invalid[0]}")
+    return sorted(ports)
+
+
+def service_name(port):
+    """Name of a TCP port from the local services database, or None."""
+    if port not in _service_names:
+        try:
+            _service_names[port] = socket.getservbyport(port, "tcp")
+        except OSError:
+            _service_names[port] = None
+    return _service_names[port]
+
+
+def group_by_ip(subdomains):
+    """Map each IP to the subdomains resolving to it, in first-seen order."""
+    hosts = {}
+    for entry in subdomains:
+        addresses = entry["ip"] if isinstance(entry["ip"], list) else [entry["ip"]]
+        for ip in addresses:
+            names = hosts.setdefault(ip, [])
+            if entry["subdomain"] not in names:
+                names.append(entry["subdomain"])
+    return hosts
+
+
+def _resolve(waiter, value):
+    if not waiter.done():
+        waiter.set_result(value)
+
+
+class _Host:
+    """Per-IP state: in-flight limit, RTT estimate and whether the host is reachable."""
+    __slots__ = ("limit", "srtt", "rttvar", "unreachable")
+
+    def __init__(self, per_host):
+        self.limit = asyncio.Semaphore(per_host)
+        self.srtt = None
+        self.rttvar = None
+        self.unreachable = False
+
+    def timeout(self, initial):
+        if self.srtt is None:
+            return initial
+        return min(initial, max(MIN_TIMEOUT, self.srtt + 4 * self.rttvar))
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+
+class PortScanner:
+    """Async TCP connect scanner with global and per-IP limits and per-IP adaptive timeouts."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES):
+        self.concurrency = max(1, int(concurrency))
+        self.per_host = max(1, int(per_host))
+        self.timeout = timeout
+        self.retries = retries
+        self.stats = {"probes": 0, OPEN: 0, CLOSED: 0, FILTERED: 0, UNREACHABLE: 0, "retries": 0,
+                      "backoffs": 0, "errors": 0}
+        self._semaphore = None
+        self._hosts = {}  # ip -> _Host
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._hosts.clear()
+        for state in (OPEN, CLOSED, FILTERED, UNREACHABLE):
+            metrics.count("port_probes", self.stats[state], state=state)
+
+    def _host(self, ip):
+        host = self._hosts.get(ip)
+        if host is None:
+            host = self._hosts[ip] = _Host(self.per_host)
+        return host
+
+    def forget(self, ip):
+        """Drop the state kept for ip once all of its ports are scanned."""
+        self._hosts.pop(ip, None)
+
+    async def _connect(self, ip, port, host):
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            started = time.perf_counter()
+            error = sock.connect_ex((ip, port))
+            fd = sock.fileno()
+            # Wait for writability directly instead of through loop.sock_connect(), which needs
+            # a task per attempt for the timeout. The deadline is re-read at least every
+            # MIN_TIMEOUT, so attempts sent before the host's first answer switch to the
+            # adaptive timeout soon after an RTT sample arrives.
+            while error in PENDING_ERRNOS:
+                remaining = started + host.timeout(self.timeout) - time.perf_counter()
+                if remaining <= 0:
+                    return FILTERED, None
+                waiter = loop.create_future()
+                loop.add_writer(fd, _resolve, waiter, True)
+                timer = loop.call_later(min(remaining, MIN_TIMEOUT), _resolve, waiter, False)
+                try:
+                    if await waiter:
+                        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                finally:
+                    timer.cancel()
+                    loop.remove_writer(fd)
+            rtt = time.perf_counter() - started
+            if not error:
+                return OPEN, rtt
+            if error == errno.ECONNREFUSED:
+                return CLOSED, rtt
+            if error in UNREACHABLE_ERRNOS:
+                return UNREACHABLE, None
+            raise OSError(error, os.strerror(error))
+        finally:
+            sock.close()
+
+    async def _connect_after_backoff(self, ip, port, host, error):
+        # A local resource error is retried after a pause instead of being read as a port state;
+        # if it persists, the OSError reaches the caller, which counts it as an error
+        for delay in LOCAL_BACKOFF:
+            if error.errno not in LOCAL_ERRNOS:
+                raise error
+            self.stats["backoffs"] += 1
+            await asyncio.sleep(delay)
+            try:
+                return await self._connect(ip, port, host)
+            except OSError as e:
+                error = e
+        raise error
+
+    async def scan_port(self, ip, port):
+        """Connect to ip:port; returns "open", "closed", "filtered" or "unreachable"."""
+        host = self._host(ip)
+        # The per-IP limit comes first, so a port queued behind a busy IP holds no global slot
+        async with host.limit, self._semaphore:
+            for attempt in range(1 + self.retries):
+                if host.unreachable:
+                    return UNREACHABLE
+                self.stats["probes"] += 1
+                if attempt:
+                    self.stats["retries"] += 1
+                try:
+                    state, rtt = await self._connect(ip, port, host)
+                except OSError as e:
+                    state, rtt = await self._connect_after_backoff(ip, port, host, e)
+                if rtt is not None:
+                    host.sample(rtt)
+                    if state == OPEN:
+                        metrics.observe("port_connect_seconds", rtt)
+                if state == UNREACHABLE:
+                    host.unreachable = True
+                # Retrying only pays off on hosts known to answer; a dark host would double the scan time
+                if state != FILTERED or host.srtt is None:
+                    break
+        self.stats[state] += 1
+        return state
+
+
+async def scan_hosts(ips, ports, on_open, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST,
+                     timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+    """Scan every port of every IP, calling on_open(ip, port) for each open port.
+
+    Returns the scanner's stats.
+    """
+    ips = list(ips)
+    async with PortScanner(concurrency, per_host, timeout, retries) as scanner:
+        queue = asyncio.Queue(maxsize=scanner.concurrency * 2)
+        remaining = {ip: len(ports) for ip in ips}
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                ip, port = item
+                try:
+                    if await scanner.scan_port(ip, port) == OPEN:
+                        on_open(ip, port)
+                except OSError:
+                    # A local error that outlasted the back-off: count it and keep scanning
+                    scanner.stats["errors"] += 1
+                remaining[ip] -= 1
+                if not remaining[ip]:
+                    scanner.forget(ip)
+
+        workers = [asyncio.create_task(worker()) for _ in range(scanner.concurrency)]
+        try:
+            # Port-major order spreads consecutive attempts over all hosts instead of
+            # queueing a whole host's ports behind its per-IP limit
+            for port in ports:
+                for ip in ips:
+                    await queue.put((ip, port))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return dict(scanner.stats)
+
+
+def get_open_ports(domain, subdomains, ports=TOP_PORTS, concurrency=DEFAULT_CONCURRENCY,
+                   per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+    """Scan the IPs of resolved subdomains once each; returns one row per subdomain with open ports.
+
+    Each row is {"subdomain", "ip", "open_ports", "services"}; subdomains whose IP has no open
+    port are left out.
+    """
+    os.makedirs("data", exist_ok=True)
+    ports = parse_ports(ports)
+    hosts = group_by_ip(subdomains)
+    print(f"[*] Scanning {len(hosts)} unique IPs ({len(subdomains)} subdomains) on {len(ports)} TCP ports")
+    start_time = time.time()
+    open_ports = {}
+    httpprobe.raise_file_limit(concurrency + 256)
+
+    def collect(ip, port):
+        open_ports.setdefault(ip, []).append(port)
+        names = hosts[ip]
+        print(f"[✓] {ip}:{port} open ({service_name(port) or 'unknown'}) - "
+              f"{names[0]}" + (f" and {len(names) - 1} more" if len(names) > 1 else ""))
+
+    stats = asyncio.run(scan_hosts(hosts, ports, collect, concurrency, per_host, timeout, retries))
+
+    rows = []
+    for ip in sorted(open_ports, key=lambda ip: tuple(int(part) for part in ip.split("."))):
+        found = sorted(open_ports[ip])
+        services = [f"{port}/{service_name(port) or 'unknown'}" for port in found]
+        for name in hosts[ip]:
+            rows.append({"subdomain": name, "ip": ip, "open_ports": found, "services": services})
+
+    txt_path = f"data/ports_{domain}.txt"
+    with open(txt_path, "w") as f:
+        for ip in sorted(open_ports):
+            f.write(f"{ip} {','.join(str(port) for port in sorted(open_ports[ip]))} {' '.join(hosts[ip])}\n")
+    print(f"[✓] Port scan results saved to: {txt_path}")
+
+    duration = max(time.time() - start_time, 0.001)
+    print("\n--- Port Scan Summary ---")
+    print(f"  Probes: {stats['probes']} ({round(stats['probes'] / duration)}/s), open: {stats[OPEN]}, "
+          f"closed: {stats[CLOSED]}, filtered: {stats[FILTERED]}, unreachable: {stats[UNREACHABLE]}, "
+          f"retries: {stats['retries']}" + (f", backoffs: {stats['backoffs']}" if stats["backoffs"] else "")
+          + (f", errors: {stats['errors']}" if stats["errors"] else ""))
+    print(f"  Hosts with open ports: {len(open_ports)} of {len(hosts)}, covering {len(rows)} subdomains")
+    print(f"  Runtime: {round(duration, 2)} seconds")
+    return rows
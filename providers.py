@@ -0,0 +1,179 @@
+# providers.py
+
+"""
+Module: providers.py
+
+Description:
+This module defines the passive subdomain sources used by subdomains.py as pluggable
+providers. Each provider declares its own rate limit, timeouts and response parsing, and
+exposes its results as a generator of hostnames. The enumeration engine queries every enabled
+provider at the same time, so passive enumeration takes as long as the slowest provider
+instead of the sum of all of them.
+
+Features:
+- `Provider` base class with declarative name, label, rate limit and timeouts
+- Registry of available providers via the `@register` decorator
+- Overall per-provider deadline enforced while names are being produced
+- Shared name helpers: wildcard normalisation and exact suffix scope checks
+- Built-in providers: crt.sh (streamed) and hackertarget.com
+
+Adding a source:
+
+    @register
+    class MySource(Provider):
+        name = "mysource"
+        label = "mysource.io"
+        rate = (2.0, 1)
+
+        def names(self, domain):
+            response = transport.get(f"https://mysource.io/{domain}", provider=self.name)
+            for host in response.json():
+                yield normalize_name(host)
+
+Dependencies:
+- transport (shared pooled HTTP client with retries)
+- cache (persistent provider response cache)
+- jsonstream (incremental JSON array parser)
+- ratelimit (shared per-provider token buckets)
+
+Limitations:
+- The overall timeout is checked between yielded names; a single blocking request is bounded
+  by `request_timeout` instead
+"""
+
+import time
+from urllib.parse import quote
+
+import cache
+import jsonstream
+import ratelimit
+import transport
+
+PROVIDERS = {}
+
+
+class ProviderTimeout(Exception):
+    """Raised when a provider exceeds its overall deadline."""
+
+
+def normalize_name(name):
+    """Lower-case a hostname and strip wildcard prefixes and trailing dots."""
+    name = name.strip().lower().rstrip(".")
+    while name.startswith("*."):
+        name = name[2:]
+    return name
+
+
+def in_scope(name, domain):
+    """Exact suffix check: name is the domain itself or one of its subdomains."""
+    return name == domain or name.endswith("." + domain)
+
+
+class Provider:
+    """Base class for passive subdomain sources."""
+
+    name = None  # registry, rate-limit and cache key
+    label = None  # human readable name used in console output
+    rate = (1.0, 1)  # (requests per second, burst)
+    request_timeout = None  # seconds per HTTP request, None = transport default
+    timeout = 120  # seconds for the whole provider
+    url = None  # request URL template with a {domain} field, overridable (e.g. by benchmarks)
+
+    def names(self, domain):
+        """Yield hostnames for the domain. Subclasses must implement this."""
+        raise NotImplementedError
+
+    def iter_names(self, domain):
+        """Yield in-scope names, stopping with ProviderTimeout once the deadline passes."""
+        deadline = time.monotonic() + self.timeout
+        domain = domain.lower()
+        for name in self.names(domain):
+            if in_scope(name, domain):
+                yield name
+            if time.monotonic() > deadline:
+                raise ProviderTimeout(f"exceeded {self.timeout}s deadline")
+
+
+def register(cls):
+    """Class decorator adding a provider to the registry and declaring its rate limit."""
+    PROVIDERS[cls.name] = cls()
+    ratelimit.set_default(cls.name, cls.rate)
+    return cls
+
+
+def enabled_providers(names=None):
+    """Return provider instances by name, or all registered providers."""
+    if not names:
+        return list(PROVIDERS.values())
+    unknown = [name for name in names if name not in PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown providers: {', '.join(unknown)}")
+    return [PROVIDERS[name] for name in names]
+
+
+def iter_crtsh_names(chunks, domain):
+    """Yield unique in-scope names from a crt.sh JSON body streamed as byte chunks."""
+    domain = domain.lower()
+    names = set()
+    for entry in jsonstream.iter_json_array(chunks):
+        name_value = entry.get("name_value")
+        if not name_value:
+            continue
+        for item in name_value.split("\n"):
+            name = normalize_name(item)
+            if name not in names and in_scope(name, domain):
+                names.add(name)
+                yield name
+
+
+@register
+class CrtShProvider(Provider):
+    name = "crtsh"
+    label = "crt.sh"
+    rate = (0.5, 2)
+    timeout = 300
+    url = "https://crt.sh/?q=%25.{domain}&output=json"
+
+    def names(self, domain):
+        key = f"names:{domain}"
+        cached = cache.lookup(self.name, key)
+        if cached is not None:
+            yield from cached.decode("utf-8").split()
+            return
+
+        url = self.url.format(domain=quote(domain))
+        names = []
+        # Stream the body: large organisations return hundreds of megabytes of JSON
+        with transport.get(url, provider=self.name, timeout=self.request_timeout, stream=True) as response:
+            if response.status_code != 200:
+                return
+            for name in iter_crtsh_names(response.iter_content(jsonstream.CHUNK_SIZE), domain):
+                names.append(name)
+                yield name
+            transport.record_download(response, self.name)
+        cache.put(self.name, key, "\n".join(names))
+
+
+@register
+class HackerTargetProvider(Provider):
+    name = "hackertarget"
+    label = "hackertarget"
+    rate = (1.0, 1)
+    url = "https://api.hackertarget.com/hostsearch/?q={domain}"
+
+    def _download(self, domain):
+        url = self.url.format(domain=domain)
+        response = transport.get(url, provider=self.name, timeout=self.request_timeout)
+        # hackertarget answers quota and input errors with HTTP 200, so only cache real host lists
+        if response.status_code != 200 or "," not in response.text:
+            return None
+        return response.text
+
+    def names(self, domain):
+        text = cache.fetch(self.name, domain, lambda: self._download(domain))
+        if text is None:
+            return
+        for line in text.decode("utf-8", "replace").strip().splitlines():
+            parts = line.split(",")
+            if len(parts) == 2:
+                yield normalize_name(parts[0])
@@ -0,0 +1,110 @@
+# ratelimit.py
+
+"""
+Module: ratelimit.py
+
+Description:
+This module provides the shared rate limiter used by every ReconStudio module that talks to a
+public provider. Each provider (crt.sh, hackertarget, WHOIS servers, ...) gets one token bucket
+that is shared by all threads and all targets in the process, so running many targets at once
+raises total throughput without exceeding any single provider's limit.
+
+Features:
+- Thread-safe token buckets with a configurable rate and burst size
+- One global bucket per provider name, created on first use
+- Unknown providers fall back to a default rate
+- Hierarchical names: "whois:whois.verisign-grs.com" uses its own bucket but inherits
+  the "whois" rate unless it is configured explicitly
+
+Usage:
+Call `acquire(provider)` right before each request to that provider:
+
+    ratelimit.acquire("crtsh")
+    response = requests.get(url)
+
+The limits are set once at startup by main.py via `configure(CONFIG['provider_rates'], ...)`.
+
+Dependencies:
+- threading
+- time
+
+Limitations:
+- Limits are per process; separate ReconStudio processes do not share buckets
+"""
+
+import threading
+import time
+
+# Subdomain providers declare their own defaults through set_default() when registered
+DEFAULT_RATES = {
+    "whois": (1.0, 2),
+}
+
+_rates = dict(DEFAULT_RATES)
+_default_rate = (1.0, 1)
+_buckets = {}
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `burst` tokens."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until the bucket allows it. Returns the time waited."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the tokens now; a negative balance is the queue of waiting callers
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def configure(rates=None, default_rate=None):
+    """Set provider limits as {provider: rate} or {provider: (rate, burst)} and reset buckets."""
+    global _default_rate
+    with _lock:
+        for provider, limit in (rates or {}).items():
+            _rates[provider] = limit if isinstance(limit, tuple) else (limit, 1)
+        if default_rate is not None:
+            _default_rate = default_rate if isinstance(default_rate, tuple) else (default_rate, 1)
+        _buckets.clear()
+
+
+def set_default(provider, limit):
+    """Declare a provider's limit unless one was already configured."""
+    with _lock:
+        _rates.setdefault(provider, limit if isinstance(limit, tuple) else (limit, 1))
+
+
+def _limit_for(provider):
+    if provider in _rates:
+        return _rates[provider]
+    family = provider.split(":", 1)[0]
+    return _rates.get(family, _default_rate)
+
+
+def get_bucket(provider):
+    """Return the process-wide bucket for a provider, creating it on first use."""
+    with _lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            bucket = _buckets[provider] = TokenBucket(*_limit_for(provider))
+        return bucket
+
+
+def acquire(provider):
+    """Block until one request to the given provider is allowed."""
+    return get_bucket(provider).acquire()
@@ -5,16 +5,22 @@ Module: report_generator.py
 
 Description:
 This module generates a report from the collected reconnaissance data.
-It allows the user to choose between output formats: JSON, HTML, PDF, or TXT.
+It allows the user to choose between output formats: JSON, NDJSON, HTML, PDF, or TXT.
 
 Features:
 - Supports multiple output formats
+- JSON and TXT are written incrementally instead of being serialised into one big string
+- NDJSON (one record per line) for downstream pipelines; `NDJSONWriter` can receive
+  records while the scan is still running
+- HTML and PDF render subdomains, hosts, emails and WHOIS as tables; HTML tables are split
+  into collapsible pages and streamed from a template compiled once per process
 - Saves reports to the 'data/' directory
 - Displays save path confirmation to the user
 
 Usage:
-Call generate_report(data, output_path) where data is a dictionary
-and output_path is the base file path without extension.
+Call generate_report(data, output_path, report_format) where data is a dictionary,
+output_path is the base file path without extension and report_format is one of
+json, ndjson, txt, html or pdf. If report_format is omitted the user is asked interactively.
 
 Dependencies:
 - json
@@ -24,69 +30,244 @@ Dependencies:
 - fpdf (for PDF)
 
 Limitations:
-- PDF requires the 'fpdf' package
-- HTML requires the 'jinja2' package and a basic template
+- PDF requires the 'fpdf' package; tables longer than PDF_MAX_ROWS are cut with a note
+- HTML requires the 'jinja2' package
 """
 
 import os
 import json
+import threading
 import time
 
 from fpdf import FPDF
-from jinja2 import Template
+from jinja2 import DictLoader, Environment
 
-def generate_report(data, output_path):
+FORMAT_CHOICES = {"json": "1", "txt": "2", "html": "3", "pdf": "4", "ndjson": "5"}
+
+# NDJSON record type for each list-valued section or theHarvester key
+RECORD_TYPES = {"subdomains": "subdomain", "emails": "email", "hosts": "host", "ips": "ip", "providers": "provider"}
+
+PAGE_SIZE = 500  # table rows per collapsible HTML page
+PDF_MAX_ROWS = 20000  # rows per table in the PDF; larger tables are cut with a note
+PDF_ROW_HEIGHT = 5
+
+TEMPLATES = {
+    "report.html": """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Recon Report - {{ target }}</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 0.5em; }
+th, td { border: 1px solid #ccc; padding: 2px 6px; text-align: left; font-size: 0.9em; }
+th { background: #eee; }
+summary { cursor: pointer; color: #555; }
+nav a { margin-right: 1em; }
+</style>
+</head>
+<body>
+<h1>ReconStudio Report</h1>
+<p>Target: <strong>{{ target }}</strong></p>
+<nav>{% for table in tables %}<a href="#{{ table.id }}">{{ table.title }} ({{ table.count }})</a>{% endfor %}</nav>
+{% for table in tables %}
+<h2 id="{{ table.id }}">{{ table.title }} ({{ table.count }})</h2>
+{% for page in table.rows | batch(page_size) %}
+<details{% if loop.first %} open{% endif %}>
+<summary>Rows {{ loop.index0 * page_size + 1 }}-{{ loop.index0 * page_size + page | length }}</summary>
+<table>
+<thead><tr>{% for column in table.columns %}<th>{{ column }}</th>{% endfor %}</tr></thead>
+<tbody>
+{% for row in page %}<tr>{% for cell in row %}<td>{{ cell }}</td>{% endfor %}</tr>
+{% endfor %}</tbody>
+</table>
+</details>
+{% endfor %}
+{% endfor %}
+</body>
+</html>
+""",
+}
+
+# Compiled once per process and reused for every report
+_environment = Environment(loader=DictLoader(TEMPLATES), autoescape=True)
+
+def _cell(value):
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+def _table(section, title, content):
+    """Describe one section as a table: columns, a lazy row iterator and the row count."""
+    if isinstance(content, dict):
+        columns = ["Field", "Value"]
+        rows = ((key, _cell(value)) for key, value in content.items())
+    elif content and isinstance(content[0], dict):
+        columns = list(content[0].keys())
+        rows = (tuple(_cell(item.get(column)) for column in columns) for item in content)
+    else:
+        columns = [title]
+        rows = ((_cell(item),) for item in content)
+    return {"id": section, "title": title, "columns": columns, "rows": rows, "count": len(content)}
+
+def iter_tables(data):
+    """Yield one table per report section; theHarvester lists become separate tables."""
+    for section, content in data.items():
+        if section == "target" or not content:
+            continue
+        if section == "theharvester" and isinstance(content, dict):
+            for key, values in content.items():
+                if values:
+                    values = values if isinstance(values, list) else [values]
+                    yield _table(f"{section}-{key}", f"theHarvester {key}", values)
+        elif isinstance(content, (list, dict)):
+            yield _table(section, section.title(), content)
+
+def _write_html(data, f):
+    template = _environment.get_template("report.html")
+    # generate() streams the output instead of building the whole document in memory
+    for chunk in template.generate(target=data.get("target"), tables=list(iter_tables(data)), page_size=PAGE_SIZE):
+        f.write(chunk)
+
+def _pdf_text(value, width):
+    # Core PDF fonts are latin-1 only; clip to the column width instead of wrapping
+    text = value.encode("latin-1", "replace").decode("latin-1")
+    limit = max(4, int(width / 1.6))
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+def _write_pdf(data, path):
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=10)
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, txt=f"Recon Report - {data.get('target', '')}", ln=True, align='C')
+
+    for table in iter_tables(data):
+        pdf.ln(4)
+        pdf.set_font("Arial", 'B', 11)
+        pdf.cell(0, 8, txt=f"{table['title']} ({table['count']})", ln=True)
+        widths = [190 / len(table["columns"])] * len(table["columns"])
+        pdf.set_font("Arial", 'B', 8)
+        for width, column in zip(widths, table["columns"]):
+            pdf.cell(width, PDF_ROW_HEIGHT, txt=_pdf_text(str(column), width), border=1)
+        pdf.ln(PDF_ROW_HEIGHT)
+        pdf.set_font("Arial", size=8)
+        for index, row in enumerate(table["rows"]):
+            if index >= PDF_MAX_ROWS:
+                pdf.set_font("Arial", 'I', 8)
+                pdf.cell(0, PDF_ROW_HEIGHT, txt=f"... {table['count'] - PDF_MAX_ROWS} more rows, see the JSON/NDJSON report", ln=True)
+                break
+            for width, value in zip(widths, row):
+                pdf.cell(width, PDF_ROW_HEIGHT, txt=_pdf_text(value, width))
+            pdf.ln(PDF_ROW_HEIGHT)
+    pdf.output(path)
+
+def _write_value(value, f, level=0):
+    """Write a JSON value piece by piece: containers are streamed, list items encoded one at a time."""
+    indent = "  " * (level + 1)
+    if isinstance(value, dict) and value:
+        f.write("{\n")
+        for index, (key, item) in enumerate(value.items()):
+            f.write(f"{indent}{json.dumps(str(key))}: ")
+            _write_value(item, f, level + 1)
+            f.write(",\n" if index < len(value) - 1 else "\n")
+        f.write("  " * level + "}")
+    elif isinstance(value, list) and value:
+        f.write("[\n")
+        for index, item in enumerate(value):
+            f.write(indent + json.dumps(item, default=str))
+            f.write(",\n" if index < len(value) - 1 else "\n")
+        f.write("  " * level + "]")
+    else:
+        f.write(json.dumps(value, default=str))
+
+def iter_records(data, skip=()):
+    """Yield one flat record per subdomain, email, host, etc. for line-oriented output."""
+    for section, content in data.items():
+        if section in skip:
+            continue
+        if section == "target":
+            yield {"type": "target", "target": content}
+        elif isinstance(content, list):
+            for item in content:
+                record_type = RECORD_TYPES.get(section, section)
+                yield {"type": record_type, **item} if isinstance(item, dict) else {"type": record_type, "value": item}
+        elif section == "theharvester" and isinstance(content, dict):
+            for key, values in content.items():
+                for item in values if isinstance(values, list) else [values]:
+                    yield {"type": RECORD_TYPES.get(key, key), "value": item}
+        elif isinstance(content, dict):
+            if content:
+                yield {"type": section, **content}
+        else:
+            yield {"type": section, "value": content}
+
+class NDJSONWriter:
+    """Thread-safe NDJSON sink so records can be written while a scan is still running."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self.count += 1
+
+    def write_subdomain(self, entry):
+        self.write({"type": "subdomain", **entry})
+
+    def write_records(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def generate_report(data, output_path, report_format=None):
     os.makedirs("data", exist_ok=True)
-    print("[*] Choose output format: [1] JSON, [2] TXT, [3] HTML, [4] PDF")
-    choice = input("Enter option number: ").strip()
+    if report_format:
+        choice = FORMAT_CHOICES.get(report_format.lower(), "")
+    else:
+        print("[*] Choose output format: [1] JSON, [2] TXT, [3] HTML, [4] PDF, [5] NDJSON")
+        choice = input("Enter option number: ").strip()
     start = time.time()
 
     if choice == '1':
         with open(output_path + ".json", "w") as f:
-            json.dump(data, f, indent=2)
+            _write_value(data, f)
+            f.write("\n")
         print(f"[✓] Report saved to: {output_path}.json")
 
     elif choice == '2':
         with open(output_path + ".txt", "w") as f:
             for section, content in data.items():
                 f.write(f"[{section.upper()}]\n")
-                f.write(f"{json.dumps(content, indent=2)}\n\n")
+                _write_value(content, f)
+                f.write("\n\n")
         print(f"[✓] Report saved to: {output_path}.txt")
 
     elif choice == '3':
-        html_template = Template("""
-        <html>
-        <head><title>Recon Report</title></head>
-        <body>
-        <h1>ReconStudio Report</h1>
-        {% for section, content in data.items() %}
-            <h2>{{ section }}</h2>
-            <pre>{{ content | tojson(indent=2) }}</pre>
-        {% endfor %}
-        </body>
-        </html>
-        """)
-        html_content = html_template.render(data=data)
         with open(output_path + ".html", "w") as f:
-            f.write(html_content)
+            _write_html(data, f)
         print(f"[✓] Report saved to: {output_path}.html")
 
     elif choice == '4':
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        pdf.cell(200, 10, txt="Recon Report", ln=True, align='C')
-        for section, content in data.items():
-            pdf.ln(10)
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(200, 10, txt=section.upper(), ln=True)
-            pdf.set_font("Arial", size=10)
-            lines = json.dumps(content, indent=2).split("\n")
-            for line in lines:
-                pdf.multi_cell(0, 10, txt=line)
-        pdf.output(output_path + ".pdf")
+        _write_pdf(data, output_path + ".pdf")
         print(f"[✓] Report saved to: {output_path}.pdf")
 
+    elif choice == '5':
+        writer = NDJSONWriter(output_path + ".ndjson")
+        writer.write_records(iter_records(data))
+        writer.close()
+        print(f"[✓] Report saved to: {output_path}.ndjson")
+
     else:
         print("[!] Invalid option. No report was generated.")
 
@@ -0,0 +1,349 @@
+# resolver.py
+
+"""
+Module: resolver.py
+
+Description:
+This module implements a lightweight asynchronous DNS resolver used by the ReconStudio toolkit.
+Instead of resolving one name at a time with the blocking `socket.gethostbyname`, it keeps
+thousands of A-record queries in flight over a small pool of UDP sockets and spreads them
+across a configurable list of nameservers.
+
+Features:
+- Raw DNS wire-format queries over UDP (no third-party DNS library required)
+- Thousands of concurrent queries multiplexed over a few sockets
+- Round-robin load balancing across nameservers
+- Retransmission on timeout, SERVFAIL or REFUSED, moving to the next nameserver
+- Nameservers may be given as "host" or "host:port", so a local stub server can be used for testing
+- Simple counters for sent queries, retries, timeouts and cache hits, also exported to metrics
+  together with a query latency histogram
+- Answers, including NXDOMAIN/NODATA, are kept in the shared dnscache for their TTL
+- Large socket receive buffers (configurable), so bursts of answers are not dropped by the kernel
+
+Usage:
+This module is intended to be used by the ReconStudio toolkit via `resolve_all(names, ...)`:
+
+    answers = resolve_all(["www.example.com", "mail.example.com"], concurrency=500)
+    for answer in answers:
+        if answer.addresses:
+            print(answer.name, answer.addresses[0])
+
+Dependencies:
+- asyncio
+- socket
+- struct
+- random
+- dnscache (shared in-process DNS cache)
+
+Limitations:
+- Only A records are queried
+- IPv4 nameservers only
+- Truncated (TC) responses are not retried over TCP
+- The receive buffer is capped by the kernel (net.core.rmem_max on Linux); a clamp is reported
+"""
+
+import asyncio
+import collections
+import random
+import socket
+import struct
+
+import dnscache
+import metrics
+
+DEFAULT_NAMESERVERS = ["8.8.8.8", "1.1.1.1", "9.9.9.9"]
+DEFAULT_CONCURRENCY = 1000
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_RETRIES = 3
+DEFAULT_SOCKETS = 4
+DEFAULT_RECEIVE_BUFFER = 8 << 20  # bytes per UDP socket; the kernel default drops answers in bursts
+
+QTYPE_A = 1
+QTYPE_SOA = 6
+QCLASS_IN = 1
+
+RCODE_NOERROR = 0
+RCODE_FORMERR = 1
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+RCODE_REFUSED = 5
+RCODE_TIMEOUT = -1
+
+Answer = collections.namedtuple("Answer", ["name", "rcode", "addresses", "ttl"])
+
+_settings = {"receive_buffer": DEFAULT_RECEIVE_BUFFER}
+_clamp_reported = set()  # requested sizes already reported as clamped, so it is said once per process
+
+
+def configure(receive_buffer=None):
+    """Change the socket receive buffer size used by resolvers created afterwards (0 = kernel default)."""
+    if receive_buffer is not None:
+        _settings["receive_buffer"] = max(0, int(receive_buffer))
+
+
+def load_nameservers(path="/etc/resolv.conf"):
+    """Read IPv4 nameservers from resolv.conf, falling back to public resolvers."""
+    nameservers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver" and ":" not in parts[1]:
+                    nameservers.append(parts[1])
+    except OSError:
+        pass
+    return nameservers or list(DEFAULT_NAMESERVERS)
+
+
+def parse_nameserver(entry):
+    """Turn 'host' or 'host:port' into a (host, port) address tuple."""
+    if isinstance(entry, tuple):
+        return entry
+    host, _, port = entry.strip().partition(":")
+    return (host, int(port) if port else 53)
+
+
+def encode_name(name):
+    """Encode a domain name into DNS wire format."""
+    wire = b""
+    for label in name.strip().rstrip(".").split("."):
+        try:
+            raw = label.encode("ascii")
+        except UnicodeEncodeError:
+            raw = label.encode("idna")
+        if not raw or len(raw) > 63:
+            raise ValueError(f"Invalid DNS label in {name!r}")
+        wire += bytes([len(raw)]) + raw
+    if len(wire) > 254:
+        raise ValueError(f"DNS name too long: {name!r}")
+    return wire + b"\x00"
+
+
+def build_query(qid, wire, qtype=QTYPE_A):
+    """Build a recursive query packet for an already encoded name."""
+    header = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    return header + wire + struct.pack(">HH", qtype, QCLASS_IN)
+
+
+def _skip_name(data, offset):
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += length + 1
+
+
+def parse_response(data):
+    """Parse a response packet into (qid, rcode, addresses, ttl).
+
+    For answers without addresses (NXDOMAIN or NODATA) ttl is the negative-caching TTL from the
+    authority SOA record, min(SOA TTL, SOA MINIMUM) as in RFC 2308, or None if there is no SOA.
+    """
+    qid, flags, qdcount, ancount, nscount, _ = struct.unpack(">HHHHHH", data[:12])
+    rcode = flags & 0x000F
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+
+    addresses = []
+    ttl = None
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, _, rttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        if rtype == QTYPE_A and rdlength == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+            ttl = rttl if ttl is None else min(ttl, rttl)
+        offset += rdlength
+    if addresses:
+        return qid, rcode, addresses, ttl
+
+    for _ in range(nscount):
+        offset = _skip_name(data, offset)
+        rtype, _, rttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        if rtype == QTYPE_SOA:
+            # MNAME and RNAME, then SERIAL, REFRESH, RETRY, EXPIRE and MINIMUM
+            minimum = struct.unpack(">I", data[offset + rdlength - 4:offset + rdlength])[0]
+            return qid, rcode, addresses, min(rttl, minimum)
+        offset += rdlength
+    return qid, rcode, addresses, None
+
+
+class _DNSSocket(asyncio.DatagramProtocol):
+    """One UDP socket with its own table of outstanding query IDs."""
+
+    def __init__(self):
+        self.transport = None
+        self.pending = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        entry = self.pending.get((data[0] << 8) | data[1])
+        if entry is None:
+            return
+        future, wire = entry
+        # Ignore late or spoofed answers whose question does not match ours
+        if data[12:12 + len(wire)].lower() != wire:
+            return
+        if not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+    def next_id(self):
+        while True:
+            qid = random.getrandbits(16)
+            if qid not in self.pending:
+                return qid
+
+
+def set_receive_buffer(sock, size):
+    """Ask for a size-byte receive buffer on sock; returns the size the kernel reports back."""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    except OSError:
+        pass
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+
+def _expire(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AsyncResolver:
+    """Pipelined A-record resolver multiplexing queries over a few UDP sockets."""
+
+    def __init__(self, nameservers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, sockets=DEFAULT_SOCKETS, cache=dnscache.shared, receive_buffer=None):
+        self.nameservers = [parse_nameserver(ns) for ns in (nameservers or load_nameservers())]
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.retries = retries
+        self.socket_count = max(1, int(sockets))
+        self.cache = cache
+        self.receive_buffer = _settings["receive_buffer"] if receive_buffer is None else receive_buffer
+        self.stats = {"sent": 0, "received": 0, "retries": 0, "timeouts": 0, "cached": 0}
+        self._sockets = []
+        self._semaphore = None
+        self._next_socket = 0
+        self._next_server = 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        granted = None
+        for _ in range(self.socket_count):
+            transport, protocol = await loop.create_datagram_endpoint(_DNSSocket, local_addr=("0.0.0.0", 0))
+            if self.receive_buffer:
+                granted = set_receive_buffer(transport.get_extra_info("socket"), self.receive_buffer)
+            self._sockets.append(protocol)
+        # Linux reports twice the usable size, so only a smaller value means the request was capped
+        if granted is not None and granted < self.receive_buffer and self.receive_buffer not in _clamp_reported:
+            _clamp_reported.add(self.receive_buffer)
+            print(f"[i] DNS socket receive buffer clamped to {granted} bytes (asked for {self.receive_buffer}); "
+                  f"raise net.core.rmem_max if answers are dropped at high concurrency")
+
+    def close(self):
+        for sock in self._sockets:
+            sock.transport.close()
+        self._sockets = []
+        for key, name in (("sent", "dns_queries_sent"), ("retries", "dns_retries"),
+                          ("timeouts", "dns_timeouts"), ("cached", "dns_cache_hits")):
+            metrics.count(name, self.stats[key])
+
+    async def resolve(self, name):
+        """Resolve one name, returning an Answer (addresses is empty on failure)."""
+        if self.cache is not None:
+            cached = self.cache.get(name)
+            if cached is not None:
+                self.stats["cached"] += 1
+                return Answer(*cached)
+        async with self._semaphore:
+            answer = await self._query(name)
+        if self.cache is not None:
+            self.cache.put(*answer)
+        return answer
+
+    async def _query(self, name):
+        try:
+            wire = encode_name(name)
+        except ValueError:
+            return Answer(name, RCODE_FORMERR, [], None)
+
+        loop = asyncio.get_running_loop()
+        match = wire.lower()
+        rcode = RCODE_TIMEOUT
+        for attempt in range(self.retries + 1):
+            sock = self._sockets[self._next_socket % len(self._sockets)]
+            server = self.nameservers[self._next_server % len(self.nameservers)]
+            self._next_socket += 1
+            self._next_server += 1
+
+            qid = sock.next_id()
+            future = loop.create_future()
+            sock.pending[qid] = (future, match)
+            handle = loop.call_later(self.timeout, _expire, future)
+            try:
+                sock.transport.sendto(build_query(qid, wire), server)
+                sent = loop.time()
+                self.stats["sent"] += 1
+                if attempt:
+                    self.stats["retries"] += 1
+                data = await future
+            finally:
+                handle.cancel()
+                sock.pending.pop(qid, None)
+
+            if data is None:
+                self.stats["timeouts"] += 1
+                rcode = RCODE_TIMEOUT
+                continue
+            self.stats["received"] += 1
+            metrics.observe("dns_query_seconds", loop.time() - sent)
+            try:
+                _, rcode, addresses, ttl = parse_response(data)
+            except (struct.error, IndexError):
+                rcode = RCODE_SERVFAIL
+                continue
+            if rcode in (RCODE_SERVFAIL, RCODE_REFUSED):
+                continue
+            return Answer(name, rcode, addresses, ttl)
+
+        return Answer(name, rcode, [], None)
+
+
+async def resolve_stream(names, on_answer, nameservers=None, concurrency=DEFAULT_CONCURRENCY,
+                         timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, sockets=DEFAULT_SOCKETS):
+    """Resolve every name from an iterable, calling on_answer(answer) as each one completes."""
+    iterator = iter(names)
+    async with AsyncResolver(nameservers, concurrency, timeout, retries, sockets) as resolver:
+        async def worker():
+            for name in iterator:
+                on_answer(await resolver.resolve(name))
+
+        await asyncio.gather(*(worker() for _ in range(resolver.concurrency)))
+        return resolver.stats
+
+
+def resolve_all(names, nameservers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                retries=DEFAULT_RETRIES, sockets=DEFAULT_SOCKETS):
+    """Blocking helper: resolve all names and return their Answers in completion order."""
+    answers = []
+    asyncio.run(resolve_stream(names, answers.append, nameservers, concurrency, timeout, retries, sockets))
+    return answers
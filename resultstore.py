@@ -0,0 +1,232 @@
+# resultstore.py
+
+"""
+Module: resultstore.py
+
+Description:
+This module keeps the results of every scan in one indexed SQLite database, so questions
+across all targets ("which targets have hosts on this IP?", "which targets share this
+nameserver?") are answered with an index lookup instead of grepping per-target files.
+main.py records each completed scan here; `main.py query ...` searches it.
+
+Features:
+- Hosts table: target, subdomain, IP, first seen and last seen, indexed on each column
+- WHOIS registrar and name servers per target, indexed for reverse lookups
+- Re-scans update last_seen in place, so the database grows with distinct results, not scans
+- Bulk loads run as one transaction of batched upserts
+- Import of existing JSON reports and scan state files
+- Safe to use from several threads at once (batch mode)
+
+Usage:
+    resultstore.configure(path="data/results.sqlite")
+    resultstore.record_scan("example.com", [{"subdomain": "www.example.com", "ip": "10.0.0.1"}], whois_data)
+    columns, rows = resultstore.query(ip="10.0.0.1")
+    columns, rows = resultstore.query(nameserver="ns1.example.net")
+
+Dependencies:
+- sqlite3
+- json
+- threading
+
+Limitations:
+- Hosts that disappear are kept; filter on last_seen (--since) for current results
+- WHOIS history is not kept, only the latest registrar and name servers per target
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = "data/results.sqlite"
+BATCH_SIZE = 10000  # rows per executemany() call during bulk loads
+DEFAULT_LIMIT = 1000
+CACHE_KIB = 64 * 1024  # SQLite page cache; index pages of bulk loads stay in memory
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS hosts ("
+    " target TEXT NOT NULL, subdomain TEXT NOT NULL, ip TEXT NOT NULL,"
+    " first_seen REAL NOT NULL, last_seen REAL NOT NULL,"
+    " PRIMARY KEY (target, subdomain, ip)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS hosts_subdomain ON hosts (subdomain)",
+    "CREATE INDEX IF NOT EXISTS hosts_ip ON hosts (ip)",
+    "CREATE INDEX IF NOT EXISTS hosts_last_seen ON hosts (last_seen)",
+    "CREATE TABLE IF NOT EXISTS whois ("
+    " target TEXT PRIMARY KEY, registrar TEXT, updated REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS whois_registrar ON whois (registrar)",
+    "CREATE TABLE IF NOT EXISTS nameservers ("
+    " target TEXT NOT NULL, nameserver TEXT NOT NULL,"
+    " PRIMARY KEY (target, nameserver)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS nameservers_nameserver ON nameservers (nameserver)",
+)
+
+_settings = {"path": DEFAULT_PATH}
+_conn = None
+_lock = threading.Lock()
+
+
+def configure(path=None):
+    """Change the database path; it is (re)opened lazily on next use."""
+    global _conn
+    with _lock:
+        if path is not None and path != _settings["path"]:
+            if _conn is not None:
+                _conn.close()
+                _conn = None
+            _settings["path"] = path
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(_settings["path"])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(_settings["path"], check_same_thread=False)
+        # WAL lets `main.py query` read while a batch scan is writing
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        for statement in SCHEMA:
+            _conn.execute(statement)
+        _conn.commit()
+    return _conn
+
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+def _first(value):
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+def _nameservers(value):
+    if not value:
+        return []
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return sorted({str(item).strip().lower().rstrip(".") for item in values if item})
+
+
+def _host_rows(target, subdomains, seen):
+    for entry in subdomains:
+        yield target, entry["subdomain"].lower(), entry["ip"], seen, seen
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def record_scan(target, subdomains=None, whois=None, seen=None):
+    """Store one scan's results; subdomains None or whois empty means that module did not run.
+
+    Returns the number of host rows written.
+    """
+    target = target.lower()
+    seen = time.time() if seen is None else seen
+    written = 0
+    with _lock:
+        conn = _connect()
+        with conn:
+            if subdomains is not None:
+                for batch in _batches(_host_rows(target, subdomains, seen)):
+                    conn.executemany(
+                        "INSERT INTO hosts (target, subdomain, ip, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (target, subdomain, ip) DO UPDATE SET"
+                        " last_seen = MAX(last_seen, excluded.last_seen),"
+                        " first_seen = MIN(first_seen, excluded.first_seen)",
+                        batch
+                    )
+                    written += len(batch)
+            if whois:
+                conn.execute("INSERT OR REPLACE INTO whois (target, registrar, updated) VALUES (?, ?, ?)",
+                             (target, _first(whois.get("registrar")), seen))
+                conn.execute("DELETE FROM nameservers WHERE target = ?", (target,))
+                conn.executemany("INSERT INTO nameservers (target, nameserver) VALUES (?, ?)",
+                                 [(target, nameserver) for nameserver in _nameservers(whois.get("name_servers"))])
+    return written
+
+
+def import_file(path):
+    """Load a JSON report or a scan state file (data/state_<target>.json); returns (target, host rows)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    target = data.get("target")
+    if not target:
+        raise ValueError(f"{path} has no target")
+    subdomains = data.get("subdomains")
+    if subdomains and isinstance(subdomains[0], list):
+        # State files store [name, ip, expires] triples
+        subdomains = [{"subdomain": name, "ip": ip} for name, ip, _ in subdomains]
+    seen = data.get("time") or os.path.getmtime(path)
+    return target, record_scan(target, subdomains, data.get("whois"), seen)
+
+
+def query(ip=None, subdomain=None, target=None, nameserver=None, registrar=None, since=None, limit=DEFAULT_LIMIT):
+    """Search the store; returns (column names, rows).
+
+    Host filters (ip, subdomain, since) return host rows. With only target-level filters
+    (nameserver, registrar) the matching targets are returned with their WHOIS data; a target
+    filter alone lists the target's hosts.
+    """
+    target_filters = []
+    params = []
+    if nameserver:
+        target_filters.append("target IN (SELECT target FROM nameservers WHERE nameserver = ?)")
+        params.append(nameserver.lower().rstrip("."))
+    if registrar:
+        target_filters.append("target IN (SELECT target FROM whois WHERE registrar = ?)")
+        params.append(registrar)
+    if target:
+        target_filters.append("target = ?")
+        params.append(target.lower())
+
+    if ip or subdomain or since or not (nameserver or registrar):
+        filters = list(target_filters)
+        if ip:
+            filters.append("ip = ?")
+            params.append(ip)
+        if subdomain:
+            filters.append("subdomain = ?")
+            params.append(subdomain.lower().rstrip("."))
+        if since:
+            filters.append("last_seen >= ?")
+            params.append(since)
+        columns = ["target", "subdomain", "ip", "first_seen", "last_seen"]
+        sql = f"SELECT {', '.join(columns)} FROM hosts"
+    else:
+        filters = target_filters
+        columns = ["target", "registrar", "nameservers", "updated"]
+        sql = ("SELECT target, registrar,"
+               " (SELECT group_concat(nameserver, ',') FROM nameservers n WHERE n.target = whois.target),"
+               " updated FROM whois")
+    if filters:
+        sql += " WHERE " + " AND ".join(filters)
+    sql += " LIMIT ?"
+    params.append(limit)
+
+    with _lock:
+        rows = _connect().execute(sql, params).fetchall()
+    return columns, rows
+
+
+def counts():
+    """Row counts per table."""
+    with _lock:
+        conn = _connect()
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("hosts", "whois", "nameservers")}
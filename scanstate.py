@@ -0,0 +1,139 @@
+# scanstate.py
+
+"""
+Module: scanstate.py
+
+Description:
+This module lets ReconStudio re-scan a target incrementally. After every scan the results are
+saved as the target's state in data/state_<target>.json: each resolved subdomain with its
+address and the time its DNS answer expires, plus the WHOIS record. `main.py --incremental`
+loads that state before scanning, so:
+
+- answers that are still fresh go back into the DNS cache and are not queried again; only
+  names whose answer has gone stale are re-resolved
+- the previous names are checked again as their own source, so names that disappeared
+  upstream are noticed
+- permutations are only generated for names that are new since the previous scan
+- the report is a delta against the previous scan: added and removed subdomains, subdomains
+  whose address changed, and WHOIS fields that changed
+
+Features:
+- One state file per target, written atomically after every completed scan
+- Modules that did not run, failed or missed their deadline keep their previous state
+- Delta sections render in every report format (they are plain lists of records)
+
+Usage:
+    previous = scanstate.load_state(scanstate.state_path(target))
+    scanstate.seed_dns_cache(previous)
+    ... scan ...
+    delta = scanstate.diff(previous, data)
+    scanstate.save_state(scanstate.state_path(target), data, previous)
+
+Dependencies:
+- dnscache
+- json
+- time
+
+Limitations:
+- A previous name whose lookup times out is reported as removed
+- Brute-force wordlists and theHarvester still run in full; their cost does not depend on the
+  previous scan
+- WHOIS records are re-fetched only when their cache entry has expired (see cache.py TTLs)
+"""
+
+import json
+import os
+import time
+
+import dnscache
+
+
+def state_path(target, directory="data"):
+    return os.path.join(directory, f"state_{target}.json")
+
+
+def load_state(path):
+    """Read a saved state into {"time", "subdomains": {name: (ip, expires)}, "whois"}, or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        print(f"[!] Ignoring unreadable scan state: {path}")
+        return None
+    return {
+        "time": saved.get("time"),
+        "subdomains": {name: (ip, expires) for name, ip, expires in saved.get("subdomains", [])},
+        "whois": saved.get("whois") or {},
+    }
+
+
+def save_state(path, data, previous=None, cache=dnscache.shared):
+    """Save this scan's subdomains and WHOIS record, keeping previous values for modules that did not run.
+
+    data["subdomains"] / data["whois"] set to None mean the module did not run or did not complete.
+    """
+    now = time.time()
+    if data.get("subdomains") is not None:
+        # Answers no longer in the cache (evicted, or resolved in another process) count as stale
+        subdomains = [[entry["subdomain"], entry["ip"], cache.expires(entry["subdomain"]) or now]
+                      for entry in data["subdomains"]]
+    else:
+        subdomains = [[name, ip, expires] for name, (ip, expires) in (previous or {}).get("subdomains", {}).items()]
+    whois = data.get("whois")
+    if not whois:  # not run, or the lookup failed
+        whois = (previous or {}).get("whois", {})
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"target": data.get("target"), "time": now, "subdomains": subdomains, "whois": whois},
+                  f, default=str)
+    os.replace(path + ".tmp", path)
+    return len(subdomains)
+
+
+def seed_dns_cache(state, cache=dnscache.shared):
+    """Put the still-fresh answers of a previous scan into the DNS cache; returns how many."""
+    now = time.time()
+    seeded = 0
+    for name, (ip, expires) in state["subdomains"].items():
+        if expires > now and cache.put(name, 0, [ip], expires - now):
+            seeded += 1
+    return seeded
+
+
+def _changed_fields(old, new):
+    return [
+        {"field": field, "old": old.get(field), "new": new.get(field)}
+        for field in sorted(set(old) | set(new))
+        if str(old.get(field)) != str(new.get(field))
+    ]
+
+
+def diff(previous, data):
+    """Delta between a previous state and this scan's data.
+
+    Returns {"since", "added", "removed", "changed", "whois_changes"}. Sections for modules that
+    did not run (data value None) or whose previous result is unknown are left empty.
+    """
+    delta = {"since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(previous["time"] or 0)),
+             "added": [], "removed": [], "changed": [], "whois_changes": []}
+
+    if data.get("subdomains") is not None:
+        old = previous["subdomains"]
+        current = set()
+        for entry in data["subdomains"]:
+            name = entry["subdomain"]
+            current.add(name)
+            if name not in old:
+                delta["added"].append({"subdomain": name, "ip": entry["ip"]})
+            elif old[name][0] != entry["ip"]:
+                delta["changed"].append({"subdomain": name, "old_ip": old[name][0], "new_ip": entry["ip"]})
+        delta["removed"] = [{"subdomain": name, "ip": ip} for name, (ip, _) in old.items() if name not in current]
+
+    if data.get("whois") and previous["whois"]:
+        delta["whois_changes"] = _changed_fields(previous["whois"], data["whois"])
+    return delta
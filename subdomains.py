@@ -6,102 +6,542 @@ Module: subdomains.py
 Description:
 This module performs deep subdomain enumeration for a given target domain using three different techniques:
 
-1. DNS brute-force with a predefined wordlist.
-2. Certificate transparency scraping via crt.sh.
+1. DNS brute-force with a predefined wordlist, or a streamed wordlist file of any size, plus
+   optional permutations of the names found (see candidates.py).
+2. Certificate transparency scraping via crt.sh (streamed, so huge responses use bounded memory).
 3. Passive enumeration using the hackertarget.com API.
 
+Passive sources are pluggable providers (see providers.py) and are all queried at the same time.
+
 Each discovered subdomain is validated with an A record DNS lookup to confirm its existence.
+Zones with wildcard DNS are detected with random-label probes (see wildcard.py): brute-force
+guesses under a wildcard zone are skipped, and names that only resolve to the wildcard's
+addresses are not reported.
+The sources run as producers feeding a bounded resolution queue, so names are resolved as soon
+as they are discovered, while slower sources are still running. Lookups go through the
+asynchronous resolver in resolver.py, which keeps many queries in flight at once and spreads
+them across the configured nameservers.
 
 Outputs:
-- Prints all discovered and resolved subdomains to the console.
+- Prints resolved subdomains to the console as soon as they resolve.
+- Optionally calls `on_result(entry)` for each resolved subdomain as it arrives.
 - Saves results to a TXT file in the 'data/' directory.
 - Displays a summary including total findings and script runtime.
 
 Usage:
 This module is intended to be imported and used via the ReconStudio toolkit.
 To run manually for testing, wrap the call to `get_subdomains(domain)` in a main block.
+Async callers can consume results incrementally with `async for entry in stream_subdomains(domain)`.
+With `workers=N` a wordlist file is split into N line-aligned shards, each brute-forced by its
+own process with its own resolver loop, and the results are merged and deduplicated here.
+For incremental re-scans, `previous=names` checks the names of the previous scan again as
+their own source; they are not used as permutation seeds (see scanstate.py).
+Pass `stop=threading.Event()` to be able to abandon a running enumeration from another thread:
+once it is set, get_subdomains() cancels the resolvers and worker processes, ignores late
+results and raises EnumerationStopped.
 
 Dependencies:
-- requests
-- socket
+- resolver (ReconStudio async DNS resolver)
+- providers (passive subdomain sources)
+- cache (persistent provider response cache)
+- dnscache (in-process DNS answer cache, used through resolver)
+- wildcard (wildcard DNS detection)
+- nametrie (compact reversed-label name store)
+- candidates (streamed wordlists and permutations)
+- asyncio
+- multiprocessing
+- metrics (source timing spans and name counts)
 - time
 - os
-- json
-- urllib.parse.quote
 
 Limitations:
-- Currently only resolves A records.
-- Uses a static wordlist; future updates may include dynamic input.
-- Public APIs may rate-limit frequent queries.
+- Currently only resolves A records (IPv4 nameservers only).
+- Public APIs may rate-limit frequent queries; responses are cached on disk to limit repeats.
 
 """
 
-import socket
+import asyncio
+import collections
+import concurrent.futures
+import multiprocessing
 import os
-import requests
-import json
+import queue
+import threading
 import time
-from urllib.parse import quote
 
-def get_subdomains(domain):
-    os.makedirs("data", exist_ok=True)
-    print(f"[*] Enumerating subdomains for: {domain}")
-    start_time = time.time()
+import cache
+import candidates
+import metrics
+import providers
+import nametrie
+import resolver
+import wildcard
+
+QUEUE_SIZE = 10000  # names waiting for resolution before producers block
+BATCH_SIZE = 100  # names handed to the queue per producer put
+BATCH_DELAY = 0.25  # seconds a partial batch may wait before it is flushed
+STOP_POLL = 0.5  # seconds between cancellation checks while a producer waits on a full queue
+CHECKPOINT_INTERVAL = 1.0  # seconds between checkpoints of a source while some of its names are in flight
+
+# Sources that guess names rather than observe them; under a wildcard zone their guesses are
+# indistinguishable from the wildcard, so they are dropped before resolution
+GUESSING_SOURCES = {"brute-force", "permutations"}
+PREVIOUS_SOURCE = "previous scan"  # names from the last scan, re-checked but not permuted again
+
+WORDLIST = ["www", "mail", "ftp", "admin", "test", "dev", "vpn", "api", "cpanel"]
 
-    found = set()
-
-    # 1. DNS brute-force
-    print("[*] Running DNS brute-force...")
-    wordlist = ["www", "mail", "ftp", "admin", "test", "dev", "vpn", "api", "cpanel"]
-    for sub in wordlist:
-        subdomain = f"{sub}.{domain}"
-        try:
-            ip = socket.gethostbyname(subdomain)
-            print(f"[+] Found via brute-force: {subdomain} -> {ip}")
-            found.add(subdomain)
-        except socket.gaierror:
-            continue
-
-    # 2. crt.sh scraping
-    print("[*] Querying crt.sh...")
+class EnumerationStopped(Exception):
+    """Raised by get_subdomains() when its stop event is set before enumeration finishes."""
+
+
+async def _until_stopped(coro, stop):
+    """Await coro, cancelling it once the threading.Event stop is set."""
+    if stop is None:
+        return await coro
+    task = asyncio.ensure_future(coro)
     try:
-        url = f"https://crt.sh/?q=%25.{quote(domain)}&output=json"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            entries = response.json()
-            for entry in entries:
-                name_value = entry.get("name_value")
-                if name_value:
-                    for item in name_value.split("\n"):
-                        if domain in item:
-                            found.add(item.strip())
+        while not task.done():
+            await asyncio.wait({task}, timeout=STOP_POLL)
+            if stop.is_set() and not task.done():
+                raise EnumerationStopped("subdomain enumeration stopped")
+        return task.result()
+    finally:
+        if not task.done():
+            # Wait for the cancellation, so producers and sockets are released before the loop closes
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class BruteForceSource:
+    """Wordlist names under the domain. `position` is the wordlist offset reached, if it has one.
+
+    pending are full names left unresolved by an interrupted run; they come first.
+    """
+
+    def __init__(self, domain, wordlist, pending=()):
+        self.domain = domain
+        self.wordlist = wordlist
+        self.pending = pending
+
+    def __iter__(self):
+        yield from self.pending
+        for sub in self.wordlist:
+            yield f"{sub}.{self.domain}"
+
+    @property
+    def position(self):
+        return getattr(self.wordlist, "offset", None)
+
+def brute_force_source(domain, wordlist=WORDLIST, pending=()):
+    return BruteForceSource(domain, wordlist, pending)
+
+def default_sources(domain, provider_names=None, wordlist=None, wordlist_offset=0, pending=()):
+    """The (label, generator) pairs enumerated by get_subdomains: brute-force plus passive providers.
+
+    wordlist is the path of a wordlist file to stream instead of the built-in WORDLIST, read
+    from byte wordlist_offset on (to resume an interrupted scan, after the pending names).
+    """
+    words = candidates.Wordlist(wordlist, wordlist_offset) if wordlist else WORDLIST
+    return [("brute-force", brute_force_source(domain, words, pending))] + passive_sources(domain, provider_names)
+
+def passive_sources(domain, provider_names=None):
+    """(label, generator) pairs for the enabled passive providers."""
+    return [(provider.label, provider.iter_names(domain)) for provider in providers.enabled_providers(provider_names)]
+
+def _produce(label, source, queue, loop, stop):
+    """Run one blocking source in a worker thread, pushing batches into the asyncio queue.
+
+    Blocks whenever the queue is full, which is the backpressure on fast sources. A failing
+    source only ends its own stream, and the stop event ends it when the enumeration is
+    cancelled. Sources with a `position` (file wordlists) send it with every batch, so progress
+    can be checkpointed. Returns the source's timing and name count.
+    """
+    def put(batch):
+        if stop.is_set():
+            return False
+        item = (label, batch, getattr(source, "position", None))
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=STOP_POLL)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+            except concurrent.futures.CancelledError:
+                return False
+
+    print(f"[*] Querying {label}...")
+    stats = {"names": 0, "status": "ok"}
+    wall_started = time.time()
+    started = time.monotonic()
+    batch = []
+    flushed = started
+    try:
+        for name in source:
+            batch.append(name)
+            stats["names"] += 1
+            if len(batch) >= BATCH_SIZE or time.monotonic() - flushed >= BATCH_DELAY:
+                if not put(batch):
+                    stats["status"] = "cancelled"
+                    break
+                batch = []
+                flushed = time.monotonic()
+    except cache.CacheMiss:
+        print(f"[i] {label} response not cached, skipping (cache-only mode)")
+        stats["status"] = "not cached"
+    except providers.ProviderTimeout as e:
+        print(f"[!] {label} stopped: {e}")
+        stats["status"] = "timeout"
     except Exception as e:
-        print(f"[!] crt.sh failed: {e}")
+        print(f"[!] {label} failed: {e}")
+        stats["status"] = f"failed: {e}"
+    if batch:
+        put(batch)
+    seconds = time.monotonic() - started
+    metrics.record_span("source", wall_started, seconds, source=label)
+    metrics.count("source_names", stats["names"], source=label, status=stats["status"].split(":")[0])
+    stats["seconds"] = round(seconds, 2)
+    return stats
+
+async def enumerate_subdomains(domain, on_result, dns_concurrency=resolver.DEFAULT_CONCURRENCY,
+                               nameservers=None, sources=None, queue_size=QUEUE_SIZE, permute=False,
+                               known=(), on_checkpoint=None, exclude_seeds=()):
+    """Resolve names from all sources as they are produced, calling on_result(entry, label) per hit.
+
+    All sources run at the same time. With permute, permutations of the resolved names are
+    resolved afterwards as a second pass. Names that only resolve to their zone's wildcard
+    addresses are not reported. Returns {"checked": unique names, "sources": {label: stats},
+    "dns": resolver stats, "wildcards": {zone: addresses}, "wildcard_dropped": names pruned or
+    filtered, "seconds": runtime}.
+
+    Names in known (resolved by an earlier, interrupted run) are not resolved again. Names in
+    exclude_seeds (a set) are not used as permutation seeds, whichever source reports them. For
+    sources with a position, on_checkpoint(label, position, pending) is called as progress is
+    made: every name produced before position has been resolved and reported, except the names
+    in pending, which were still being resolved. A name stuck in retransmissions therefore does
+    not hold the position back; it is carried in pending until it settles.
+    """
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    batches = asyncio.Queue(maxsize=max(1, queue_size // BATCH_SIZE))
+    names = asyncio.Queue(maxsize=queue_size)
+    seen = nametrie.NameTrie(domain)
+    dropped = [0]
+    resolved = []
+    for name in known:
+        if seen.add(name) and name not in exclude_seeds:
+            resolved.append(name)
+    # label -> [[names not yet taken by a consumer, position, passed], ...] for batches, in order,
+    # until all of their names are taken; the frontier is the position of the last such batch
+    marks = collections.defaultdict(collections.deque)
+    in_flight = collections.defaultdict(dict)  # label -> {name: mark} for names being resolved
+    frontier = {}
+    checkpointed = {}  # label -> time of its last checkpoint
+    changed = set()  # labels with progress not checkpointed yet
+
+    def checkpoint(label):
+        if label not in changed or not on_checkpoint:
+            return
+        names_in_flight = in_flight[label]
+        now = time.monotonic()
+        if names_in_flight and now - checkpointed.get(label, 0.0) < CHECKPOINT_INTERVAL:
+            return
+        changed.discard(label)
+        checkpointed[label] = now
+        on_checkpoint(label, frontier[label], [name for name, mark in names_in_flight.items() if mark[2]])
 
-    # 3. hackertarget API
-    print("[*] Querying hackertarget.com API...")
+    def release(label, mark):
+        mark[0] -= 1
+        if mark[0]:
+            return
+        pending = marks[label]
+        while pending and pending[0][0] == 0:
+            passed = pending.popleft()
+            passed[2] = True
+            frontier[label] = passed[1]
+            changed.add(label)
+        checkpoint(label)
+
+    def settle(label, name, mark):
+        del in_flight[label][name]
+        if mark[2]:
+            changed.add(label)
+        checkpoint(label)
+
+    async with resolver.AsyncResolver(nameservers, dns_concurrency) as dns:
+        wildcards = wildcard.WildcardDetector(dns)
+        if await wildcards.is_wildcard(domain):
+            print(f"[!] Wildcard DNS detected: *.{domain} -> {', '.join(sorted(await wildcards.fingerprint(domain)))}")
+
+        async def dispatch():
+            while True:
+                item = await batches.get()
+                if item is None:
+                    return
+                label, batch, position = item
+                # The extra count keeps the batch open until all of its names are queued
+                mark = [1, position, False] if position is not None else None
+                if mark:
+                    marks[label].append(mark)
+                for name in batch:
+                    if not name or name in seen:
+                        continue
+                    # Pruned guesses are not marked seen, so a passive source can still report them
+                    if label in GUESSING_SOURCES and await wildcards.is_wildcard(wildcard.parent_zone(name)):
+                        dropped[0] += 1
+                        continue
+                    if not seen.add(name):
+                        continue  # out of scope
+                    if mark:
+                        mark[0] += 1
+                    await names.put((label, name, mark))
+                if mark:
+                    release(label, mark)
+
+        async def consume():
+            while True:
+                item = await names.get()
+                if item is None:
+                    return
+                label, name, mark = item
+                if mark:
+                    in_flight[label][name] = mark
+                    release(label, mark)
+                answer = await dns.resolve(name)
+                if name != domain and await wildcards.matches(name, answer.addresses):
+                    dropped[0] += 1
+                elif answer.addresses:
+                    if name not in exclude_seeds:
+                        resolved.append(name)
+                    on_result({"subdomain": name, "ip": answer.addresses[0]}, label)
+                if mark:
+                    settle(label, name, mark)
+
+        async def run(sources):
+            stop = threading.Event()
+            dispatcher = asyncio.create_task(dispatch())
+            consumers = [asyncio.create_task(consume()) for _ in range(dns.concurrency)]
+            try:
+                producers = [
+                    loop.run_in_executor(None, _produce, label, source, batches, loop, stop)
+                    for label, source in sources
+                ]
+                source_stats = await asyncio.gather(*producers)
+                await batches.put(None)
+                await dispatcher
+                for _ in consumers:
+                    await names.put(None)
+                await asyncio.gather(*consumers)
+            finally:
+                # If we were cancelled, release producer threads blocked on a full queue and
+                # stop the workers before the resolver's sockets are closed
+                stop.set()
+                for task in [dispatcher] + consumers:
+                    task.cancel()
+            return dict(zip((label for label, _ in sources), source_stats))
+
+        source_stats = await run(default_sources(domain) if sources is None else sources)
+        if permute and resolved:
+            source_stats.update(await run([("permutations", candidates.permutations(list(resolved), domain))]))
+
+    return {
+        "checked": len(seen),
+        "seconds": time.monotonic() - started,
+        "sources": source_stats,
+        "dns": dns.stats,
+        "wildcards": wildcards.wildcards(),
+        "wildcard_dropped": dropped[0]
+    }
+
+async def stream_subdomains(domain, dns_concurrency=resolver.DEFAULT_CONCURRENCY, nameservers=None, sources=None):
+    """Async iterator over resolved {"subdomain", "ip"} entries in discovery order."""
+    results = asyncio.Queue()
+    task = asyncio.create_task(enumerate_subdomains(
+        domain, lambda entry, label: results.put_nowait(entry), dns_concurrency, nameservers, sources
+    ))
+    task.add_done_callback(lambda _: results.put_nowait(None))
+    try:
+        while True:
+            entry = await results.get()
+            if entry is None:
+                break
+            yield entry
+        await task
+    finally:
+        task.cancel()
+
+def _shard_worker(domain, wordlist, start, end, label, dns_concurrency, nameservers, messages, pending=()):
+    """Process entry point: brute-force one wordlist shard, sending results back over messages."""
+    source = brute_force_source(domain, candidates.Wordlist(wordlist, start, end), pending)
     try:
-        url = f"https://api.hackertarget.com/hostsearch/?q={domain}"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            lines = response.text.strip().splitlines()
-            for line in lines:
-                parts = line.split(",")
-                if len(parts) == 2:
-                    found.add(parts[0].strip())
+        stats = asyncio.run(enumerate_subdomains(
+            domain, lambda entry, _: messages.put(("result", label, entry)), dns_concurrency, nameservers,
+            [(label, source)],
+            on_checkpoint=lambda _, position, names: messages.put(("checkpoint", label, (position, names)))
+        ))
     except Exception as e:
-        print(f"[!] hackertarget API failed: {e}")
-
-    # Final resolution
-    print("[*] Resolving found subdomains...")
-    results = []
-    for sub in sorted(found):
-        try:
-            ip = socket.gethostbyname(sub)
-            print(f"[✓] {sub} -> {ip}")
-            results.append({"subdomain": sub, "ip": ip})
-        except socket.gaierror:
-            continue
+        stats = {"error": str(e)}
+    stats["metrics"] = metrics.snapshot()
+    messages.put(("done", label, stats))
+
+def _merge_stats(stats, shard, label):
+    if "metrics" in shard:
+        metrics.merge(shard.pop("metrics"))
+    if "error" in shard:
+        stats["sources"][label] = {"names": 0, "status": f"failed: {shard['error']}", "seconds": 0}
+        return
+    stats["checked"] += shard["checked"]
+    stats["sources"].update(shard["sources"])
+    for key, value in shard["dns"].items():
+        stats["dns"][key] = stats["dns"].get(key, 0) + value
+    stats["wildcards"].update(shard["wildcards"])
+    stats["wildcard_dropped"] += shard["wildcard_dropped"]
+
+def enumerate_sharded(domain, on_result, dns_concurrency, nameservers, wordlist, workers, sources=(),
+                      positions=None, known=(), on_checkpoint=None, stop=None, pending=None):
+    """Brute-force a wordlist split across worker processes while this process runs the other sources.
+
+    Each worker resolves one line-aligned byte range of the wordlist with its own event loop and
+    resolver. Results, checkpoints and stats come back over a queue and are merged here;
+    on_result may see a name twice if a worker and a passive source both find it. Shard labels
+    are "brute-force i/N", positions maps them to the offsets to resume from and pending to the
+    names an interrupted run left unresolved before those offsets. Setting stop
+    terminates the workers and raises EnumerationStopped. Returns stats like enumerate_subdomains().
+    """
+    started = time.monotonic()
+    positions = positions or {}
+    pending = pending or {}
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    shards = []
+    for index, (start, end) in enumerate(candidates.shard_offsets(wordlist, workers)):
+        label = f"brute-force {index + 1}/{workers}"
+        start = min(end, max(start, positions.get(label, start)))
+        shards.append((label, context.Process(
+            target=_shard_worker, daemon=True,
+            args=(domain, wordlist, start, end, label, dns_concurrency, nameservers, messages, pending.get(label, []))
+        )))
+    shard_stats = {}
+
+    def drain():
+        processes = [process for _, process in shards]
+        while len(shard_stats) < len(shards):
+            try:
+                kind, label, payload = messages.get(timeout=STOP_POLL)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    return  # a worker died without reporting
+                continue
+            if kind == "result":
+                on_result(payload, label)
+            elif kind == "checkpoint":
+                if on_checkpoint:
+                    on_checkpoint(label, *payload)
+            else:
+                shard_stats[label] = payload
+
+    for _, process in shards:
+        process.start()
+    reader = threading.Thread(target=drain, name="shards", daemon=True)
+    reader.start()
+    try:
+        stats = asyncio.run(_until_stopped(enumerate_subdomains(
+            domain, on_result, dns_concurrency, nameservers, list(sources), known=known
+        ), stop))
+        while reader.is_alive():
+            reader.join(STOP_POLL)
+            if stop is not None and stop.is_set():
+                raise EnumerationStopped("subdomain enumeration stopped")
+    finally:
+        for _, process in shards:
+            if process.is_alive():
+                process.terminate()
+
+    for label, _ in shards:
+        _merge_stats(stats, shard_stats.get(label, {"error": "worker exited"}), label)
+    stats["seconds"] = time.monotonic() - started
+    return stats
+
+def get_subdomains(domain, dns_concurrency=resolver.DEFAULT_CONCURRENCY, nameservers=None, on_result=None,
+                   provider_names=None, wordlist=None, permute=False, resume=None, on_checkpoint=None,
+                   workers=1, previous=None, stop=None):
+    """Enumerate and resolve subdomains, returning [{"subdomain", "ip"}, ...] in zone order.
+
+    resume is {"subdomains": entries, "positions": {label: offset}, "pending": {label: names}}
+    from an interrupted run's journal; on_checkpoint(label, position, pending) is called as
+    wordlist progress is made (see enumerate_subdomains). With
+    workers > 1 a wordlist file is brute-forced by that many processes (see enumerate_sharded).
+    previous is a list of names found by the last scan, re-checked for an incremental re-scan.
+    stop is an optional threading.Event; setting it abandons the scan with EnumerationStopped.
+    """
+    os.makedirs("data", exist_ok=True)
+    print(f"[*] Enumerating subdomains for: {domain}")
+    start_time = time.time()
+
+    resume = resume or {}
+    found = nametrie.NameTrie(domain)
+    for entry in resume.get("subdomains", []):
+        found.add(entry["subdomain"], entry["ip"])
+    if resume:
+        print(f"[i] Resuming with {len(found)} subdomains already resolved")
+    first_result = []
+    positions = resume.get("positions", {})
+    pending = resume.get("pending", {})
+    lock = threading.Lock()
+    rechecked = [(PREVIOUS_SOURCE, iter(previous))] if previous else []
+    # Names of the last scan are never permutation seeds, whichever source reports them first
+    old = set(previous or ())
+
+    if on_checkpoint and stop is not None:
+        report_checkpoint = on_checkpoint
+
+        def on_checkpoint(label, position, names):
+            if not stop.is_set():
+                report_checkpoint(label, position, names)
+
+    def collect(entry, label):
+        # Called from the event loop and, with workers, from the shard reader thread
+        with lock:
+            # Results that arrive after the scan was abandoned are not reported
+            if stop is not None and stop.is_set():
+                return
+            if not found.add(entry["subdomain"], entry["ip"]):
+                return
+            if not first_result:
+                first_result.append(time.time() - start_time)
+            print(f"[✓] {entry['subdomain']} -> {entry['ip']} ({label})")
+            if on_result:
+                on_result(entry)
+
+    if workers > 1 and wordlist:
+        print(f"[*] Brute-forcing {wordlist} with {workers} worker processes")
+        stats = enumerate_sharded(
+            domain, collect, dns_concurrency, nameservers, wordlist, workers,
+            passive_sources(domain, provider_names) + rechecked, positions, list(found), on_checkpoint, stop,
+            pending
+        )
+        if permute and len(found):
+            # Permutations are seeded from every new result, so they run once all shards are merged
+            seeds = list(found)
+            permuted = asyncio.run(_until_stopped(enumerate_subdomains(
+                domain, collect, dns_concurrency, nameservers,
+                [("permutations", candidates.permutations([name for name in seeds if name not in old], domain))],
+                known=seeds
+            ), stop))
+            stats["checked"] += permuted["checked"] - len(seeds)
+            stats["seconds"] += permuted["seconds"]
+            stats["sources"].update(permuted["sources"])
+    else:
+        stats = asyncio.run(_until_stopped(enumerate_subdomains(
+            domain, collect, dns_concurrency, nameservers,
+            default_sources(domain, provider_names, wordlist, positions.get("brute-force", 0),
+                            pending.get("brute-force", [])) + rechecked,
+            permute=permute, known=list(found), on_checkpoint=on_checkpoint, exclude_seeds=old
+        ), stop))
+    # Ordered zone by zone straight from the trie, no sort of the full result set
+    results = [{"subdomain": name, "ip": ip} for name, ip in found.items()]
 
     # Save to TXT file
     txt_path = f"data/subdomains_{domain}.txt"
@@ -112,8 +552,21 @@ def get_subdomains(domain):
 
     # Summary
     print("\n--- Subdomain Summary ---")
-    print(f"  Total found: {len(found)}")
+    print(f"  Total found: {stats['checked']} ({round(stats['checked'] / max(stats['seconds'], 0.001))} candidates/s)")
     print(f"  Resolved to IP: {len(results)}")
+    if first_result:
+        print(f"  First result after: {round(first_result[0], 2)} seconds")
     print(f"  Runtime: {round(time.time() - start_time, 2)} seconds")
+    print(f"  DNS queries sent: {stats['dns']['sent']} (cache hits: {stats['dns']['cached']})")
+    for zone, addresses in stats["wildcards"].items():
+        print(f"  Wildcard zone: *.{zone} -> {', '.join(addresses)}")
+    zones = sorted(found.zone_counts().items(), key=lambda item: -item[1])
+    if any(count > 1 for _, count in zones):
+        print("  Largest zones: " + ", ".join(f"{zone} ({count})" for zone, count in zones[:5]))
+    if stats["wildcard_dropped"]:
+        print(f"  Wildcard matches dropped: {stats['wildcard_dropped']}")
+    for label, source in stats["sources"].items():
+        rate = round(source['names'] / max(source['seconds'], 0.001))
+        print(f"    {label}: {source['names']} names in {source['seconds']}s, {rate}/s ({source['status']})")
 
-    return results
\ No newline at end of file
+    return results
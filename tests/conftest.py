@@ -0,0 +1,29 @@
+# conftest.py
+
+"""
+Shared pytest setup: makes the toolkit modules and the benchmark stubs (local DNS, HTTP, WHOIS
+servers and a fake theHarvester) importable from the tests, and runs every test in its own
+working directory, since the modules write their output and caches under ./data.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+def pytest_configure(config):
+    # Some modules create data/ when they are imported, during collection
+    os.chdir(tempfile.mkdtemp(prefix="reconstudio-tests-"))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    return tmp_path
@@ -0,0 +1,128 @@
+# test_httpprobe.py
+
+import asyncio
+import collections
+import socket
+
+import httpprobe
+
+PAGE = b"<html><head><title>Hello &amp; welcome</title></head><body>ok</body></html>"
+
+
+class Server:
+    """Local HTTP/1.1 server on 127.0.0.1 and 127.0.0.2; the Host header picks the behaviour."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = collections.Counter()  # local address -> requests being answered
+        self.peak = collections.Counter()
+        self.peak_total = 0
+        self.connections = 0
+
+    async def __aenter__(self):
+        first = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = first.sockets[0].getsockname()[1]
+        self.servers = [first, await asyncio.start_server(self.handle, "127.0.0.2", self.port)]
+        return self
+
+    async def __aexit__(self, *exc):
+        for server in self.servers:
+            server.close()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        local = writer.get_extra_info("sockname")[0]
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+                host = next(line.split(":", 1)[1].strip() for line in head.split("\r\n")
+                            if line.lower().startswith("host:")).split(":")[0]
+                self.active[local] += 1
+                self.peak[local] = max(self.peak[local], self.active[local])
+                self.peak_total = max(self.peak_total, sum(self.active.values()))
+                try:
+                    await asyncio.sleep(self.delay)
+                    if host == "slow.test":
+                        await asyncio.sleep(5)
+                    if host == "garbage.test":
+                        writer.write(b"SSH-2.0-OpenSSH_9.6\r\n\r\n")
+                    elif host == "moved.test":
+                        writer.write(b"HTTP/1.1 301 Moved Permanently\r\nLocation: /login?next=1\r\n"
+                                     b"Content-Length: 0\r\n\r\n")
+                    else:
+                        writer.write(b"HTTP/1.1 200 OK\r\nServer: stub/1.0\r\nContent-Type: text/html\r\n"
+                                     b"Content-Length: %d\r\n\r\n%s" % (len(PAGE), PAGE))
+                    await writer.drain()
+                finally:
+                    self.active[local] -= 1
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def probe(host, ip="127.0.0.1", timeout=2, port=None, delay=0.0):
+    async def run():
+        async with Server(delay) as server, httpprobe.HTTPProber(timeout=timeout) as prober:
+            return await prober.probe(host, ip, port or server.port, "http")
+    return asyncio.run(run())
+
+
+def test_page_is_summarised():
+    result = probe("www.test")
+    assert result["error"] is None
+    assert result["status"] == 200
+    assert result["title"] == "Hello & welcome"
+    assert result["server"] == "stub/1.0"
+    assert result["redirect"] is None
+
+
+def test_redirect_is_reported_as_absolute_url():
+    result = probe("moved.test")
+    assert result["status"] == 301
+    assert result["redirect"] == f"http://moved.test:{result['port']}/login?next=1"
+
+
+def test_slow_server_is_a_timeout():
+    result = probe("slow.test", timeout=0.3)
+    assert result["error"] == "timeout"
+    assert result["status"] is None
+
+
+def test_non_http_answer_is_an_error():
+    result = probe("garbage.test")
+    assert result["status"] is None
+    assert result["error"].startswith("not an HTTP response")
+
+
+def test_closed_port_is_an_error():
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    port = closed.getsockname()[1]
+    closed.close()
+    result = probe("www.test", port=port)
+    assert result["status"] is None
+    assert result["error"]
+
+
+def test_per_host_limit_leaves_global_slots_for_other_ips():
+    entries = ([{"subdomain": f"a{i}.test", "ip": "127.0.0.1"} for i in range(40)]
+               + [{"subdomain": f"b{i}.test", "ip": "127.0.0.2"} for i in range(10)])
+    results = []
+
+    async def run():
+        async with Server(delay=0.02) as server:
+            stats = await httpprobe.probe_hosts(entries, results.append, [(server.port, "http")],
+                                                concurrency=5, per_host=3)
+            return server, stats
+
+    server, stats = asyncio.run(run())
+    assert len(results) == 50 and not [result for result in results if result["error"]]
+    assert stats["requests"] == 50
+    assert server.peak["127.0.0.1"] <= 3 and server.peak["127.0.0.2"] <= 3
+    # The busy IP never holds every global slot: the second IP is served alongside its backlog
+    assert server.peak_total > 3
+    order = [result["ip"] for result in results]
+    assert len(order) - order[::-1].index("127.0.0.2") <= 25
+    # Keep-alive: the per-IP pools reuse connections instead of opening one per request
+    assert stats["reused"] > 0 and server.connections < 50
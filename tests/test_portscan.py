@@ -0,0 +1,29 @@
+# test_portscan.py
+
+import asyncio
+import socket
+
+import portscan
+
+
+def closed_port(ip):
+    with socket.socket() as sock:
+        sock.bind((ip, 0))
+        return sock.getsockname()[1]
+
+
+def test_busy_host_leaves_global_slots_for_other_ips():
+    port = closed_port("127.0.0.2")
+
+    async def run():
+        async with portscan.PortScanner(concurrency=2, per_host=1, timeout=1.0) as scanner:
+            busy = scanner._host("127.0.0.1")
+            async with busy.limit:
+                waiting = [asyncio.create_task(scanner.scan_port("127.0.0.1", port)) for _ in range(2)]
+                await asyncio.sleep(0)
+                # Both global slots would be taken by the ports queued behind the busy IP
+                state = await asyncio.wait_for(scanner.scan_port("127.0.0.2", port), 2)
+            await asyncio.gather(*waiting)
+            return state
+
+    assert asyncio.run(run()) == portscan.CLOSED
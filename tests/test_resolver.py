@@ -0,0 +1,80 @@
+# test_resolver.py
+
+import asyncio
+import socket
+
+import pytest
+
+import dnscache
+import resolver
+import stubs
+
+
+@pytest.fixture(autouse=True)
+def empty_dns_cache():
+    dnscache.shared.clear()
+    yield
+    dnscache.shared.clear()
+
+
+@pytest.fixture
+def lossy_dns():
+    server = stubs.start_dns(loss=0.05)
+    yield f"127.0.0.1:{server.port}"
+    stubs.stop(server)
+
+
+def receive_buffers(**options):
+    async def open_sockets():
+        async with resolver.AsyncResolver(["127.0.0.1:9"], **options) as dns:
+            return [sock.transport.get_extra_info("socket").getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+                    for sock in dns._sockets]
+    return asyncio.run(open_sockets())
+
+
+def test_answers_every_name_despite_packet_loss(lossy_dns):
+    names = [f"w{i}.example.com" for i in range(3000)]
+    answers = resolver.resolve_all(names, [lossy_dns], concurrency=1000, timeout=0.2, retries=6)
+
+    assert sorted(answer.name for answer in answers) == sorted(names)
+    assert not [answer for answer in answers if answer.rcode == resolver.RCODE_TIMEOUT]
+    found = {answer.name for answer in answers if answer.addresses}
+    assert found == {name for name in names if stubs.dns_exists(name.split(".")[0].encode())}
+
+
+def test_nxdomain_keeps_the_soa_negative_ttl(lossy_dns):
+    [answer] = resolver.resolve_all(["w1.example.com"], [lossy_dns], timeout=0.2, retries=6)
+    assert answer.rcode == resolver.RCODE_NXDOMAIN
+    assert answer.addresses == []
+    assert answer.ttl == stubs.DNS_TTL
+
+
+def test_silent_nameserver_times_out():
+    silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    silent.bind(("127.0.0.1", 0))
+    try:
+        [answer] = resolver.resolve_all(["www.example.com"], [f"127.0.0.1:{silent.getsockname()[1]}"],
+                                        timeout=0.05, retries=1)
+    finally:
+        silent.close()
+    assert answer.rcode == resolver.RCODE_TIMEOUT
+    assert answer.addresses == []
+
+
+def test_sockets_get_a_larger_receive_buffer():
+    default = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        kernel_default = default.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    finally:
+        default.close()
+    sizes = receive_buffers(sockets=2, receive_buffer=1 << 20)
+    assert len(sizes) == 2
+    assert all(size > kernel_default for size in sizes)
+    assert receive_buffers(sockets=1, receive_buffer=0) == [kernel_default]
+
+
+def test_clamped_receive_buffer_is_reported_once(monkeypatch, capsys):
+    monkeypatch.setattr(resolver, "_clamp_reported", set())
+    receive_buffers(receive_buffer=1 << 30)
+    receive_buffers(receive_buffer=1 << 30)
+    assert capsys.readouterr().out.count("receive buffer clamped") == 1
@@ -0,0 +1,40 @@
+# test_subdomains.py
+
+import asyncio
+
+import pytest
+
+import candidates
+import dnscache
+import stubs
+import subdomains
+
+
+@pytest.fixture(autouse=True)
+def empty_dns_cache():
+    dnscache.shared.clear()
+    yield
+    dnscache.shared.clear()
+
+
+@pytest.fixture
+def dns():
+    server = stubs.start_dns()
+    yield f"127.0.0.1:{server.port}"
+    stubs.stop(server)
+
+
+def test_previous_names_are_not_seeds_whichever_source_reports_them(dns):
+    previous = ["w100.example.com"]
+    sources = [("crt.sh", iter(["w100.example.com", "w200.example.com"])),
+               (subdomains.PREVIOUS_SOURCE, iter(previous))]
+    found = {}
+
+    stats = asyncio.run(subdomains.enumerate_subdomains(
+        "example.com", lambda entry, label: found.setdefault(entry["subdomain"], label), nameservers=[dns],
+        sources=sources, permute=True, exclude_seeds=set(previous)
+    ))
+
+    assert "w100.example.com" in found
+    expected = len(set(candidates.permutations(["w200.example.com"], "example.com")))
+    assert stats["sources"]["permutations"]["names"] == expected
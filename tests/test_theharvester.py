@@ -0,0 +1,85 @@
+# test_theharvester.py
+
+import threading
+import time
+
+import pytest
+
+import stubs
+import theHarvester
+
+SOURCES = ["bing", "crtsh", "otx"]
+
+
+def fake_harvester(monkeypatch, directory, **behaviour):
+    monkeypatch.setattr(theHarvester, "HARVESTER_BIN", stubs.write_harvester(str(directory), 30, SOURCES, **behaviour))
+
+
+def test_parallel_sources_are_merged(monkeypatch, workdir):
+    fake_harvester(monkeypatch, workdir)
+    merged = theHarvester.run_parallel_harvest("example.com", SOURCES, workers=2)
+
+    # Each source returns its own share and the next one's, so the union is every host once
+    assert sorted(merged["hosts"]) == sorted(f"h{n}.example.com" for n in range(30))
+    assert len(merged["hosts"]) == len(set(merged["hosts"]))
+    assert (workdir / "data" / "theharvester_example.com.json.json").exists()
+
+
+def test_merge_results_unions_lists_and_merges_dicts():
+    merged = theHarvester.merge_results([
+        {"hosts": ["a", "b"], "shodan": {"a": 1}, "name": "first"},
+        {"hosts": ["b", "c"], "shodan": {"b": 2}, "name": "second"},
+    ])
+    assert merged == {"hosts": ["a", "b", "c"], "shodan": {"a": 1, "b": 2}, "name": "first"}
+
+
+def test_group_size_splits_sources(monkeypatch):
+    groups = []
+    monkeypatch.setattr(theHarvester, "_run_timed_group",
+                        lambda domain, group, *args: groups.append(group) or (",".join(group), {}, "ok"))
+    theHarvester.run_parallel_harvest("example.com", SOURCES, group_size=2)
+    assert sorted(groups) == [["bing", "crtsh"], ["otx"]]
+    groups.clear()
+    theHarvester.run_parallel_harvest("example.com", SOURCES, group_size=0)
+    assert sorted(groups) == [["bing"], ["crtsh"], ["otx"]]
+
+
+def test_hanging_source_is_killed_at_its_timeout(monkeypatch, workdir):
+    fake_harvester(monkeypatch, workdir, hang=["otx"])
+    started = time.monotonic()
+    label, result, status = theHarvester._run_source_group("example.com", ["otx"], None, timeout=0.5)
+    assert (label, result, status) == ("otx", None, "timed out after 0.5s")
+    assert time.monotonic() - started < 5
+
+    merged = theHarvester.run_parallel_harvest("example.com", SOURCES, source_timeout=0.5)
+    assert merged["hosts"]
+
+
+def test_stop_kills_running_sources(monkeypatch, workdir):
+    fake_harvester(monkeypatch, workdir, hang=SOURCES)
+    stop = threading.Event()
+    threading.Timer(0.3, stop.set).start()
+    started = time.monotonic()
+    assert theHarvester.run_parallel_harvest("example.com", SOURCES, workers=1, stop=stop) == {}
+    assert time.monotonic() - started < 5
+
+
+def test_nonzero_exit_is_a_failed_source(monkeypatch, workdir):
+    fake_harvester(monkeypatch, workdir, fail=["crtsh"])
+    assert theHarvester._run_source_group("example.com", ["crtsh"], None, timeout=10) == \
+        ("crtsh", None, "exit code 2")
+
+
+def test_invalid_json_is_a_failed_source(monkeypatch, workdir):
+    fake_harvester(monkeypatch, workdir, invalid=["bing"])
+    assert theHarvester._run_source_group("example.com", ["bing"], None, timeout=10) == \
+        ("bing", None, "invalid JSON output")
+
+    merged = theHarvester.run_parallel_harvest("example.com", SOURCES)
+    assert merged["hosts"]
+
+
+def test_single_run_reads_the_output_file(monkeypatch, workdir):
+    monkeypatch.setattr(theHarvester, "HARVESTER_BIN", stubs.write_harvester(str(workdir), 20))
+    result = theHarvester.run_harvest("example.com", interactive=False)
+    assert len(result["hosts"]) == 20
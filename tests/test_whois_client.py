@@ -0,0 +1,84 @@
+# test_whois_client.py
+
+import socket
+
+import pytest
+
+import cache
+import ratelimit
+import stubs
+import whois_client
+
+
+@pytest.fixture(autouse=True)
+def isolated_client(monkeypatch, workdir):
+    monkeypatch.setitem(ratelimit._rates, "whois", (0, 1))
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(whois_client, "_servers", {})
+    monkeypatch.setattr(whois_client, "_settings", {"iana_server": "127.0.0.1:9", "timeout": 2})
+    monkeypatch.setitem(cache._settings, "path", str(workdir / "data" / "cache.sqlite"))
+    monkeypatch.setattr(cache, "_conn", None)
+
+
+@pytest.fixture
+def registry():
+    server = stubs.start_whois(registrar="Registry Copy")
+    whois_client.configure(servers={"test": f"127.0.0.1:{server.port}"})
+    yield server
+    stubs.stop(server)
+
+
+@pytest.fixture
+def thin_registry():
+    # The registrar runs on another loopback address: a referral back to the same host is ignored
+    registrar = stubs.start_whois(host="127.0.0.2", registrar="Referred Registrar LLC")
+    registry = stubs.start_whois(registrar="Registry Copy", referral=f"127.0.0.2:{registrar.port}")
+    whois_client.configure(servers={"thin": f"127.0.0.1:{registry.port}"})
+    yield registrar
+    stubs.stop(registry, registrar)
+
+
+def test_lookup_parses_the_record(registry):
+    result = whois_client.lookup("Example.TEST.")
+    assert result["domain_name"] == "EXAMPLE.TEST"
+    assert result["registrar"] == "Registry Copy"
+    assert result["creation_date"] == "2001-02-03T04:05:06Z"
+    assert result["expiration_date"] == "2031-02-03T04:05:06Z"
+    assert result["name_servers"] == ["ns1.example.test", "ns2.example.test"]
+    assert result["emails"] == ["hostmaster@example.test"]
+
+
+def test_referral_to_the_registrar_is_followed(thin_registry):
+    result = whois_client.lookup("example.thin")
+    assert result["registrar"] == "Referred Registrar LLC"
+    assert result["domain_name"] == "EXAMPLE.THIN"
+
+
+def test_registry_answer_is_kept_when_the_registrar_is_down(thin_registry):
+    stubs.stop(thin_registry)
+    result = whois_client.lookup("example.thin")
+    assert result["registrar"] == "Registry Copy"
+
+
+def test_silent_server_times_out(monkeypatch):
+    silent = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(8)  # accepts connections but never answers
+    monkeypatch.setitem(whois_client._settings, "timeout", 0.2)
+    whois_client.configure(servers={"slow": f"127.0.0.1:{silent.getsockname()[1]}"})
+    try:
+        with pytest.raises(OSError):
+            whois_client.lookup("example.slow")
+        assert whois_client.bulk_lookup(["example.slow"]) == {"example.slow": {}}
+    finally:
+        silent.close()
+
+
+def test_bulk_lookup_records_failures_per_domain(registry):
+    domains = [f"d{i}.test" for i in range(20)]
+    # IDNA cannot encode this name (UnicodeError), and IANA (port 9, closed) cannot name a server
+    results = whois_client.bulk_lookup(domains + ["xn--ü.test", "example.invalid-tld"], workers=8)
+
+    assert results["xn--ü.test"] == {}
+    assert results["example.invalid-tld"] == {}
+    assert all(results[domain]["domain_name"] == domain.upper() for domain in domains)
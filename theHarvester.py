@@ -14,10 +14,12 @@ Features:
 - Executes theHarvester using subprocess and parses the resulting JSON output
 - Cleans up old output files if present
 - Measures and prints total runtime to the console
+- Optional parallel mode: one theHarvester process per source (or small group of sources) on a
+  bounded pool, each with its own timeout, with streamed output and merged JSON results
 
 Flags used:
 - -d <domain>: Target domain to enumerate
-- -b all: Use all available sources
+- -b all: Use all available sources (or -b <source> per process in parallel mode)
 - -f <filename>: Output file prefix
 - -v: Verbose mode
 - -s 0: Start index
@@ -30,7 +32,12 @@ Outputs:
 - Provides error handling for subprocess issues and output parsing
 
 Usage:
-This module is intended to be called by the ReconStudio toolkit via `run_harvest(domain)`.
+This module is intended to be called by the ReconStudio toolkit via `run_harvest(domain, config_path)`.
+Pass `sources=["crtsh", "otx", ...]` to run the sources in parallel instead of a single `-b all` run.
+Set the THEHARVESTER_BIN environment variable to use a different executable (e.g. a fake one in tests).
+When `config_path` is given, or `interactive=False`, the API prompt is skipped, which keeps parallel and
+batch runs prompt-free. Pass `stop=threading.Event()` to kill the running theHarvester processes
+from another thread once the harvest is no longer wanted.
 
 Dependencies:
 - subprocess
@@ -38,7 +45,10 @@ Dependencies:
 - json
 - os
 - platform
+- threading
 - time
+- concurrent.futures
+- metrics (per-source timing spans)
 
 Limitations:
 - Requires theHarvester to be installed and in PATH
@@ -51,18 +61,154 @@ import json
 import shutil
 import os
 import platform
+import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import metrics
 
 os.makedirs("data", exist_ok=True)
 
-def run_harvest(domain):
+HARVESTER_BIN = os.environ.get("THEHARVESTER_BIN", "theHarvester")
+DEFAULT_WORKERS = 4
+DEFAULT_SOURCE_TIMEOUT = 180
+STOP_POLL = 0.2  # seconds between checks of the timeout and stop event while a process runs
+
+def merge_results(results):
+    """Merge several theHarvester JSON results: lists are unioned in order, dicts merged."""
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                existing = merged.setdefault(key, [])
+                seen = {json.dumps(item, sort_keys=True) for item in existing}
+                for item in value:
+                    marker = json.dumps(item, sort_keys=True)
+                    if marker not in seen:
+                        seen.add(marker)
+                        existing.append(item)
+            elif isinstance(value, dict):
+                merged.setdefault(key, {}).update(value)
+            else:
+                merged.setdefault(key, value)
+    return merged
+
+def _kill(process):
+    """Kill a theHarvester process started in its own session, together with its children.
+
+    A child left running would keep the output pipe open and block the reader.
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+def _run_source_group(domain, group, api_keys_path, timeout, stop=None):
+    """Run one theHarvester process for a group of sources, streaming its output.
+
+    Returns (label, results or None, status).
+    """
+    label = ",".join(group)
+    output_file = f"data/theharvester_{domain}_{'_'.join(group)}.json"
+    if os.path.exists(output_file + ".json"):
+        os.remove(output_file + ".json")
+
+    command = [HARVESTER_BIN, "-d", domain, "-b", label, "-f", output_file, "-v", "-s", "0", "-l", "100"]
+    if api_keys_path:
+        command += ["-c", api_keys_path]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                               errors="replace", bufsize=1, start_new_session=os.name == "posix")
+    timed_out = threading.Event()
+    finished = threading.Event()
+
+    def watch():
+        # Kill the process at its timeout, or as soon as the caller gives up on the harvest
+        deadline = time.monotonic() + timeout
+        while not finished.wait(STOP_POLL):
+            if time.monotonic() >= deadline or (stop is not None and stop.is_set()):
+                timed_out.set()
+                _kill(process)
+                return
+
+    watcher = threading.Thread(target=watch, name=f"harvest-watch {label}", daemon=True)
+    watcher.start()
+    try:
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                print(f"[{label}] {line}")
+        process.wait()
+    finally:
+        finished.set()
+        process.stdout.close()
+
+    if timed_out.is_set():
+        if stop is not None and stop.is_set():
+            return label, None, "stopped"
+        return label, None, f"timed out after {timeout}s"
+    if process.returncode != 0:
+        return label, None, f"exit code {process.returncode}"
+    try:
+        with open(output_file + ".json", "r") as f:
+            return label, json.load(f), "ok"
+    except FileNotFoundError:
+        return label, None, "no output file"
+    except json.JSONDecodeError:
+        return label, None, "invalid JSON output"
+
+def _run_timed_group(domain, group, api_keys_path, timeout, stop=None):
+    if stop is not None and stop.is_set():
+        return ",".join(group), None, "stopped"
+    with metrics.span("harvest_source", source=",".join(group)):
+        return _run_source_group(domain, group, api_keys_path, timeout, stop)
+
+def run_parallel_harvest(domain, sources, api_keys_path=None, workers=DEFAULT_WORKERS,
+                         source_timeout=DEFAULT_SOURCE_TIMEOUT, group_size=1, stop=None):
+    """Run one theHarvester process per source group on a bounded pool and merge the results.
+
+    Setting stop kills the running processes and skips the groups not started yet.
+    """
+    # The processes run in their own sessions and miss a Ctrl-C, so an interrupt stops them here
+    stop = stop or threading.Event()
+    group_size = max(1, group_size)
+    groups = [sources[i:i + group_size] for i in range(0, len(sources), group_size)]
+    print(f"[*] Running {len(groups)} theHarvester processes ({workers} at a time)")
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="harvest") as executor:
+        futures = [executor.submit(_run_timed_group, domain, group, api_keys_path, source_timeout, stop)
+                   for group in groups]
+        try:
+            for future in as_completed(futures):
+                label, result, status = future.result()
+                metrics.count("harvest_sources", status="ok" if result is not None else "failed")
+                if result is None:
+                    print(f"[!] theHarvester source {label}: {status}")
+                else:
+                    print(f"[✓] theHarvester source {label} completed")
+                    results.append(result)
+        except BaseException:
+            stop.set()
+            raise
+
+    merged = merge_results(results)
+    with open(f"data/theharvester_{domain}.json.json", "w") as f:
+        json.dump(merged, f, indent=2)
+    return merged
+
+def run_harvest(domain, config_path=None, interactive=True, sources=None, workers=DEFAULT_WORKERS,
+                source_timeout=DEFAULT_SOURCE_TIMEOUT, group_size=1, stop=None):
     start_time = time.time()
     print(f"[*] Harvesting data using theHarvester for domain: {domain}")
 
     if platform.system().lower() == "windows":
         print("[!] theHarvester may not run natively on Windows. Consider using WSL or Linux.")
 
-    if shutil.which("theHarvester") is None:
+    if shutil.which(HARVESTER_BIN) is None:
         print("[!] theHarvester is not installed on your system.")
         print("[i] You can install it from: https://github.com/laramies/theHarvester")
         print("[i] Please install theHarvester to enable this module.")
@@ -70,8 +216,13 @@ def run_harvest(domain):
         print(f"[!] theHarvester finished with errors in {duration} seconds")
         return {}
 
-    use_api = input("[?] Do you want to use APIs for extended results (e.g. Hunter.io)? (y/n): ").strip().lower()
-    api_keys_path = None
+    api_keys_path = config_path
+    use_api = 'n'
+    if api_keys_path and not os.path.isfile(api_keys_path):
+        print(f"[!] File not found: {api_keys_path}")
+        api_keys_path = None
+    if api_keys_path is None and interactive:
+        use_api = input("[?] Do you want to use APIs for extended results (e.g. Hunter.io)? (y/n): ").strip().lower()
 
     if use_api == 'y':
         while True:
@@ -90,6 +241,12 @@ def run_harvest(domain):
             else:
                 break
 
+    if sources:
+        results = run_parallel_harvest(domain, sources, api_keys_path, workers, source_timeout, group_size, stop)
+        duration = round(time.time() - start_time, 2)
+        print(f"[✓] theHarvester completed in {duration} seconds")
+        return results
+
     output_format = "json"
     output_file = f"data/theharvester_{domain}.{output_format}"
 
@@ -97,7 +254,7 @@ def run_harvest(domain):
         os.remove(output_file + ".json")
 
     command = [
-        "theHarvester",
+        HARVESTER_BIN,
         "-d", domain,
         "-b", "all",
         "-f", output_file,
@@ -110,7 +267,20 @@ def run_harvest(domain):
         command += ["-c", api_keys_path]
 
     try:
-        subprocess.run(command, check=True)
+        process = subprocess.Popen(command, start_new_session=os.name == "posix")
+        try:
+            while process.poll() is None:
+                if stop is None:
+                    process.wait()
+                elif stop.wait(STOP_POLL):
+                    print("[!] theHarvester stopped before it finished")
+                    return {}
+        finally:
+            if process.poll() is None:
+                _kill(process)
+                process.wait()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command)
         with open(output_file + ".json", "r") as f:
             results = json.load(f)
             duration = round(time.time() - start_time, 2)
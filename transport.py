@@ -0,0 +1,150 @@
+# transport.py
+
+"""
+Module: transport.py
+
+Description:
+This module is the single HTTP transport shared by every ReconStudio module that talks to a
+web API. It keeps one pooled `requests` session per process so connections (and TLS sessions)
+to the same host are reused across providers, targets and threads, negotiates compressed
+responses, and retries transient failures with jittered exponential backoff.
+
+Features:
+- Keep-alive connection pools per host via a shared session
+- gzip/deflate negotiation, plus brotli when the `brotli` package is installed
+- Bounded retries on connection errors, timeouts, 429 and 5xx responses
+- Full-jitter exponential backoff that honours `Retry-After` (seconds or HTTP date)
+- Optional per-provider rate limiting on every attempt, retries included
+- Settings (timeout, max_retries, user_agent) read from main.py's CONFIG via `configure()`
+- Request latency, status, retry, error and downloaded-bytes metrics per provider
+
+Usage:
+    response = transport.get(url, provider="crtsh", stream=True)
+
+Dependencies:
+- requests
+- ratelimit (shared per-provider token buckets)
+
+Limitations:
+- Only idempotent requests should be retried; `get()` is the intended entry point
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+import ratelimit
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+try:
+    import brotli  # noqa: F401 -- enables urllib3's brotli decoding
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+_settings = {
+    "timeout": 30,
+    "max_retries": 3,
+    "user_agent": "ReconStudio/1.0",
+    "backoff": 0.5,  # base delay in seconds
+    "max_backoff": 60,  # cap for computed and Retry-After delays
+    "pool_hosts": 32,  # hosts with a cached connection pool
+    "pool_size": 32,  # keep-alive connections per host
+}
+_session = None
+_lock = threading.Lock()
+
+
+def configure(**settings):
+    """Override transport settings; the session is rebuilt on next use."""
+    global _session
+    with _lock:
+        _settings.update({key: value for key, value in settings.items() if value is not None})
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def session():
+    """Return the process-wide pooled session."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_settings["pool_hosts"], pool_maxsize=_settings["pool_size"])
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers.update({
+                "User-Agent": _settings["user_agent"],
+                "Accept-Encoding": ACCEPT_ENCODING,
+            })
+        return _session
+
+
+def _backoff(attempt):
+    return random.uniform(0, min(_settings["max_backoff"], _settings["backoff"] * 2 ** attempt))
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(_settings["max_backoff"], max(0.0, delay))
+
+
+def record_download(response, provider=None):
+    """Count a consumed response body in the 'http_bytes_downloaded' metric (wire bytes if known)."""
+    try:
+        size = response.raw.tell()
+    except (AttributeError, OSError):
+        size = 0
+    metrics.count("http_bytes_downloaded", size, provider=provider or "other")
+
+
+def get(url, provider=None, timeout=None, stream=False, **kwargs):
+    """GET with pooling and retries. Returns the final response (possibly a 5xx after retries).
+
+    Streamed callers should call record_download() once they have read the body.
+    """
+    attempt = 0
+    label = provider or "other"
+    while True:
+        if provider:
+            ratelimit.acquire(provider)
+        if attempt:
+            metrics.count("http_retries", provider=label)
+        started = time.perf_counter()
+        try:
+            response = session().get(url, timeout=timeout or _settings["timeout"], stream=stream, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            metrics.count("http_errors", provider=label, error=type(e).__name__)
+            if attempt >= _settings["max_retries"]:
+                raise
+            delay = _backoff(attempt)
+        else:
+            # For streamed responses this is the time to the response headers
+            metrics.observe("http_request_seconds", time.perf_counter() - started, provider=label)
+            metrics.count("http_requests", provider=label, status=response.status_code)
+            if not stream:
+                record_download(response, provider)
+            if response.status_code not in RETRY_STATUSES or attempt >= _settings["max_retries"]:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+            response.close()
+        attempt += 1
+        time.sleep(delay)
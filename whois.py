@@ -14,16 +14,23 @@ Features:
 - Returns structured dictionary output
 - Measures runtime and prints it to the console
 - Saves result to a TXT file
+- Caches results on disk so repeated lookups skip the WHOIS servers
+- Optional built-in port-43 client (whois_client.py) with referral caching and per-server
+  rate limits, including bulk lookups via `get_whois_bulk(domains)`
 
 Usage:
 This module is intended to be used as part of the ReconStudio toolkit.
 It can also be tested independently by calling `get_whois(domain)` or running from the CLI:
 
     python3 whois_info.py example.com
+    python3 whois_info.py example.com example.org example.net   # bulk, native client
 
 Dependencies:
 - python-whois
 - time
+- ratelimit (shared per-provider token buckets)
+- cache (persistent provider response cache)
+- whois_client (built-in port-43 WHOIS client)
 
 Limitations:
 - Some domains may not return complete WHOIS data
@@ -33,27 +40,36 @@ Limitations:
 """
 
 import whois
+import json
 import os
 import time
 
-def get_whois(domain):
+import cache
+import ratelimit
+import whois_client
+
+def _lookup(domain):
+    ratelimit.acquire("whois")
+    info = whois.whois(domain)
+    return {
+        "domain_name": info.domain_name,
+        "registrar": info.registrar,
+        "creation_date": str(info.creation_date),
+        "expiration_date": str(info.expiration_date),
+        "name_servers": info.name_servers,
+        "status": info.status,
+        "emails": info.emails
+    }
+
+def get_whois(domain, native=False):
     if os.name == 'nt':
         print("[!] Note: WHOIS results may vary on Windows systems. Consider using WSL or Linux for consistency.")
     print(f"[*] Performing WHOIS lookup for: {domain}")
     start_time = time.time()
 
     try:
-        info = whois.whois(domain)
-
-        result = {
-            "domain_name": info.domain_name,
-            "registrar": info.registrar,
-            "creation_date": str(info.creation_date),
-            "expiration_date": str(info.expiration_date),
-            "name_servers": info.name_servers,
-            "status": info.status,
-            "emails": info.emails
-        }
+        lookup = whois_client.lookup if native else _lookup
+        result = cache.fetch_json("whois", domain.lower(), lambda: lookup(domain))
 
         duration = round(time.time() - start_time, 2)
         print(f"[✓] WHOIS completed in {duration} seconds")
@@ -73,9 +89,42 @@ def get_whois(domain):
         print(f"[!] WHOIS lookup failed after {duration} seconds: {e}")
         return {}
 
+def get_whois_bulk(domains, workers=whois_client.DEFAULT_WORKERS):
+    """Look up many domains at once with the native client, without per-domain output files.
+
+    Cached results are reused; fresh ones are cached. Returns {domain: result}.
+    """
+    start_time = time.time()
+    results = {}
+    missing = []
+    for domain in domains:
+        try:
+            cached = cache.lookup("whois", domain.lower())
+        except cache.CacheMiss:
+            results[domain] = {}
+            continue
+        if cached is None:
+            missing.append(domain)
+        else:
+            results[domain] = json.loads(cached)
+
+    print(f"[*] WHOIS bulk lookup: {len(domains) - len(missing)} cached, {len(missing)} to query")
+    for domain, result in whois_client.bulk_lookup(missing, workers).items():
+        if result:
+            cache.put("whois", domain.lower(), json.dumps(result))
+        results[domain] = result
+
+    duration = round(time.time() - start_time, 2)
+    print(f"[✓] WHOIS bulk lookup of {len(domains)} domains completed in {duration} seconds")
+    return results
+
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python3 whois_info.py <domain>")
+    if len(sys.argv) < 2:
+        print("Usage: python3 whois_info.py <domain> [<domain> ...]")
         exit(1)
-    get_whois(sys.argv[1])
\ No newline at end of file
+    if len(sys.argv) == 2:
+        get_whois(sys.argv[1])
+    else:
+        for domain, result in get_whois_bulk(sys.argv[1:]).items():
+            print(f"{domain}: {result.get('registrar')} {result.get('name_servers')}")
\ No newline at end of file
@@ -0,0 +1,225 @@
+# whois_client.py
+
+"""
+Module: whois_client.py
+
+Description:
+This module is a built-in port-43 WHOIS client (RFC 3912) used by ReconStudio for fast and
+bulk WHOIS lookups. It discovers the authoritative WHOIS server for each TLD through IANA,
+follows registrar referrals from thin registries, and parses the replies into the same result
+dictionary produced by whois_info.get_whois.
+
+Features:
+- TLD -> WHOIS server mapping discovered via whois.iana.org and cached in memory and on disk
+- Registrar referral following ("Registrar WHOIS Server:", "ReferralServer:")
+- Cached address resolution per WHOIS server, so repeated queries skip DNS
+- Per-server rate limiting through the shared token buckets ("whois:<server>")
+- Bulk lookups for many domains at once on a thread pool
+- Servers may be overridden as "host" or "host:port", so a local mock WHOIS server can be used
+
+Usage:
+    result = whois_client.lookup("example.com")
+    results = whois_client.bulk_lookup(["example.com", "example.org"], workers=32)
+
+Dependencies:
+- socket
+- re
+- cache (persistent provider response cache)
+- ratelimit (shared per-provider token buckets)
+
+Limitations:
+- WHOIS servers close the connection after every answer (RFC 3912), so each query needs a new
+  TCP connection; only the server discovery and address resolution are reused
+- Field parsing covers the common "Key: value" layouts; exotic registry formats may leave
+  some fields empty
+"""
+
+import re
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cache
+import ratelimit
+
+IANA_SERVER = "whois.iana.org"
+WHOIS_PORT = 43
+DEFAULT_TIMEOUT = 10
+DEFAULT_WORKERS = 16
+MAX_RESPONSE_SIZE = 1024 * 1024
+
+FIELDS = {
+    "domain_name": ["domain name", "domain"],
+    "registrar": ["registrar", "sponsoring registrar", "registrar name"],
+    "creation_date": ["creation date", "created on", "created", "registered on", "registration time"],
+    "expiration_date": ["registry expiry date", "registrar registration expiration date", "expiration date",
+                        "expiry date", "expires on", "expires", "paid-till"],
+    "name_servers": ["name server", "nameserver", "nameservers", "nserver"],
+    "status": ["domain status", "status", "state"],
+}
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+REFERRAL_KEYS = ("registrar whois server", "referralserver", "whois server")
+
+_servers = {}  # tld -> "host[:port]"
+_addresses = {}  # (host, port) -> sockaddr
+_settings = {"iana_server": IANA_SERVER, "timeout": DEFAULT_TIMEOUT}
+_lock = threading.Lock()
+
+
+def configure(iana_server=None, servers=None, timeout=None):
+    """Override the IANA server, pin TLD servers ({tld: "host[:port]"}) or change the timeout."""
+    with _lock:
+        if iana_server:
+            _settings["iana_server"] = iana_server
+        if servers:
+            _servers.update(servers)
+        if timeout:
+            _settings["timeout"] = timeout
+
+
+def _split_server(server):
+    host, _, port = server.partition(":")
+    return host.lower(), int(port) if port else WHOIS_PORT
+
+
+def _address(host, port):
+    with _lock:
+        address = _addresses.get((host, port))
+    if address is None:
+        info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        address = (info[0], info[4])
+        with _lock:
+            _addresses[(host, port)] = address
+    return address
+
+
+def query(server, text):
+    """Send one WHOIS query to "host[:port]" and return the decoded reply."""
+    host, port = _split_server(server)
+    ratelimit.acquire(f"whois:{host}")
+    family, sockaddr = _address(host, port)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_settings["timeout"])
+        sock.connect(sockaddr)
+        sock.sendall(text.encode("idna" if not text.isascii() else "ascii") + b"\r\n")
+        chunks = []
+        size = 0
+        while size < MAX_RESPONSE_SIZE:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+    return b"".join(chunks).decode("utf-8", "replace")
+
+
+def _pairs(text):
+    for line in text.splitlines():
+        key, sep, value = line.strip().partition(":")
+        if sep and value.strip():
+            yield key.strip().lower(), value.strip()
+
+
+def server_for(domain):
+    """Return the WHOIS server for a domain's TLD, asking IANA once per TLD."""
+    tld = domain.rstrip(".").rsplit(".", 1)[-1].lower()
+    with _lock:
+        server = _servers.get(tld)
+    if server:
+        return server
+
+    cached = cache.get("whois-server", tld)
+    if cached is not None:
+        server = cached.decode("utf-8")
+    else:
+        reply = query(_settings["iana_server"], tld)
+        server = next((value for key, value in _pairs(reply) if key in ("refer", "whois")), None)
+        if not server:
+            raise LookupError(f"No WHOIS server known for .{tld}")
+        cache.put("whois-server", tld, server)
+    with _lock:
+        _servers[tld] = server
+    return server
+
+
+def _referral(text, current):
+    for key, value in _pairs(text):
+        if key in REFERRAL_KEYS:
+            server = re.sub(r"^(r?whois|https?)://", "", value).strip("/ ")
+            if server and "/" not in server and _split_server(server)[0] != _split_server(current)[0]:
+                return server
+    return None
+
+
+def parse(text):
+    """Parse WHOIS text into the ReconStudio result dictionary."""
+    values = {}
+    for key, value in _pairs(text):
+        values.setdefault(key, []).append(value)
+
+    def first(field):
+        for key in FIELDS[field]:
+            if key in values:
+                return values[key][0]
+        return None
+
+    def every(field, normalize):
+        items = []
+        for key in FIELDS[field]:
+            for value in values.get(key, []):
+                item = normalize(value)
+                if item and item not in items:
+                    items.append(item)
+        return items or None
+
+    emails = sorted({email.lower() for email in EMAIL_PATTERN.findall(text)})
+    return {
+        "domain_name": first("domain_name"),
+        "registrar": first("registrar"),
+        "creation_date": str(first("creation_date")),
+        "expiration_date": str(first("expiration_date")),
+        "name_servers": every("name_servers", lambda value: value.split()[0].lower().rstrip(".")),
+        "status": every("status", lambda value: value),
+        "emails": emails or None,
+    }
+
+
+def _merge(registry, registrar):
+    result = dict(registry)
+    for key, value in registrar.items():
+        if value not in (None, "None") and key != "emails":
+            result[key] = value
+    emails = sorted(set(registry.get("emails") or []) | set(registrar.get("emails") or []))
+    result["emails"] = emails or None
+    return result
+
+
+def lookup(domain):
+    """Look up one domain, following one registrar referral if the registry gives one."""
+    domain = domain.lower().rstrip(".")
+    server = server_for(domain)
+    reply = query(server, domain)
+    result = parse(reply)
+
+    referral = _referral(reply, server)
+    if referral:
+        try:
+            result = _merge(result, parse(query(referral, domain)))
+        except OSError:
+            # The registry answer is still useful when a registrar server is down
+            pass
+    return result
+
+
+def bulk_lookup(domains, workers=DEFAULT_WORKERS):
+    """Look up many domains at once. Returns {domain: result}, with {} for failed lookups."""
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="whois") as executor:
+        futures = {executor.submit(lookup, domain): domain for domain in domains}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except (OSError, LookupError, ValueError):
+                # ValueError covers names IDNA cannot encode (UnicodeError)
+                results[futures[future]] = {}
+    return results
@@ -0,0 +1,89 @@
+# wildcard.py
+
+"""
+Module: wildcard.py
+
+Description:
+This module detects wildcard DNS records for the subdomain enumeration in subdomains.py. When a
+zone has a wildcard (*.example.com), every brute-force guess and every stale certificate name
+"resolves", which floods the results with names that do not really exist. Each zone level is
+probed once with random labels, and the addresses the wildcard answers with are kept as the
+zone's fingerprint.
+
+Features:
+- Lazy detection per zone level (example.com, dev.example.com, ...), probed once and shared
+- Several random-label probes per zone, so round-robin wildcard answers are fingerprinted
+- Concurrent callers asking about the same zone wait for a single detection
+- `matches()` tells whether a resolved name only returned wildcard addresses
+
+Usage:
+    detector = wildcard.WildcardDetector(dns)   # dns is an open resolver.AsyncResolver
+    if await detector.is_wildcard("example.com"):
+        ...
+    if await detector.matches("junk.example.com", answer.addresses):
+        ...   # drop it
+
+Dependencies:
+- asyncio
+- random
+- resolver (ReconStudio async DNS resolver)
+
+Limitations:
+- Only A records are compared; a real host sharing an address with the wildcard is dropped too
+- A wildcard answering from a very large address pool may not be fully fingerprinted
+"""
+
+import asyncio
+import random
+import string
+
+PROBES = 3  # random labels resolved per zone
+LABEL_LENGTH = 16
+LABEL_CHARS = string.ascii_lowercase + string.digits
+
+
+def random_label():
+    return "".join(random.choices(LABEL_CHARS, k=LABEL_LENGTH))
+
+
+def parent_zone(name):
+    """Return the zone a name's wildcard would live in: 'a.dev.example.com' -> 'dev.example.com'."""
+    return name.split(".", 1)[1] if "." in name else ""
+
+
+class WildcardDetector:
+    """Per-zone wildcard fingerprints, computed on first use with an open AsyncResolver."""
+
+    def __init__(self, dns, probes=PROBES):
+        self.dns = dns
+        self.probes = probes
+        self._zones = {}  # zone -> task returning a frozenset of wildcard addresses
+
+    async def _probe(self, zone):
+        answers = await asyncio.gather(*(self.dns.resolve(f"{random_label()}.{zone}") for _ in range(self.probes)))
+        return frozenset(address for answer in answers for address in answer.addresses)
+
+    async def fingerprint(self, zone):
+        """Addresses returned by the zone's wildcard, or an empty set if it has none."""
+        task = self._zones.get(zone)
+        if task is None:
+            task = self._zones[zone] = asyncio.ensure_future(self._probe(zone))
+        return await task
+
+    async def is_wildcard(self, zone):
+        return bool(await self.fingerprint(zone))
+
+    async def matches(self, name, addresses):
+        """True if every address of a resolved name is one of its zone's wildcard addresses."""
+        if not addresses:
+            return False
+        zone_addresses = await self.fingerprint(parent_zone(name))
+        return bool(zone_addresses) and set(addresses) <= zone_addresses
+
+    def wildcards(self):
+        """{zone: sorted wildcard addresses} for every zone found to have a wildcard so far."""
+        return {
+            zone: sorted(task.result())
+            for zone, task in self._zones.items()
+            if task.done() and not task.cancelled() and task.exception() is None and task.result()
+        }